@@ -4,9 +4,10 @@ import os
 # Ensure this directory is on sys.path so sibling modules are importable
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
-from deps import provjeri_dependencije
-provjeri_dependencije()
-from main_window import main
-
+# Spawn radnici (provjera linkova, build) ponovo izvršavaju ovaj fajl kao
+# __mp_main__ — GUI se zato uvozi samo kad se fajl pokreće kao program
 if __name__ == "__main__":
+    from deps import provjeri_dependencije
+    provjeri_dependencije()
+    from main_window import main
     main()
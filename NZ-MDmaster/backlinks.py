@@ -0,0 +1,66 @@
+"""
+Backlinks panel: workspace files that link to the current document.
+"""
+import os
+
+from PySide6.QtWidgets import QDockWidget, QListWidget, QListWidgetItem
+from PySide6.QtCore import Qt, Signal
+
+
+class BacklinksPanel(QDockWidget):
+    """Dock sa listom fajlova koji linkuju na trenutni dokument."""
+
+    # putanja izvora
+    file_activated = Signal(str)
+
+    def __init__(self, title, parent=None):
+        super().__init__(title, parent)
+        self.setObjectName("backlinks_dock")
+        self.lista = QListWidget()
+        self.lista.setWordWrap(True)
+        self.lista.setStyleSheet("""
+            QListWidget {
+                background-color: #0d1117;
+                color: #c9d1d9;
+                border: none;
+                font-size: 13px;
+            }
+            QListWidget::item {
+                padding: 4px;
+                border-bottom: 1px solid #21262d;
+            }
+            QListWidget::item:hover {
+                background: #161b22;
+            }
+            QListWidget::item:selected {
+                background: #1f6feb;
+                color: white;
+            }
+        """)
+        self.lista.itemActivated.connect(self._on_item_activated)
+        self.lista.itemClicked.connect(self._on_item_activated)
+        self.setWidget(self.lista)
+        self._backlinks = None
+
+    def set_backlinks(self, backlinks, root=None, prazno=""):
+        """backlinks: lista (putanja, broj linije, linija) iz LinkGraph.backlinks()."""
+        if backlinks == self._backlinks:
+            return
+        self._backlinks = backlinks
+        self.lista.clear()
+        if not backlinks:
+            item = QListWidgetItem(prazno)
+            item.setFlags(Qt.NoItemFlags)
+            self.lista.addItem(item)
+            return
+        for putanja, linija, tekst in backlinks:
+            ime = os.path.relpath(putanja, root) if root else os.path.basename(putanja)
+            item = QListWidgetItem(f"{ime}:{linija}\n{tekst}")
+            item.setToolTip(putanja)
+            item.setData(Qt.UserRole, putanja)
+            self.lista.addItem(item)
+
+    def _on_item_activated(self, item):
+        putanja = item.data(Qt.UserRole)
+        if putanja:
+            self.file_activated.emit(putanja)
@@ -0,0 +1,228 @@
+"""
+Incremental static-site build — no Qt imports at module level.
+Renders every markdown file under SRC to OUT/<same path>.html with the same
+pipeline and CSS as the preview. A manifest in OUT records, per page, every
+input it was built from (the source and its local images) with their
+mtime/size and a fingerprint — the content hash for the source, the
+intrinsic size for an image, since that is all the page embeds. A re-run
+only rebuilds pages whose inputs changed, copies changed images, and
+rebuilds everything when the renderer configuration (CSS, extensions,
+library versions) changes.
+"""
+import os
+import re
+import json
+import time
+import shutil
+import hashlib
+import multiprocessing
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+
+import markdown
+
+from render import (
+    renderuj_markdown, sastavi_html, procitaj_tekst, markdown_fajlovi, _markdown_ekstenzije,
+)
+from images import obradi_slike, lokalna_putanja, dimenzije_slike
+from styles import ucitaj_css
+from journal import atomicno_sacuvaj
+
+MANIFEST = ".nzbuild.json"
+_VERZIJA = 1
+
+# stranica = ukupno markdown fajlova
+Rezultat = namedtuple("Rezultat", "stranica izgradjeno nepromijenjeno obrisano ms")
+
+_IMG_SRC = re.compile(r'<img\b[^>]*?\bsrc\s*=\s*(?:"([^"]*)"|\'([^\']*)\')', re.IGNORECASE)
+# Lokalni linkovi na markdown fajlove vode na izgrađene .html stranice
+_MD_HREF = re.compile(
+    r'(\bhref\s*=\s*")([^"#?:]+?)\.(?:md|markdown|mdown)((?:#[^"]*)?")', re.IGNORECASE
+)
+
+
+def _otisak(putanja: str, slika: bool):
+    """Hash sadržaja izvora; za sliku samo dimenzije (stranica ugrađuje width/height)."""
+    if slika:
+        dim = dimenzije_slike(putanja)
+        return f"{dim[0]}x{dim[1]}" if dim else None
+    try:
+        with open(putanja, "rb") as f:
+            return hashlib.sha1(f.read()).hexdigest()
+    except OSError:
+        return None
+
+
+def _zapis(putanja: str, slika: bool = False):
+    """[mtime_ns, size, otisak] ulaza; [None, None, None] ako ne postoji (nastanak ga mijenja)."""
+    try:
+        st = os.stat(putanja)
+    except OSError:
+        return [None, None, None]
+    return [st.st_mtime_ns, st.st_size, _otisak(putanja, slika)]
+
+
+def konfiguracija() -> str:
+    """Hash svega što utiče na izlaz svih stranica."""
+    try:
+        import pymdownx
+        pymdownx_verzija = getattr(pymdownx, "__version__", "?")
+    except ImportError:
+        pymdownx_verzija = None
+    podaci = json.dumps(
+        [_VERZIJA, ucitaj_css(), _markdown_ekstenzije(), markdown.__version__, pymdownx_verzija],
+        sort_keys=True, default=str,
+    )
+    return hashlib.sha1(podaci.encode("utf-8")).hexdigest()
+
+
+def izlazna_putanja(rel: str) -> str:
+    return os.path.splitext(rel)[0] + ".html"
+
+
+def izgradi_stranicu(src: str, out: str, rel: str):
+    """
+    Renderuje jednu stranicu; vraća (rel, {ulaz: zapis}) gdje su ulazi relativni
+    na `src`. Izvršava se i u procesima iz poola.
+    """
+    putanja = os.path.join(src, rel)
+    folder = os.path.dirname(putanja)
+    tekst, _ = procitaj_tekst(putanja)
+    body = renderuj_markdown(tekst)
+    slike = set()
+    for m in _IMG_SRC.finditer(body):
+        slika = lokalna_putanja(m.group(1) if m.group(1) is not None else m.group(2), folder)
+        if slika:
+            slike.add(slika)
+    body = obradi_slike(body, folder, lazy=True)
+    body = _MD_HREF.sub(lambda m: f"{m.group(1)}{m.group(2)}.html{m.group(3)}", body)
+    html = sastavi_html(body, ucitaj_css())
+
+    cilj = os.path.join(out, izlazna_putanja(rel))
+    os.makedirs(os.path.dirname(cilj), exist_ok=True)
+    with open(cilj, "w", encoding="utf-8") as f:
+        f.write(html)
+    ulazi = {rel: _zapis(putanja)}
+    for slika in slike:
+        ulazi[os.path.relpath(slika, src)] = _zapis(slika, slika=True)
+    return rel, ulazi
+
+
+def _kopiraj_sliku(src: str, out: str, slika: str):
+    """Slike iz SRC idu na istu relativnu putanju u OUT (samo ako su nove ili promijenjene)."""
+    rel = os.path.relpath(slika, src)
+    if rel.startswith(os.pardir) or not os.path.isfile(slika):
+        return
+    cilj = os.path.join(out, rel)
+    try:
+        s, c = os.stat(slika), os.stat(cilj)
+        if (s.st_mtime_ns, s.st_size) == (c.st_mtime_ns, c.st_size):
+            return
+    except OSError:
+        pass
+    os.makedirs(os.path.dirname(cilj), exist_ok=True)
+    shutil.copy2(slika, cilj)
+
+
+def _ucitaj_manifest(out: str) -> dict:
+    try:
+        with open(os.path.join(out, MANIFEST), "r", encoding="utf-8") as f:
+            manifest = json.load(f)
+        if manifest.get("v") == _VERZIJA:
+            return manifest
+    except (OSError, ValueError):
+        pass
+    return {"v": _VERZIJA, "konfig": None, "stranice": {}}
+
+
+def _zastarjela(src: str, stranica: str, ulazi: dict) -> bool:
+    """
+    True ako se ijedan ulaz stranice promijenio. Nepromijenjen stat je dovoljan;
+    inače (checkout, touch, nova verzija slike) odlučuje otisak.
+    """
+    for rel, (mtime_ns, size, otisak) in ulazi.items():
+        putanja = os.path.join(src, rel)
+        try:
+            st = os.stat(putanja)
+        except OSError:
+            if mtime_ns is not None:
+                return True
+            continue
+        if mtime_ns is None:
+            return True
+        if (st.st_mtime_ns, st.st_size) != (mtime_ns, size):
+            if _otisak(putanja, slika=rel != stranica) != otisak:
+                return True
+            ulazi[rel] = [st.st_mtime_ns, st.st_size, otisak]
+    return False
+
+
+def izgradi(src: str, out: str, jobs=None, napredak=None, sve: bool = False) -> Rezultat:
+    """
+    Gradi SRC u OUT i vraća Rezultat. napredak(gotovo, ukupno, rel) se zove
+    poslije svake izgrađene stranice; sve=True ignoriše manifest.
+    """
+    start = time.perf_counter()
+    src, out = os.path.abspath(src), os.path.abspath(out)
+    manifest = _ucitaj_manifest(out)
+    konfig = konfiguracija()
+    if sve or manifest["konfig"] != konfig:
+        manifest["stranice"] = {}
+    stare = manifest["stranice"]
+
+    izlaz_rel = os.path.relpath(out, src)
+    fajlovi = [
+        os.path.relpath(p, src) for p in markdown_fajlovi(src)
+        # OUT unutar SRC: izgrađeni fajlovi nisu izvori
+        if izlaz_rel.startswith(os.pardir) or not os.path.relpath(p, src).startswith(izlaz_rel + os.sep)
+    ]
+    postojece = set(fajlovi)
+
+    obrisano = 0
+    for rel in [r for r in stare if r not in postojece]:
+        try:
+            os.remove(os.path.join(out, stare.pop(rel)["izlaz"]))
+        except OSError:
+            pass
+        obrisano += 1
+
+    za_izgradnju = [
+        rel for rel in fajlovi
+        if rel not in stare
+        or _zastarjela(src, rel, stare[rel]["deps"])
+        or not os.path.exists(os.path.join(out, stare[rel]["izlaz"]))
+    ]
+    jobs = jobs or os.cpu_count() or 1
+    ukupno = len(za_izgradnju)
+
+    def zabiljezi(rel, ulazi, gotovo):
+        stare[rel] = {"izlaz": izlazna_putanja(rel), "deps": ulazi}
+        if napredak:
+            napredak(gotovo, ukupno, rel)
+
+    if jobs <= 1 or ukupno < 20:
+        for i, rel in enumerate(za_izgradnju, 1):
+            zabiljezi(*izgradi_stranicu(src, out, rel), i)
+    else:
+        # spawn: isti razlog kao kod provjere linkova (Qt threadovi u GUI procesu)
+        kontekst = multiprocessing.get_context("spawn")
+        chunk = max(1, min(32, ukupno // (jobs * 8)))
+        with ProcessPoolExecutor(max_workers=jobs, mp_context=kontekst) as pool:
+            rezultati = pool.map(
+                izgradi_stranicu, [src] * ukupno, [out] * ukupno, za_izgradnju, chunksize=chunk
+            )
+            for i, (rel, ulazi) in enumerate(rezultati, 1):
+                zabiljezi(rel, ulazi, i)
+
+    # Slike se kopiraju neovisno o stranicama — nova verzija iste veličine ne gradi ništa
+    slike = {d for rel, stranica in stare.items() for d in stranica["deps"] if d != rel}
+    for slika in slike:
+        _kopiraj_sliku(src, out, os.path.normpath(os.path.join(src, slika)))
+
+    manifest["konfig"] = konfig
+    os.makedirs(out, exist_ok=True)
+    atomicno_sacuvaj(
+        os.path.join(out, MANIFEST), json.dumps(manifest, ensure_ascii=False, separators=(",", ":"))
+    )
+    ms = (time.perf_counter() - start) * 1000.0
+    return Rezultat(len(fajlovi), ukupno, len(fajlovi) - ukupno, obrisano, ms)
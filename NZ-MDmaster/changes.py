@@ -0,0 +1,153 @@
+"""
+Central dispatch of editor changes.
+Every contentsChange of the editor document is turned into one change
+range — a character span and a block (line) span — and handed to
+subscribers at one of three points: immediately (exact edits for the
+journal, the live preview and cursor UI), once typing pauses (counts,
+outline), or through the adaptive preview debounce. Ranges queued for a
+later point are merged, so a subscriber sees each edited region once per
+flush however many keystrokes touched it, and never re-reads the whole text.
+"""
+from collections import namedtuple
+
+from PySide6.QtCore import QObject, QTimer
+from PySide6.QtGui import QTextCursor
+
+ODMAH = "odmah"
+MIROVANJE = "mirovanje"
+DEBOUNCE = "debounce"
+# Koliko (ms) kucanje mora stati prije nego što krenu pretplatnici mirovanja
+MIROVANJE_MS = 150
+
+# Znakovi [pozicija, +uklonjeno) i blokovi [stari_od, stari_do) teksta kakav je bio
+# na zadnjem pražnjenju su sada znakovi [pozicija, +dodano) i blokovi [novi_od, novi_do)
+Promjena = namedtuple("Promjena", "pozicija uklonjeno dodano stari_od stari_do novi_od novi_do")
+
+
+class _Red:
+    """Spojene promjene jednog prioriteta od zadnjeg pražnjenja, sortirane, u trenutnim koordinatama."""
+
+    def __init__(self):
+        # [pozicija, uklonjeno, dodano, blok, starih_blokova, novih_blokova]
+        self.opsezi = []
+
+    def dodaj(self, p: Promjena):
+        starih, novih = p.stari_do - p.stari_od, p.novi_do - p.novi_od
+        prije, spojeni, poslije = [], [], []
+        for o in self.opsezi:
+            if o[3] + o[5] <= p.novi_od:
+                prije.append(o)
+            elif o[3] >= p.novi_od + starih:
+                # Iza izmjene: samo se pomjera
+                o[0] += p.dodano - p.uklonjeno
+                o[3] += novih - starih
+                poslije.append(o)
+            else:
+                spojeni.append(o)
+        if not spojeni:
+            self.opsezi = prije + [[p.pozicija, p.uklonjeno, p.dodano, p.novi_od, starih, novih]] + poslije
+            return
+        # Unija sa opsezima koje izmjena dira; dijelovi unije van njih su izvorni tekst
+        od = min(p.pozicija, spojeni[0][0])
+        do = max(p.pozicija + p.uklonjeno, spojeni[-1][0] + spojeni[-1][2])
+        blok_od = min(p.novi_od, spojeni[0][3])
+        blok_do = max(p.novi_od + starih, spojeni[-1][3] + spojeni[-1][5])
+        self.opsezi = prije + [[
+            od,
+            sum(o[1] for o in spojeni) + (do - od) - sum(o[2] for o in spojeni),
+            (do - od) + p.dodano - p.uklonjeno,
+            blok_od,
+            sum(o[4] for o in spojeni) + (blok_do - blok_od) - sum(o[5] for o in spojeni),
+            (blok_do - blok_od) + novih - starih,
+        ]] + poslije
+
+    def isprazni(self) -> list:
+        promjene, pomak = [], 0
+        for pozicija, uklonjeno, dodano, blok, starih, novih in self.opsezi:
+            promjene.append(Promjena(
+                pozicija, uklonjeno, dodano, blok - pomak, blok - pomak + starih, blok, blok + novih,
+            ))
+            pomak += novih - starih
+        self.opsezi = []
+        return promjene
+
+
+class ChangeDispatcher(QObject):
+    """
+    pretplati(prioritet, fn, kad) — fn(promjene) dobija listu Promjena:
+    ODMAH jednu po izmjeni, MIROVANJE i DEBOUNCE spojene od zadnjeg poziva.
+    kad() (ako je dat) odlučuje da li pretplatnik trenutno čeka izmjene;
+    prioritet bez aktivnih pretplatnika ne čuva promjene.
+    """
+
+    def __init__(self, document, debounce, parent=None):
+        super().__init__(parent)
+        self.doc = document
+        self._pretplatnici = {ODMAH: [], MIROVANJE: [], DEBOUNCE: []}
+        self._redovi = {MIROVANJE: _Red(), DEBOUNCE: _Red()}
+        self._blokova = document.blockCount()
+        self._mirovanje = QTimer(self)
+        self._mirovanje.setSingleShot(True)
+        self._mirovanje.timeout.connect(lambda: self.isprazni(MIROVANJE))
+        # Preview debounce (AdaptiveDebounce) bira kad se DEBOUNCE red prazni
+        self.debounce = debounce
+        debounce.okini.connect(lambda: self.isprazni(DEBOUNCE))
+        document.contentsChange.connect(self._on_contents_change)
+
+    def pretplati(self, prioritet: str, fn, kad=None):
+        self._pretplatnici[prioritet].append((fn, kad))
+
+    def _aktivni(self, prioritet: str) -> bool:
+        return any(kad is None or kad() for _, kad in self._pretplatnici[prioritet])
+
+    def _on_contents_change(self, pozicija, uklonjeno, dodano):
+        # Promjena koja dira zadnji blok zna uključiti i završni separator
+        visak = pozicija + dodano - (self.doc.characterCount() - 1)
+        if visak > 0:
+            uklonjeno -= visak
+            dodano -= visak
+        blokova = self.doc.blockCount()
+        blok = self.doc.findBlock(pozicija).blockNumber()
+        novih = self.doc.findBlock(pozicija + dodano).blockNumber() - blok + 1
+        starih = novih - (blokova - self._blokova)
+        self._blokova = blokova
+        promjena = Promjena(pozicija, uklonjeno, dodano, blok, blok + starih, blok, blok + novih)
+
+        for fn, kad in self._pretplatnici[ODMAH]:
+            if kad is None or kad():
+                fn([promjena])
+        for prioritet, red in self._redovi.items():
+            if self._aktivni(prioritet):
+                red.dodaj(promjena)
+            else:
+                red.opsezi = []
+        if self._redovi[MIROVANJE].opsezi:
+            self._mirovanje.start(MIROVANJE_MS)
+        if self._redovi[DEBOUNCE].opsezi:
+            self.debounce.zakazi()
+
+    def isprazni(self, prioritet: str):
+        """Odmah predaje promjene koje čekaju (npr. prije čitanja rezultata pretplatnika)."""
+        if prioritet == MIROVANJE:
+            self._mirovanje.stop()
+        red = self._redovi[prioritet]
+        if not red.opsezi:
+            return
+        promjene = red.isprazni()
+        for fn, kad in self._pretplatnici[prioritet]:
+            if kad is None or kad():
+                fn(promjene)
+
+    def tekst(self, promjena: Promjena) -> str:
+        """Trenutni tekst opsega promjene (umetnuti tekst izmjene)."""
+        cursor = QTextCursor(self.doc)
+        cursor.setPosition(promjena.pozicija)
+        cursor.setPosition(promjena.pozicija + promjena.dodano, QTextCursor.KeepAnchor)
+        return cursor.selectedText().replace("\u2029", "\n")
+
+    def linije(self, promjena: Promjena):
+        """Tekst blokova [novi_od, novi_do) — linije koje je promjena ostavila."""
+        blok = self.doc.findBlockByNumber(promjena.novi_od)
+        for _ in range(promjena.novi_do - promjena.novi_od):
+            yield blok.text()
+            blok = blok.next()
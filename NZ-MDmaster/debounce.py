@@ -0,0 +1,118 @@
+"""
+Adaptive debounce for preview refreshes.
+The delay after the last edit (or file change) and the longest a refresh may
+be put off while changes keep coming are derived from what recent renders
+have cost, scaled to the current document size: a short note refreshes
+almost at once, a huge document waits longer but is still refreshed at
+least every few render lengths. A refresh never starts while the previous
+one is still loading — it waits for it, so renders cannot pile up.
+"""
+import time
+
+from PySide6.QtCore import QObject, QTimer, Signal
+
+# debounce = FAKTOR x procijenjeni trošak rendera, u granicama [MIN_MS, MAX_MS]
+FAKTOR = 1.5
+MIN_MS = 50
+MAX_MS = 1000
+# Dok izmjene stižu, refresh smije zauzeti najviše ovaj udio vremena
+UDIO_RENDERA = 0.25
+MAX_CEKANJE_MS = 5000
+# Težina novog mjerenja u prosjeku (EWMA)
+ALFA = 0.3
+# Refresh koji se nije javio (npr. prekinut drugim dokumentom) ne blokira zauvijek
+_ZAGLAVLJEN_S = 5.0
+
+
+class TrosakRendera:
+    """Pokretni prosjek (EWMA) trajanja rendera — render do loadFinished — i veličine teksta."""
+
+    def __init__(self):
+        self.ms = None
+        self.velicina = None
+
+    def zabiljezi(self, ms: float, velicina: int):
+        velicina = max(velicina, 1)
+        if self.ms is None:
+            self.ms, self.velicina = ms, velicina
+            return
+        self.ms += ALFA * (ms - self.ms)
+        self.velicina += ALFA * (velicina - self.velicina)
+
+    def procjena(self, velicina: int):
+        """Očekivani ms za tekst ove veličine (srazmjerno prosjeku); None prije prvog mjerenja."""
+        if self.ms is None:
+            return None
+        return self.ms * max(velicina, 1) / self.velicina
+
+
+class AdaptiveDebounce(QObject):
+    """
+    zakazi() pri svakoj izmjeni; okini se emituje kad izmjene miruju
+    debounce_ms ili najkasnije max_ms od prve neobrađene izmjene.
+    zavrseno() javlja da je pokrenuti refresh prikazan.
+    """
+
+    okini = Signal()
+
+    def __init__(self, trosak, velicina_fn, podrazumijevano_ms, parent=None):
+        super().__init__(parent)
+        self.trosak = trosak
+        self.velicina_fn = velicina_fn
+        self.podrazumijevano_ms = podrazumijevano_ms
+        self.debounce_ms = podrazumijevano_ms
+        self.max_ms = 4 * podrazumijevano_ms
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.timeout.connect(self._istekao)
+        # Vrijeme prve izmjene koja još nije prikazana
+        self._prva = None
+        # Početak refresha koji se još učitava, i da li nove izmjene čekaju na njega
+        self._u_toku = None
+        self._ceka = False
+
+    def _izracunaj(self):
+        procjena = self.trosak.procjena(self.velicina_fn())
+        if procjena is None:
+            return self.podrazumijevano_ms, 4 * self.podrazumijevano_ms
+        debounce = min(MAX_MS, max(MIN_MS, FAKTOR * procjena))
+        najduze = min(MAX_CEKANJE_MS, max(2 * debounce, procjena / UDIO_RENDERA))
+        return round(debounce), round(najduze)
+
+    def zakazi(self):
+        sada = time.monotonic()
+        if self._prva is None:
+            self._prva = sada
+        self.debounce_ms, self.max_ms = self._izracunaj()
+        preostalo = self.max_ms - (sada - self._prva) * 1000.0
+        self._timer.start(int(max(0.0, min(self.debounce_ms, preostalo))))
+
+    def _istekao(self):
+        if self._u_toku is not None:
+            preostalo = _ZAGLAVLJEN_S - (time.monotonic() - self._u_toku)
+            if preostalo > 0:
+                # Čeka se zavrseno(); ako nikad ne stigne, okini kad refresh proglasimo zaglavljenim
+                self._ceka = True
+                self._timer.start(int(preostalo * 1000) + 1)
+                return
+        self._prva = None
+        self._ceka = False
+        self._u_toku = time.monotonic()
+        self.okini.emit()
+
+    def zavrseno(self):
+        """Pregled je prikazan; izmjene koje su čekale idu odmah (iz event petlje)."""
+        if self._u_toku is None:
+            return
+        self._u_toku = None
+        if self._ceka:
+            self._ceka = False
+            self._timer.start(0)
+
+    def otkazi(self):
+        self._timer.stop()
+        self._prva = None
+        self._ceka = False
+
+    def na_cekanju(self) -> bool:
+        return self._timer.isActive() or self._ceka
@@ -0,0 +1,180 @@
+"""
+Markdown render engines — no Qt imports at module level.
+Every engine turns Markdown into an HTML body plus a flat heading list in the
+toc_tokens format (level, id, name), so the rest of the pipeline — images,
+outline, tables, sections — does not care which one produced it.
+Python-Markdown with our extension set is the reference; markdown-it-py and
+mistune are optional, faster engines configured as close to it as their
+plugins allow (benchmarks/compat.py reports the remaining differences).
+"""
+import re
+import html
+import importlib
+import importlib.util
+
+PODRAZUMIJEVANI = "python-markdown"
+
+_TAG = re.compile(r"<[^>]*>")
+
+
+class Engine:
+    """Osnova engine-a: ime je ključ u postavkama, modul paket bez kojeg nije dostupan."""
+
+    ime = ""
+    naziv = ""
+    modul = ""
+
+    def dostupan(self) -> bool:
+        return importlib.util.find_spec(self.modul) is not None
+
+    def verzija(self) -> str:
+        return getattr(importlib.import_module(self.modul), "__version__", "?")
+
+    def renderuj(self, tekst: str, profil: str = "puni", tracer=None):
+        """(html body, toc_tokens); profil "smanjeni" izostavlja skupe inline ekstenzije."""
+        raise NotImplementedError
+
+
+class _Naslovi:
+    """id-jevi naslova kao toc ekstenzija (slugify + jedinstveni sufiks) i lista za outline."""
+
+    def __init__(self):
+        from markdown.extensions.toc import slugify, unique
+        self._slugify, self._unique = slugify, unique
+        self._ids = set()
+        self.tokens = []
+
+    def dodaj(self, nivo: int, tekst: str) -> str:
+        id_ = self._unique(self._slugify(tekst, "-"), self._ids)
+        ime = html.escape(tekst, quote=False)
+        self.tokens.append({
+            "level": nivo, "id": id_, "name": ime, "html": ime,
+            "data-toc-label": "", "children": [],
+        })
+        return id_
+
+
+def _highlighter(tracer, pogodi: bool):
+    """Pygments sa istim HTML-om kao pymdownx.highlight (div.highlight > pre > code)."""
+    from pygments import highlight
+    from pygments.formatters import HtmlFormatter
+    from pygments.lexers import get_lexer_by_name, guess_lexer
+    from pygments.lexers.special import TextLexer
+    from pygments.util import ClassNotFound
+
+    formatter = HtmlFormatter(cssclass="highlight", wrapcode=True)
+
+    def oboji(kod: str, jezik: str) -> str:
+        try:
+            lexer = get_lexer_by_name(jezik) if jezik else (guess_lexer(kod) if pogodi else TextLexer())
+        except ClassNotFound:
+            lexer = TextLexer()
+        if tracer is None:
+            return highlight(kod, lexer, formatter)
+        with tracer.span("pygments", sabiraj=True):
+            return highlight(kod, lexer, formatter)
+
+    return oboji
+
+
+class PythonMarkdown(Engine):
+    ime = PODRAZUMIJEVANI
+    naziv = "Python-Markdown"
+    modul = "markdown"
+
+    def renderuj(self, tekst, profil="puni", tracer=None):
+        import markdown
+        # render uvozi ovaj modul; Pygments mjeri njegov omotač oko pymdownx.highlight
+        from render import _markdown_ekstenzije
+        extensions, extension_configs = _markdown_ekstenzije(profil)
+        md = markdown.Markdown(extensions=extensions, extension_configs=extension_configs)
+        body = md.convert(tekst)
+        return body, getattr(md, "toc_tokens", [])
+
+
+class MarkdownIt(Engine):
+    ime = "markdown-it"
+    naziv = "markdown-it-py"
+    modul = "markdown_it"
+
+    def renderuj(self, tekst, profil="puni", tracer=None):
+        from markdown_it import MarkdownIt as _MarkdownIt
+        puni = profil == "puni"
+        md = _MarkdownIt("commonmark", {"html": True, "breaks": True, "typographer": puni})
+        md.enable(["table", "strikethrough"])
+        if puni:
+            md.enable(["replacements", "smartquotes"])
+        try:
+            from mdit_py_plugins.footnote import footnote_plugin
+            from mdit_py_plugins.deflist import deflist_plugin
+            from mdit_py_plugins.tasklists import tasklists_plugin
+            from mdit_py_plugins.admon import admon_plugin
+            from mdit_py_plugins.attrs import attrs_plugin, attrs_block_plugin
+            from mdit_py_plugins.superscript import superscript_plugin
+            for plugin in (footnote_plugin, deflist_plugin, tasklists_plugin, admon_plugin,
+                           attrs_plugin, attrs_block_plugin, superscript_plugin):
+                md.use(plugin)
+        except ImportError:
+            pass
+
+        oboji = _highlighter(tracer, pogodi=puni)
+
+        def fence(renderer, tokens, idx, options, env):
+            jezik = tokens[idx].info.strip().split(maxsplit=1)
+            return oboji(tokens[idx].content, jezik[0] if jezik else "")
+
+        md.add_render_rule("fence", fence)
+
+        env = {}
+        tokens = md.parse(tekst, env)
+        naslovi = _Naslovi()
+        for i, token in enumerate(tokens):
+            if token.type == "heading_open" and not token.attrGet("id"):
+                tekst_naslova = "".join(
+                    t.content for t in (tokens[i + 1].children or []) if t.type in ("text", "code_inline")
+                )
+                token.attrSet("id", naslovi.dodaj(int(token.tag[1]), tekst_naslova))
+        return md.renderer.render(tokens, md.options, env), naslovi.tokens
+
+
+class Mistune(Engine):
+    ime = "mistune"
+    naziv = "mistune"
+    modul = "mistune"
+
+    def renderuj(self, tekst, profil="puni", tracer=None):
+        import mistune
+        puni = profil == "puni"
+        naslovi = _Naslovi()
+        oboji = _highlighter(tracer, pogodi=puni)
+
+        class _Renderer(mistune.HTMLRenderer):
+            def heading(self, text, level, **attrs):
+                id_ = naslovi.dodaj(level, html.unescape(_TAG.sub("", text)))
+                return f'<h{level} id="{id_}">{text}</h{level}>\n'
+
+            def block_code(self, code, info=None):
+                jezik = (info or "").strip().split(maxsplit=1)
+                return oboji(code, jezik[0] if jezik else "")
+
+        plugins = ["strikethrough", "footnotes", "table", "task_lists", "def_list", "mark",
+                   "superscript", "subscript", "insert"]
+        if puni:
+            plugins += ["url", "abbr"]
+        md = mistune.create_markdown(escape=False, hard_wrap=True, renderer=_Renderer(), plugins=plugins)
+        return md(tekst), naslovi.tokens
+
+
+ENGINES = {e.ime: e for e in (PythonMarkdown(), MarkdownIt(), Mistune())}
+
+
+def engine_za(ime: str) -> Engine:
+    """Engine po imenu; nepoznat ili neinstaliran pada na Python-Markdown."""
+    engine = ENGINES.get(ime)
+    if engine is None or not engine.dostupan():
+        return ENGINES[PODRAZUMIJEVANI]
+    return engine
+
+
+def dostupni() -> list:
+    return [e for e in ENGINES.values() if e.dostupan()]
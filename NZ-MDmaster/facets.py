@@ -0,0 +1,163 @@
+"""
+Sidebar facet filter: field/value combos above the file tree and the proxy
+model that hides files not in the selected facet. Filtering only looks up
+paths in sets computed from MetaIndex — no file is read.
+"""
+import os
+
+from PySide6.QtWidgets import QWidget, QHBoxLayout, QComboBox
+from PySide6.QtCore import Qt, Signal, QSortFilterProxyModel, QCollator
+
+
+class _Combo(QComboBox):
+    """QComboBox koji javlja kad se lista otvara (da se facete napune tek tada)."""
+
+    otvaranje = Signal()
+
+    def showPopup(self):
+        self.otvaranje.emit()
+        super().showPopup()
+
+
+class FacetBar(QWidget):
+    """Dva combo-a: polje front mattera i vrijednost; prva stavka = bez filtera."""
+
+    # polje, vrijednost ("" = sva polja / bilo koja vrijednost)
+    filter_promijenjen = Signal(str, str)
+    otvaranje = Signal()
+
+    def __init__(self, tekst_sve, tekst_bilo_koja, parent=None):
+        super().__init__(parent)
+        self.tekst_sve = tekst_sve
+        self.tekst_bilo_koja = tekst_bilo_koja
+        layout = QHBoxLayout(self)
+        layout.setContentsMargins(4, 4, 4, 4)
+        layout.setSpacing(4)
+        self.setStyleSheet("""
+            QWidget {
+                background-color: #0d1117;
+            }
+            QComboBox {
+                background-color: #161b22;
+                color: #c9d1d9;
+                border: 1px solid #30363d;
+                border-radius: 4px;
+                padding: 2px 6px;
+                font-size: 12px;
+            }
+            QComboBox QAbstractItemView {
+                background-color: #161b22;
+                color: #c9d1d9;
+                selection-background-color: #1f6feb;
+            }
+        """)
+        self.polje = _Combo()
+        self.polje.addItem(tekst_sve, "")
+        self.polje.otvaranje.connect(self.otvaranje)
+        self.polje.currentIndexChanged.connect(self._on_polje)
+        layout.addWidget(self.polje, 1)
+        self.vrijednost = _Combo()
+        self.vrijednost.currentIndexChanged.connect(self._javi)
+        self.vrijednost.hide()
+        layout.addWidget(self.vrijednost, 1)
+
+    def trenutno(self):
+        polje = self.polje.currentData() or ""
+        vrijednost = (self.vrijednost.currentData() or "") if polje else ""
+        return polje, vrijednost
+
+    def postavi_polja(self, polja):
+        """Puni listu polja, zadržava izbor ako polje još postoji."""
+        trenutno = self.polje.currentData()
+        self.polje.blockSignals(True)
+        self.polje.clear()
+        self.polje.addItem(self.tekst_sve, "")
+        for polje in polja:
+            self.polje.addItem(polje, polje)
+        i = self.polje.findData(trenutno)
+        self.polje.setCurrentIndex(max(i, 0))
+        self.polje.blockSignals(False)
+        if trenutno and i < 0:
+            self._on_polje()
+
+    def postavi_vrijednosti(self, vrijednosti):
+        """vrijednosti: [(vrijednost, broj fajlova)]"""
+        trenutno = self.vrijednost.currentData()
+        self.vrijednost.blockSignals(True)
+        self.vrijednost.clear()
+        self.vrijednost.addItem(self.tekst_bilo_koja, "")
+        for v, n in vrijednosti:
+            self.vrijednost.addItem(f"{v} ({n})", v)
+        i = self.vrijednost.findData(trenutno)
+        self.vrijednost.setCurrentIndex(max(i, 0))
+        self.vrijednost.blockSignals(False)
+        if trenutno and i < 0:
+            self._javi()
+
+    def _on_polje(self, *_):
+        polje = self.polje.currentData()
+        self.vrijednost.setVisible(bool(polje))
+        self.vrijednost.blockSignals(True)
+        self.vrijednost.clear()
+        self.vrijednost.addItem(self.tekst_bilo_koja, "")
+        self.vrijednost.blockSignals(False)
+        self._javi()
+
+    def _javi(self, *_):
+        self.filter_promijenjen.emit(*self.trenutno())
+
+
+class FacetFilterModel(QSortFilterProxyModel):
+    """
+    Proxy nad QFileSystemModel: uz aktivan filter prolaze samo dozvoljeni fajlovi
+    i folderi na putu do njih. Sortiranje: folderi prvi, prirodni redoslijed imena.
+    """
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._fajlovi = None
+        self._folderi = set()
+        self._collator = QCollator()
+        self._collator.setNumericMode(True)
+        self._collator.setCaseSensitivity(Qt.CaseInsensitive)
+
+    @property
+    def aktivan(self) -> bool:
+        return self._fajlovi is not None
+
+    def postavi_dozvoljene(self, putanje):
+        """putanje: skup apsolutnih putanja, ili None za bez filtera."""
+        if putanje is None and self._fajlovi is None:
+            return
+        self._fajlovi = set(putanje) if putanje is not None else None
+        self._folderi = set()
+        for putanja in self._fajlovi or ():
+            folder = os.path.dirname(putanja)
+            while folder not in self._folderi:
+                self._folderi.add(folder)
+                roditelj = os.path.dirname(folder)
+                if roditelj == folder:
+                    break
+                folder = roditelj
+        self.invalidateFilter()
+
+    def filterAcceptsRow(self, row, parent):
+        if self._fajlovi is None:
+            return True
+        model = self.sourceModel()
+        index = model.index(row, 0, parent)
+        putanja = model.filePath(index)
+        if model.isDir(index):
+            if putanja in self._folderi:
+                return True
+            # Root drveta (i folderi iznad njega) ostaju i kad ništa ne odgovara
+            root = model.rootPath()
+            return root == putanja or root.startswith(putanja.rstrip("/") + "/")
+        return putanja in self._fajlovi
+
+    def lessThan(self, lijevo, desno):
+        model = self.sourceModel()
+        dir_l, dir_d = model.isDir(lijevo), model.isDir(desno)
+        if dir_l != dir_d:
+            return dir_l
+        return self._collator.compare(model.fileName(lijevo), model.fileName(desno)) < 0
@@ -0,0 +1,236 @@
+"""
+Front matter metadata index — no Qt imports at module level.
+Only the header of each file is read (up to the closing `---`), parsed with
+PyYAML when it is installed and with a small built-in parser otherwise.
+MetaIndex keeps {field: {value: paths}} for the facet filter and is stored
+as JSON, so unchanged files are not re-read in the next session either.
+"""
+import os
+import json
+
+from journal import atomicno_sacuvaj
+
+try:
+    import yaml
+    _YamlLoader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+except ImportError:
+    yaml = None
+
+INDEX_FILE = os.path.expanduser("~/.cache/nzmdviewer/frontmatter.json")
+
+# Zaglavlje duže od ovoga nije front matter nego dokument koji počinje sa ---
+_MAX_ZAGLAVLJE = 64 * 1024
+# Vrijednosti duže od ovoga (opisi, sažeci) nisu korisne kao faceta
+_MAX_VRIJEDNOST = 80
+_VERZIJA = 1
+
+
+def procitaj_zaglavlje(putanja: str):
+    """Tekst između uvodnih `---` linija, ili None. Čita samo te bajte, ne cijeli fajl."""
+    with open(putanja, "rb", buffering=4096) as f:
+        prva = f.readline(64)
+        if prva.lstrip(b"\xef\xbb\xbf").rstrip() != b"---":
+            return None
+        linije = []
+        procitano = len(prva)
+        while procitano < _MAX_ZAGLAVLJE:
+            linija = f.readline(_MAX_ZAGLAVLJE - procitano)
+            if not linija:
+                return None
+            procitano += len(linija)
+            if linija.rstrip() in (b"---", b"..."):
+                return b"".join(linije).decode("utf-8", "replace")
+            linije.append(linija)
+    return None
+
+
+def _skalar(tekst: str) -> str:
+    tekst = tekst.strip()
+    if len(tekst) >= 2 and tekst[0] == tekst[-1] and tekst[0] in "'\"":
+        return tekst[1:-1]
+    # Komentar na kraju linije
+    poz = tekst.find(" #")
+    return tekst[:poz].rstrip() if poz >= 0 else tekst
+
+
+def _parsiraj_jednostavno(tekst: str) -> dict:
+    """`kljuc: vrijednost`, `kljuc: [a, b]` i blok liste `- a` — dovoljno za tipičan front matter."""
+    podaci = {}
+    kljuc = None
+    for linija in tekst.splitlines():
+        if not linija.strip() or linija.lstrip().startswith("#"):
+            continue
+        if linija[0] in " \t-":
+            stavka = linija.strip()
+            if kljuc is not None and stavka.startswith("- "):
+                if not isinstance(podaci.get(kljuc), list):
+                    podaci[kljuc] = []
+                podaci[kljuc].append(_skalar(stavka[2:]))
+            continue
+        ime, sep, vrijednost = linija.partition(":")
+        if not sep:
+            kljuc = None
+            continue
+        kljuc = ime.strip()
+        vrijednost = vrijednost.strip()
+        if vrijednost.startswith("[") and vrijednost.endswith("]"):
+            podaci[kljuc] = [_skalar(v) for v in vrijednost[1:-1].split(",") if v.strip()]
+        else:
+            podaci[kljuc] = _skalar(vrijednost) if vrijednost else None
+    return podaci
+
+
+def parsiraj_frontmatter(tekst: str) -> dict:
+    """YAML zaglavlje -> {polje: [vrijednosti]}; zadržavaju se samo skalari i liste skalara."""
+    podaci = None
+    if yaml is not None:
+        try:
+            podaci = yaml.load(tekst, Loader=_YamlLoader)
+        except yaml.YAMLError:
+            podaci = None
+    if not isinstance(podaci, dict):
+        podaci = _parsiraj_jednostavno(tekst)
+    meta = {}
+    for polje, vrijednost in podaci.items():
+        if not isinstance(vrijednost, list):
+            vrijednost = [vrijednost]
+        vrijednosti = []
+        for v in vrijednost:
+            if v is None or isinstance(v, (dict, list)):
+                continue
+            v = str(v).strip()
+            if v and len(v) <= _MAX_VRIJEDNOST and v not in vrijednosti:
+                vrijednosti.append(v)
+        if vrijednosti:
+            meta[str(polje).strip().lower()] = vrijednosti
+    return meta
+
+
+def procitaj_frontmatter(putanja: str) -> dict:
+    try:
+        zaglavlje = procitaj_zaglavlje(putanja)
+    except OSError:
+        return {}
+    return parsiraj_frontmatter(zaglavlje) if zaglavlje else {}
+
+
+def analizator(kes: dict):
+    """
+    Analizator za WorkspaceIndexer: vraća (mtime_ns, size, meta). Fajl se čita
+    samo ako se razlikuje od zapisa u `kes` (snimak MetaIndex-a, samo za čitanje).
+    """
+    def analiziraj(putanja):
+        st = os.stat(putanja)
+        stari = kes.get(putanja)
+        if stari and stari[0] == st.st_mtime_ns and stari[1] == st.st_size:
+            return stari
+        return st.st_mtime_ns, st.st_size, procitaj_frontmatter(putanja)
+    return analiziraj
+
+
+class MetaIndex:
+    """Front matter svih fajlova workspace-a + obrnuti indeks polje -> vrijednost -> putanje."""
+
+    def __init__(self, fajl: str = INDEX_FILE):
+        self.fajl = fajl
+        self._zapisi = {}   # putanja -> (mtime_ns, size, meta)
+        self._facete = {}   # polje -> {vrijednost: set(putanja)}
+        self.ucitan = False
+        self._izmijenjen = False
+
+    def __len__(self):
+        return len(self._zapisi)
+
+    def ucitaj(self):
+        """Učitava indeks sa diska; zapisi za fajlove kojih više nema se preskaču."""
+        self.ucitan = True
+        try:
+            with open(self.fajl, "r", encoding="utf-8") as f:
+                podaci = json.load(f)
+        except (OSError, ValueError):
+            return
+        if podaci.get("v") != _VERZIJA:
+            return
+        for putanja, (mtime_ns, size, meta) in podaci.get("fajlovi", {}).items():
+            if os.path.exists(putanja):
+                self.postavi(putanja, (mtime_ns, size, meta))
+        self._izmijenjen = False
+
+    def sacuvaj(self):
+        if not self._izmijenjen:
+            return
+        try:
+            os.makedirs(os.path.dirname(self.fajl), exist_ok=True)
+            atomicno_sacuvaj(self.fajl, json.dumps(
+                {"v": _VERZIJA, "fajlovi": self._zapisi}, ensure_ascii=False, separators=(",", ":")
+            ))
+            self._izmijenjen = False
+        except OSError as e:
+            print(f"Greška pri čuvanju front matter indeksa: {e}")
+
+    def kes(self) -> dict:
+        """Snimak zapisa za analizator() u pozadinskom threadu."""
+        return dict(self._zapisi)
+
+    def postavi(self, putanja: str, zapis):
+        """zapis: (mtime_ns, size, meta) iz analizator()."""
+        stari = self._zapisi.get(putanja)
+        if stari is not None and tuple(stari) == tuple(zapis):
+            return
+        self.ukloni(putanja)
+        zapis = tuple(zapis)
+        self._zapisi[putanja] = zapis
+        for polje, vrijednosti in zapis[2].items():
+            facete = self._facete.setdefault(polje, {})
+            for v in vrijednosti:
+                facete.setdefault(v, set()).add(putanja)
+        self._izmijenjen = True
+
+    def ukloni(self, putanja: str):
+        zapis = self._zapisi.pop(putanja, None)
+        if zapis is None:
+            return
+        for polje, vrijednosti in zapis[2].items():
+            facete = self._facete.get(polje, {})
+            for v in vrijednosti:
+                putanje = facete.get(v)
+                if putanje is not None:
+                    putanje.discard(putanja)
+                    if not putanje:
+                        del facete[v]
+            if not facete:
+                self._facete.pop(polje, None)
+        self._izmijenjen = True
+
+    def meta(self, putanja: str) -> dict:
+        zapis = self._zapisi.get(putanja)
+        return zapis[2] if zapis else {}
+
+    def polja(self, root: str = None) -> list:
+        """Polja sortirana po broju fajlova koji ih imaju (samo ispod `root`, ako je dat)."""
+        broj = {polje: len(self.fajlovi(polje, root=root)) for polje in self._facete}
+        return sorted((p for p in broj if broj[p]), key=lambda p: (-broj[p], p))
+
+    def vrijednosti(self, polje: str, root: str = None) -> list:
+        """[(vrijednost, broj fajlova)] za polje, najčešće prvo."""
+        rezultat = []
+        for v, putanje in self._facete.get(polje, {}).items():
+            n = len(putanje) if root is None else len(_ispod(putanje, root))
+            if n:
+                rezultat.append((v, n))
+        rezultat.sort(key=lambda par: (-par[1], par[0].lower()))
+        return rezultat
+
+    def fajlovi(self, polje: str, vrijednost: str = None, root: str = None) -> set:
+        """Putanje sa datom vrijednošću polja (ili bilo kojom, ako je vrijednost None)."""
+        facete = self._facete.get(polje, {})
+        if vrijednost is not None:
+            putanje = facete.get(vrijednost, set())
+        else:
+            putanje = set().union(*facete.values()) if facete else set()
+        return putanje if root is None else _ispod(putanje, root)
+
+
+def _ispod(putanje, root: str) -> set:
+    prefiks = root.rstrip(os.sep) + os.sep
+    return {p for p in putanje if p.startswith(prefiks)}
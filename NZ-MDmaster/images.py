@@ -0,0 +1,213 @@
+"""
+Image pipeline helpers — no Qt imports at module level.
+Reads image dimensions from file headers (cached) and rewrites <img> tags in
+rendered HTML: lazy loading, intrinsic width/height (no layout shift while
+images arrive) and, for the preview, the nzimg: scheme that serves cached
+downscaled copies.
+"""
+import os
+import re
+import html
+import struct
+import time
+import hashlib
+import threading
+from collections import OrderedDict
+from urllib.parse import urlparse, unquote, quote
+
+IMAGE_SCHEME = "nzimg"
+THUMB_DIR = os.path.expanduser("~/.cache/nzmdviewer/thumbs")
+# Keš smanjenih kopija: najviše ovoliko bajtova, kopije nekorištene duže od THUMB_MAX_DANA se brišu
+THUMB_MAX_BAJTOVA = 256 * 1024 * 1024
+THUMB_MAX_DANA = 30
+
+# Formati koje scheme handler smanjuje (GIF ostaje original zbog animacije);
+# obradi_slike samo njih prepisuje na nzimg:, pa handler ništa drugo ne servira
+SKALABILNI = (".png", ".jpg", ".jpeg", ".webp", ".bmp")
+
+_DIM_CACHE_MAX = 4096
+_dim_cache: "OrderedDict[tuple, tuple | None]" = OrderedDict()
+# Keš čitaju i mijenjaju i GUI thread (obradi_slike) i thread pool scheme handlera
+_dim_lock = threading.Lock()
+
+_IMG = re.compile(r'<img\b([^>]*?)\s*(/?)>', re.IGNORECASE)
+_ATTR = re.compile(r'([\w:-]+)\s*=\s*(?:"([^"]*)"|\'([^\']*)\'|([^\s"\'>]+))')
+
+
+def _dimenzije_iz_headera(glava: bytes):
+    """Parsira (width, height) iz prvih bajtova PNG/GIF/JPEG/WebP/BMP fajla."""
+    if glava.startswith(b"\x89PNG\r\n\x1a\n") and glava[12:16] == b"IHDR":
+        return struct.unpack(">II", glava[16:24])
+    if glava[:6] in (b"GIF87a", b"GIF89a"):
+        return struct.unpack("<HH", glava[6:10])
+    if glava.startswith(b"BM") and len(glava) >= 26:
+        w, h = struct.unpack("<ii", glava[18:26])
+        return w, abs(h)
+    if glava[:4] == b"RIFF" and glava[8:12] == b"WEBP":
+        vrsta = glava[12:16]
+        if vrsta == b"VP8 " and len(glava) >= 30:
+            w, h = struct.unpack("<HH", glava[26:30])
+            return w & 0x3FFF, h & 0x3FFF
+        if vrsta == b"VP8L" and len(glava) >= 25:
+            b = glava[21:25]
+            w = 1 + (((b[1] & 0x3F) << 8) | b[0])
+            h = 1 + (((b[3] & 0x0F) << 10) | (b[2] << 2) | ((b[1] & 0xC0) >> 6))
+            return w, h
+        if vrsta == b"VP8X" and len(glava) >= 30:
+            w = 1 + int.from_bytes(glava[24:27], "little")
+            h = 1 + int.from_bytes(glava[27:30], "little")
+            return w, h
+    if glava.startswith(b"\xff\xd8"):
+        # JPEG: preskači segmente do SOFn markera
+        i = 2
+        while i + 9 < len(glava):
+            if glava[i] != 0xFF:
+                i += 1
+                continue
+            marker = glava[i + 1]
+            if marker in (0xD8, 0x01) or 0xD0 <= marker <= 0xD7:
+                i += 2
+                continue
+            duzina = struct.unpack(">H", glava[i + 2:i + 4])[0]
+            if 0xC0 <= marker <= 0xCF and marker not in (0xC4, 0xC8, 0xCC):
+                h, w = struct.unpack(">HH", glava[i + 5:i + 9])
+                return w, h
+            i += 2 + duzina
+    return None
+
+
+def dimenzije_slike(putanja: str):
+    """(width, height) slike ili None; čita samo header, rezultat se kešira po mtime/size."""
+    try:
+        st = os.stat(putanja)
+    except OSError:
+        return None
+    kljuc = (putanja, st.st_mtime_ns, st.st_size)
+    with _dim_lock:
+        if kljuc in _dim_cache:
+            _dim_cache.move_to_end(kljuc)
+            return _dim_cache[kljuc]
+    try:
+        with open(putanja, "rb") as f:
+            glava = f.read(64)
+            dim = _dimenzije_iz_headera(glava)
+            if dim is None and glava.startswith(b"\xff\xd8"):
+                # EXIF/ICC segmenti znaju gurnuti SOF dalje od početka
+                f.seek(0)
+                dim = _dimenzije_iz_headera(f.read(256 * 1024))
+    except OSError:
+        dim = None
+    if dim is not None and (dim[0] <= 0 or dim[1] <= 0):
+        dim = None
+    with _dim_lock:
+        _dim_cache[kljuc] = dim
+        if len(_dim_cache) > _DIM_CACHE_MAX:
+            _dim_cache.popitem(last=False)
+    return dim
+
+
+def lokalna_putanja(src: str, folder: str):
+    """Apsolutna putanja za relativni ili file:// src, inače None."""
+    src = html.unescape(src).strip()
+    if not src or src.startswith(("data:", "#")):
+        return None
+    url = urlparse(src)
+    if url.scheme == "file":
+        return unquote(url.path)
+    if url.scheme or src.startswith("//"):
+        return None
+    putanja = unquote(url.path)
+    if not os.path.isabs(putanja):
+        putanja = os.path.join(folder, putanja)
+    return os.path.normpath(putanja)
+
+
+def obradi_slike(body: str, folder: str, lazy: bool = True, shema: bool = False) -> str:
+    """
+    Dodaje loading="lazy"/decoding="async" (lazy=True) i width/height iz headera
+    slika u sve <img> tagove. Sa shema=True lokalne rasterske slike idu preko
+    nzimg: scheme-a (smanjene kopije iz keša).
+    """
+    if "<img" not in body and "<IMG" not in body:
+        return body
+
+    def zamijeni(m):
+        atributi = m.group(1)
+        imena = {a.group(1).lower(): a for a in _ATTR.finditer(atributi)}
+        dodatak = []
+        if lazy and "loading" not in imena:
+            dodatak.append('loading="lazy"')
+        if lazy and "decoding" not in imena:
+            dodatak.append('decoding="async"')
+
+        src_attr = imena.get("src")
+        if src_attr is not None:
+            src = next(g for g in src_attr.groups()[1:] if g is not None)
+            putanja = lokalna_putanja(src, folder)
+            if putanja:
+                if "width" not in imena and "height" not in imena:
+                    dim = dimenzije_slike(putanja)
+                    if dim:
+                        dodatak.append(f'width="{dim[0]}" height="{dim[1]}"')
+                if shema and putanja.lower().endswith(SKALABILNI) and os.path.isfile(putanja):
+                    novi_src = html.escape(f"{IMAGE_SCHEME}:{quote(putanja)}", quote=True)
+                    atributi = (
+                        atributi[:src_attr.start()]
+                        + f'src="{novi_src}" data-src="{html.escape(html.unescape(src), quote=True)}"'
+                        + atributi[src_attr.end():]
+                    )
+
+        if not dodatak and atributi == m.group(1):
+            return m.group(0)
+        kraj = " />" if m.group(2) else ">"
+        dodatak_txt = " " + " ".join(dodatak) if dodatak else ""
+        return f"<img{atributi}{dodatak_txt}{kraj}"
+
+    return _IMG.sub(zamijeni, body)
+
+
+def thumbnail_putanja(putanja: str, sirina: int) -> str:
+    """Putanja u kešu za smanjenu kopiju (ključ: putanja, mtime, size, širina)."""
+    st = os.stat(putanja)
+    kljuc = f"{putanja}|{st.st_mtime_ns}|{st.st_size}|{sirina}".encode("utf-8")
+    ext = ".jpg" if putanja.lower().endswith((".jpg", ".jpeg")) else ".png"
+    return os.path.join(THUMB_DIR, hashlib.sha1(kljuc).hexdigest() + ext)
+
+
+def sirina_bucket(sirina: int, korak: int = 320) -> int:
+    """Zaokružuje ciljnu širinu naviše na korak, da zoom ne pravi novu kopiju za svaki piksel."""
+    return max(korak, -(-int(sirina) // korak) * korak)
+
+
+def ocisti_thumbnailove(folder: str = THUMB_DIR, maks_bajtova: int = THUMB_MAX_BAJTOVA,
+                        maks_dana: float = THUMB_MAX_DANA) -> int:
+    """
+    Briše kopije starije od maks_dana, pa najdavnije korištene dok keš ne stane
+    u maks_bajtova (korištenje = mtime, handler ga osvježava pri svakom čitanju).
+    Vraća broj obrisanih fajlova.
+    """
+    try:
+        unosi = list(os.scandir(folder))
+    except OSError:
+        return 0
+    fajlovi = []
+    for e in unosi:
+        try:
+            if e.is_file():
+                st = e.stat()
+                fajlovi.append((st.st_mtime, st.st_size, e.path))
+        except OSError:
+            pass
+    granica = time.time() - maks_dana * 86400
+    ukupno = sum(f[1] for f in fajlovi)
+    obrisano = 0
+    for mtime, velicina, putanja in sorted(fajlovi):
+        if mtime >= granica and ukupno <= maks_bajtova:
+            break
+        try:
+            os.remove(putanja)
+        except OSError:
+            continue
+        ukupno -= velicina
+        obrisano += 1
+    return obrisano
@@ -0,0 +1,215 @@
+"""
+Crash-safe saving — no Qt imports at module level.
+
+atomicno_sacuvaj() writes through a temp file + fsync + os.replace, so a
+crash or a full disk never leaves a half-written document behind.
+
+EditJournal is a write-ahead log of editor deltas between explicit saves:
+one JSON line per change ({"p": position, "r": removed, "t": inserted}),
+appended in batches. Positions are in UTF-16 code units, exactly as
+QTextDocument.contentsChange reports them, so replay happens on UTF-16 data.
+"""
+import os
+import json
+import hashlib
+import tempfile
+
+JOURNAL_DIR = os.path.expanduser("~/.local/share/nzmdviewer/journal")
+
+# Kad journal preraste ovo (i višestruko sam dokument), sabija se u jednu deltu
+_MAX_JOURNAL = 1024 * 1024
+
+
+def atomicno_sacuvaj(putanja: str, tekst: str, encoding: str = "utf-8"):
+    """Upisuje tekst atomično: temp fajl u istom folderu, fsync, os.replace, fsync foldera."""
+    # Simlink ostaje simlink — zamjenjuje se fajl na koji pokazuje
+    putanja = os.path.realpath(putanja)
+    folder = os.path.dirname(putanja)
+    fd, tmp = tempfile.mkstemp(dir=folder, prefix=f".{os.path.basename(putanja)}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding=encoding, newline="") as f:
+            f.write(tekst)
+            f.flush()
+            os.fsync(f.fileno())
+        try:
+            os.chmod(tmp, os.stat(putanja).st_mode & 0o7777)
+        except OSError:
+            pass
+        os.replace(tmp, putanja)
+    except BaseException:
+        try:
+            os.remove(tmp)
+        except OSError:
+            pass
+        raise
+    try:
+        dir_fd = os.open(folder, os.O_RDONLY)
+        try:
+            os.fsync(dir_fd)
+        finally:
+            os.close(dir_fd)
+    except OSError:
+        pass
+
+
+def _otisak(tekst: str) -> str:
+    return hashlib.sha1(tekst.encode("utf-8", "surrogatepass")).hexdigest()
+
+
+def _utf16_duzina(tekst: str) -> int:
+    return len(tekst.encode("utf-16-le", "surrogatepass")) // 2
+
+
+def journal_putanja(putanja: str) -> str:
+    kljuc = os.path.realpath(putanja).encode("utf-8", "surrogateescape")
+    return os.path.join(JOURNAL_DIR, hashlib.sha1(kljuc).hexdigest()[:20] + ".jsonl")
+
+
+def primijeni_delte(tekst: str, delte) -> str:
+    """Primjenjuje delte (p, r, t) u UTF-16 prostoru i vraća rezultat."""
+    podaci = bytearray(tekst.encode("utf-16-le", "surrogatepass"))
+    for p, r, t in delte:
+        podaci[p * 2:(p + r) * 2] = t.encode("utf-16-le", "surrogatepass")
+    return bytes(podaci).decode("utf-16-le", "surrogatepass")
+
+
+def _procitaj_journal(jpath: str):
+    """(header, delte, zadnja potvrđena dužina); nepotpuna zadnja linija se ignoriše."""
+    with open(jpath, "rb") as f:
+        linije = f.read().split(b"\n")
+    header = json.loads(linije[0].decode("utf-8", "surrogatepass"))
+    delte, potvrdjeno, duzina = [], 0, None
+    for linija in linije[1:]:
+        try:
+            zapis = json.loads(linija.decode("utf-8", "surrogatepass"))
+        except ValueError:
+            break
+        if "n" in zapis:
+            # Kontrolna tačka: sve delte do ovdje su cijele
+            potvrdjeno, duzina = len(delte), zapis["n"]
+        else:
+            delte.append((zapis["p"], zapis["r"], zapis["t"]))
+    return header, delte[:potvrdjeno], duzina
+
+
+def pronadji_oporavak(putanja: str, tekst_na_disku: str):
+    """
+    Tekst nesačuvanih izmjena iz prethodne sesije, ili None. Journal važi samo
+    ako se fajl na disku od tada nije mijenjao (isti hash osnove).
+    """
+    jpath = journal_putanja(putanja)
+    if not os.path.isfile(jpath):
+        return None
+    try:
+        header, delte, duzina = _procitaj_journal(jpath)
+        if header.get("base") != _otisak(tekst_na_disku) or not delte:
+            return None
+        tekst = primijeni_delte(tekst_na_disku, delte)
+        if duzina is not None and _utf16_duzina(tekst) != duzina:
+            return None
+    except (OSError, ValueError, KeyError, TypeError, IndexError):
+        return None
+    return tekst if tekst != tekst_na_disku else None
+
+
+def odbaci_journal(putanja: str):
+    try:
+        os.remove(journal_putanja(putanja))
+    except OSError:
+        pass
+
+
+def journali_na_cekanju() -> list:
+    """Putanje dokumenata koji imaju journal, najnoviji prvi."""
+    try:
+        imena = [os.path.join(JOURNAL_DIR, i) for i in os.listdir(JOURNAL_DIR) if i.endswith(".jsonl")]
+    except OSError:
+        return []
+    rezultat = []
+    for jpath in sorted(imena, key=lambda p: os.path.getmtime(p), reverse=True):
+        try:
+            with open(jpath, "rb") as f:
+                putanja = json.loads(f.readline().decode("utf-8", "surrogatepass"))["path"]
+        except (OSError, ValueError, KeyError):
+            continue
+        if os.path.isfile(putanja):
+            rezultat.append(putanja)
+    return rezultat
+
+
+class EditJournal:
+    """
+    Journal izmjena jednog dokumenta. dodaj() samo bilježi deltu u memoriji;
+    isprazni() ih dopisuje na kraj fajla (append + fdatasync), pa I/O po
+    izmjeni zavisi od veličine izmjene, ne dokumenta.
+    """
+
+    def __init__(self):
+        self.putanja = None
+        self._header = None
+        self._base_duzina = 0
+        self._duzina = 0
+        self._bafer = []
+        self._velicina = 0
+
+    @property
+    def aktivan(self) -> bool:
+        return self.putanja is not None
+
+    @property
+    def duzina(self) -> int:
+        """Dužina dokumenta (UTF-16) nakon svih zabilježenih delti."""
+        return self._duzina
+
+    def zapocni(self, putanja: str, osnova: str):
+        """Novi journal za `putanja`; `osnova` je sadržaj koji je trenutno na disku."""
+        odbaci_journal(putanja)
+        self.putanja = putanja
+        self._base_duzina = self._duzina = _utf16_duzina(osnova)
+        self._header = {"v": 1, "path": os.path.realpath(putanja), "base": _otisak(osnova),
+                        "len": self._base_duzina}
+        self._bafer = []
+        self._velicina = 0
+
+    def zavrsi(self, obrisi: bool = True):
+        """Završava journal; obrisi=False ostavlja fajl za oporavak."""
+        if self.putanja and obrisi:
+            odbaci_journal(self.putanja)
+        self.putanja = None
+        self._bafer = []
+
+    def dodaj(self, pozicija: int, uklonjeno: int, dodano: str):
+        if not self.aktivan:
+            return
+        self._bafer.append({"p": pozicija, "r": uklonjeno, "t": dodano})
+        self._duzina += _utf16_duzina(dodano) - uklonjeno
+
+    def isprazni(self, trenutni_tekst=None):
+        """Dopisuje delte iz memorije. trenutni_tekst() se koristi za sabijanje prevelikog journala."""
+        if not self.aktivan or not self._bafer:
+            return
+        os.makedirs(JOURNAL_DIR, exist_ok=True)
+        jpath = journal_putanja(self.putanja)
+        zapisi = self._bafer + [{"n": self._duzina}]
+        self._bafer = []
+        if self._velicina > max(_MAX_JOURNAL, 8 * self._base_duzina) and trenutni_tekst:
+            # Journal je veći od samog dokumenta — zamijeni ga jednom deltom
+            zapisi = [{"p": 0, "r": self._base_duzina, "t": trenutni_tekst()}, {"n": self._duzina}]
+            self._velicina = 0
+        novi = self._velicina == 0
+        podaci = "".join(
+            json.dumps(z, ensure_ascii=False) + "\n" for z in ([self._header] if novi else []) + zapisi
+        ).encode("utf-8", "surrogatepass")
+        if novi:
+            tmp = jpath + ".tmp"
+            with open(tmp, "wb") as f:
+                f.write(podaci)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp, jpath)
+        else:
+            with open(jpath, "ab") as f:
+                f.write(podaci)
+                f.flush()
+                getattr(os, "fdatasync", os.fsync)(f.fileno())
+        self._velicina += len(podaci)
@@ -0,0 +1,207 @@
+"""
+Broken-link and missing-asset checker — no Qt imports at module level.
+Every file is parsed with the same Python-Markdown extensions as the preview
+(without Pygments); links, images and element ids are collected from the
+element tree. Parsing is spread over a process pool, resolving happens in
+the calling process against the filesystem and the collected anchor ids.
+"""
+import os
+import re
+import bisect
+import multiprocessing
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from urllib.parse import urlparse, unquote
+
+import markdown
+from markdown.treeprocessors import Treeprocessor
+
+from render import _markdown_ekstenzije, procitaj_tekst, markdown_fajlovi, MARKDOWN_EKSTENZIJE
+
+# razlog: "missing_file" | "missing_image" | "missing_anchor"
+Problem = namedtuple("Problem", "putanja linija href razlog")
+
+# Inline obrada je najskuplji dio parsiranja; linkovi i id-jevi ne zavise od
+# naglašavanja, tipografije i magiclink-a (on pravi samo vanjske linkove)
+_BEZ_INLINE = (
+    "linebreak", "delimiter", "nl", "magic-link", "magic-mail", "keys", "keys-custom",
+    "em_strong", "em_strong2", "not_strong", "strong_em", "emphasis",
+)
+_BEZ_TREE = ("smarty", "prettify", "abbr", "indent-highlight", "task-list")
+
+_RAW_ATTR = re.compile(r'\b(href|src|id)\s*=\s*["\']([^"\']*)["\']', re.IGNORECASE)
+
+
+class _Sakupljac(Treeprocessor):
+    """Zadnji treeprocessor: skuplja href/src i sve id-jeve (toc, attr_list, fusnote)."""
+
+    def run(self, root):
+        md = self.md
+        for el in root.iter():
+            if el.tag == "a" and el.get("href"):
+                md.nz_linkovi.append((el.get("href"), "link"))
+            elif el.tag == "img" and el.get("src"):
+                md.nz_linkovi.append((el.get("src"), "image"))
+            if el.get("id"):
+                md.nz_anchori.add(el.get("id"))
+            if el.get("name") and el.tag == "a":
+                md.nz_anchori.add(el.get("name"))
+
+
+_md = None
+
+
+def _parser():
+    """Markdown instanca po procesu (kreiranje je skuplje od reset())."""
+    global _md
+    if _md is None:
+        extensions, configs = _markdown_ekstenzije()
+        if "pymdownx.highlight" in extensions:
+            configs = dict(configs)
+            configs["pymdownx.highlight"] = dict(
+                configs.get("pymdownx.highlight", {}), use_pygments=False, guess_lang=False
+            )
+        _md = markdown.Markdown(extensions=extensions, extension_configs=configs)
+        for ime in _BEZ_INLINE:
+            _md.inlinePatterns.deregister(ime, strict=False)
+        for ime in _BEZ_TREE:
+            _md.treeprocessors.deregister(ime, strict=False)
+        _md.treeprocessors.register(_Sakupljac(_md), "nz_linkcheck", 0)
+    _md.reset()
+    _md.nz_linkovi = []
+    _md.nz_anchori = set()
+    return _md
+
+
+def _lokalni(href: str) -> bool:
+    if href.startswith("#"):
+        return True
+    url = urlparse(href)
+    return url.scheme in ("", "file") and not href.startswith("//")
+
+
+def _parsiraj(md, tekst):
+    """Kao md.convert(), ali bez serijalizacije i postprocesora — treba nam samo stablo."""
+    md.lines = tekst.split("\n")
+    for prep in md.preprocessors:
+        md.lines = prep.run(md.lines)
+    root = md.parser.parseDocument(md.lines).getroot()
+    for treeprocessor in md.treeprocessors:
+        novi = treeprocessor.run(root)
+        if novi is not None:
+            root = novi
+
+
+def analiziraj_fajl(putanja: str):
+    """
+    (putanja, anchori, linkovi) za jedan fajl; linkovi su (linija, href, vrsta)
+    samo za lokalne ciljeve. Izvršava se u procesima iz poola.
+    """
+    try:
+        tekst, _ = procitaj_tekst(putanja)
+        md = _parser()
+        _parsiraj(md, tekst)
+    except Exception:
+        return putanja, set(), []
+    linkovi = list(md.nz_linkovi)
+    anchori = set(md.nz_anchori)
+    # Sirovi HTML blokovi ne ulaze u stablo — samo regex nad njima
+    for blok in md.htmlStash.rawHtmlBlocks:
+        for atribut, vrijednost in _RAW_ATTR.findall(str(blok)):
+            atribut = atribut.lower()
+            if atribut == "id":
+                anchori.add(vrijednost)
+            else:
+                linkovi.append((vrijednost, "link" if atribut == "href" else "image"))
+
+    # Stablo nema brojeve linija: tražimo href u izvornom tekstu redom pojavljivanja
+    pocetci = [0]
+    for m in re.finditer("\n", tekst):
+        pocetci.append(m.end())
+    pozicije = {}
+    rezultat = []
+    for href, vrsta in linkovi:
+        if not _lokalni(href):
+            continue
+        poz = tekst.find(href, pozicije.get(href, 0))
+        if poz < 0:
+            poz = tekst.find(href)
+        pozicije[href] = poz + 1 if poz >= 0 else 0
+        linija = bisect.bisect_right(pocetci, poz) if poz >= 0 else 1
+        rezultat.append((linija, href, vrsta))
+    return putanja, anchori, rezultat
+
+
+def _cilj(href: str, izvor: str):
+    """(apsolutna putanja, fragment) za lokalni href."""
+    url = urlparse(href)
+    putanja = unquote(url.path)
+    if not putanja:
+        return izvor, unquote(url.fragment)
+    if url.scheme != "file" and not os.path.isabs(putanja):
+        putanja = os.path.join(os.path.dirname(izvor), putanja)
+    return os.path.normpath(putanja), unquote(url.fragment)
+
+
+def razrijesi(rezultati: list) -> list:
+    """Provjerava linkove iz analiziraj_fajl() i vraća listu Problem-a."""
+    anchori = {putanja: a for putanja, a, _ in rezultati}
+    postoji = {}
+    problemi = []
+    for putanja, _, linkovi in rezultati:
+        for linija, href, vrsta in linkovi:
+            cilj, fragment = _cilj(href, putanja)
+            if cilj not in anchori:
+                if cilj not in postoji:
+                    postoji[cilj] = os.path.exists(cilj)
+                if not postoji[cilj]:
+                    razlog = "missing_image" if vrsta == "image" else "missing_file"
+                    problemi.append(Problem(putanja, linija, href, razlog))
+                    continue
+            if not fragment or not cilj.lower().endswith(MARKDOWN_EKSTENZIJE):
+                continue
+            if cilj not in anchori:
+                # Markdown fajl izvan provjeravanog foldera — parsira se jednom, po potrebi
+                anchori[cilj] = analiziraj_fajl(cilj)[1] if os.path.isfile(cilj) else set()
+            if fragment not in anchori[cilj]:
+                problemi.append(Problem(putanja, linija, href, "missing_anchor"))
+    problemi.sort()
+    return problemi
+
+
+def provjeri_fajlove(fajlovi: list, jobs=None, napredak=None, prekini=None) -> list:
+    """
+    Analizira fajlove (paralelno ako jobs > 1) i vraća listu Problem-a.
+    napredak(gotovo, ukupno) se zove tokom analize; prekini() -> True prekida.
+    """
+    jobs = jobs or os.cpu_count() or 1
+    ukupno = len(fajlovi)
+    rezultati = []
+    if jobs <= 1 or ukupno < 50:
+        for putanja in fajlovi:
+            if prekini and prekini():
+                return []
+            rezultati.append(analiziraj_fajl(putanja))
+            if napredak and len(rezultati) % 50 == 0:
+                napredak(len(rezultati), ukupno)
+    else:
+        # spawn: fork iz procesa sa Qt threadovima nije siguran. Radnik ponovo izvršava
+        # glavni skript kao __mp_main__; NZ-MDmaster.py tada ne uvozi GUI
+        kontekst = multiprocessing.get_context("spawn")
+        chunk = max(1, min(64, ukupno // (jobs * 8)))
+        with ProcessPoolExecutor(max_workers=jobs, mp_context=kontekst) as pool:
+            for rezultat in pool.map(analiziraj_fajl, fajlovi, chunksize=chunk):
+                rezultati.append(rezultat)
+                if prekini and prekini():
+                    pool.shutdown(wait=False, cancel_futures=True)
+                    return []
+                if napredak and len(rezultati) % 50 == 0:
+                    napredak(len(rezultati), ukupno)
+    if napredak:
+        napredak(ukupno, ukupno)
+    return razrijesi(rezultati)
+
+
+def provjeri_folder(folder: str, jobs=None, napredak=None, prekini=None) -> list:
+    """Provjerava sve markdown fajlove u folderu (rekurzivno)."""
+    return provjeri_fajlove(markdown_fajlovi(folder), jobs, napredak, prekini)
@@ -0,0 +1,112 @@
+"""
+Link checker dock and the thread that runs the check off the GUI thread.
+"""
+import os
+
+from PySide6.QtWidgets import (
+    QDockWidget, QWidget, QVBoxLayout, QLabel, QTreeWidget, QTreeWidgetItem,
+)
+from PySide6.QtCore import Qt, QThread, Signal
+
+from linkcheck import provjeri_folder
+
+
+class LinkCheckThread(QThread):
+    """Pokreće provjeri_folder(); sam parsing ide u process pool."""
+
+    # gotovo, ukupno
+    napredak = Signal(int, int)
+    # lista Problem-a
+    gotovo = Signal(list)
+
+    def __init__(self, folder, jobs=None, parent=None):
+        super().__init__(parent)
+        self.folder = folder
+        self.jobs = jobs
+
+    def run(self):
+        problemi = provjeri_folder(
+            self.folder, self.jobs, self.napredak.emit, self.isInterruptionRequested
+        )
+        if not self.isInterruptionRequested():
+            self.gotovo.emit(problemi)
+
+
+class LinkCheckPanel(QDockWidget):
+    """Dock sa listom pokvarenih linkova; aktivacija otvara liniju u editoru."""
+
+    # putanja, broj linije (1-based)
+    problem_activated = Signal(str, int)
+
+    def __init__(self, title, kolone, parent=None):
+        super().__init__(title, parent)
+        self.setObjectName("linkcheck_dock")
+        sadrzaj = QWidget()
+        layout = QVBoxLayout(sadrzaj)
+        layout.setContentsMargins(0, 0, 0, 0)
+        layout.setSpacing(0)
+
+        self.status = QLabel()
+        self.status.setStyleSheet("color: #8b949e; padding: 4px 6px; background: #161b22;")
+        layout.addWidget(self.status)
+
+        self.tree = QTreeWidget()
+        self.tree.setHeaderLabels(kolone)
+        self.tree.setRootIsDecorated(False)
+        self.tree.setSortingEnabled(True)
+        self.tree.setStyleSheet("""
+            QTreeWidget {
+                background-color: #0d1117;
+                color: #c9d1d9;
+                border: none;
+                font-size: 13px;
+            }
+            QTreeWidget::item:hover {
+                background: #161b22;
+            }
+            QTreeWidget::item:selected {
+                background: #1f6feb;
+                color: white;
+            }
+            QHeaderView::section {
+                background-color: #161b22;
+                color: #8b949e;
+                border: none;
+                padding: 4px;
+            }
+        """)
+        self.tree.itemActivated.connect(self._on_item_activated)
+        self.tree.itemDoubleClicked.connect(self._on_item_activated)
+        layout.addWidget(self.tree)
+        self.setWidget(sadrzaj)
+
+    def set_status(self, tekst):
+        self.status.setText(tekst)
+
+    def set_problemi(self, problemi, root, razlozi):
+        """problemi: lista linkcheck.Problem; razlozi: {razlog: prevedeni opis}."""
+        self.tree.setSortingEnabled(False)
+        self.tree.setUpdatesEnabled(False)
+        self.tree.clear()
+        stavke = []
+        for p in problemi:
+            item = QTreeWidgetItem([
+                os.path.relpath(p.putanja, root) if root else p.putanja,
+                "",
+                p.href,
+                razlozi.get(p.razlog, p.razlog),
+            ])
+            # Broj linije kao broj, da sortiranje ne ide leksički
+            item.setData(1, Qt.DisplayRole, p.linija)
+            item.setToolTip(0, p.putanja)
+            item.setData(0, Qt.UserRole, p.putanja)
+            stavke.append(item)
+        self.tree.addTopLevelItems(stavke)
+        self.tree.setSortingEnabled(True)
+        self.tree.sortByColumn(0, Qt.AscendingOrder)
+        for kolona in range(3):
+            self.tree.resizeColumnToContents(kolona)
+        self.tree.setUpdatesEnabled(True)
+
+    def _on_item_activated(self, item, _column=0):
+        self.problem_activated.emit(item.data(0, Qt.UserRole), int(item.data(1, Qt.DisplayRole)))
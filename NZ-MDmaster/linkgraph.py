@@ -0,0 +1,135 @@
+"""
+Workspace link graph — no Qt imports at module level.
+Outgoing links are extracted per file; the graph keeps them together with a
+reverse index, so "what links here" is a dict lookup instead of a scan.
+"""
+import os
+import re
+from urllib.parse import urlparse, unquote
+
+from render import MARKDOWN_EKSTENZIJE
+
+# Fajlovi veći od ovoga se ne parsiraju za linkove
+MAX_VELICINA = 10 * 1024 * 1024
+
+_FENCE = re.compile(r'^\s{0,3}(`{3,}|~{3,})')
+_INLINE_CODE = re.compile(r'(`+)(?:(?!\1).)+?\1')
+_INLINE_LINK = re.compile(r'\]\(\s*(<[^>\n]*>|[^\s()]+(?:\([^\s()]*\)[^\s()]*)*)')
+_REF_DEF = re.compile(r'^\s{0,3}\[[^\]]+\]:\s*(<[^>\n]*>|\S+)')
+_HREF = re.compile(r'<a\s[^>]*?href\s*=\s*["\']([^"\']+)["\']', re.IGNORECASE)
+
+
+def normalizuj(putanja: str) -> str:
+    """Ključ za graf: apsolutna, normalizovana putanja."""
+    return os.path.normpath(os.path.abspath(putanja))
+
+
+def cilj_linka(href: str, folder: str):
+    """Apsolutna putanja markdown fajla na koji link vodi, ili None."""
+    href = href.strip()
+    if href.startswith("<") and href.endswith(">"):
+        href = href[1:-1]
+    if not href or href.startswith("#"):
+        return None
+    url = urlparse(href)
+    if url.scheme == "file":
+        putanja = unquote(url.path)
+    elif url.scheme or href.startswith("//"):
+        return None
+    else:
+        putanja = unquote(url.path)
+        if not os.path.isabs(putanja):
+            putanja = os.path.join(folder, putanja)
+    if not putanja.lower().endswith(MARKDOWN_EKSTENZIJE):
+        return None
+    return normalizuj(putanja)
+
+
+def izvuci_linkove(tekst: str, putanja: str) -> dict:
+    """
+    Linkovi ka lokalnim markdown fajlovima: {cilj: (broj linije, linija)}.
+    Pamti se prvo pojavljivanje; fenced code i inline code se preskaču.
+    """
+    folder = os.path.dirname(normalizuj(putanja))
+    linkovi = {}
+    fence = None
+    for broj, linija in enumerate(tekst.splitlines(), 1):
+        m = _FENCE.match(linija)
+        if m:
+            oznaka = m.group(1)
+            if fence is None:
+                fence = oznaka
+            elif oznaka[0] == fence[0] and len(oznaka) >= len(fence):
+                fence = None
+            continue
+        if fence is not None or ("](" not in linija and "]:" not in linija and "href" not in linija):
+            continue
+        bez_koda = _INLINE_CODE.sub("", linija)
+        hrefs = [m.group(1) for m in _INLINE_LINK.finditer(bez_koda)]
+        hrefs += [m.group(1) for m in _HREF.finditer(bez_koda)]
+        ref = _REF_DEF.match(bez_koda)
+        if ref:
+            hrefs.append(ref.group(1))
+        for href in hrefs:
+            cilj = cilj_linka(href, folder)
+            if cilj and cilj not in linkovi:
+                linkovi[cilj] = (broj, linija.strip())
+    return linkovi
+
+
+def linkovi_fajla(putanja: str) -> dict:
+    """izvuci_linkove() za fajl na disku; prazan dict ako se ne može pročitati."""
+    try:
+        if os.path.getsize(putanja) > MAX_VELICINA:
+            return {}
+        with open(putanja, "r", encoding="utf-8", errors="replace") as f:
+            return izvuci_linkove(f.read(), putanja)
+    except OSError:
+        return {}
+
+
+class LinkGraph:
+    """
+    Izlazni linkovi po fajlu + obrnuti indeks (cilj -> izvori).
+    postavi()/ukloni() održavaju oba smjera; backlinks() je O(broj izvora).
+    """
+
+    def __init__(self):
+        self._izlazni = {}
+        self._ulazni = {}
+
+    def __len__(self):
+        return len(self._izlazni)
+
+    def postavi(self, izvor: str, linkovi: dict):
+        """Zamjenjuje izlazne linkove fajla `izvor` (rezultat izvuci_linkove)."""
+        izvor = normalizuj(izvor)
+        stari = self._izlazni.get(izvor, {})
+        for cilj in stari.keys() - linkovi.keys():
+            izvori = self._ulazni.get(cilj)
+            if izvori is not None:
+                izvori.discard(izvor)
+                if not izvori:
+                    del self._ulazni[cilj]
+        for cilj in linkovi.keys() - stari.keys():
+            self._ulazni.setdefault(cilj, set()).add(izvor)
+        self._izlazni[izvor] = dict(linkovi)
+
+    def ukloni(self, izvor: str):
+        self.postavi(izvor, {})
+        self._izlazni.pop(normalizuj(izvor), None)
+
+    def ocisti(self):
+        self._izlazni.clear()
+        self._ulazni.clear()
+
+    def linkovi(self, izvor: str) -> dict:
+        return self._izlazni.get(normalizuj(izvor), {})
+
+    def backlinks(self, cilj: str) -> list:
+        """Lista (izvor, broj linije, linija) sortirana po izvoru."""
+        cilj = normalizuj(cilj)
+        return [
+            (izvor, *self._izlazni[izvor][cilj])
+            for izvor in sorted(self._ulazni.get(cilj, ()))
+        ]
@@ -0,0 +1,1152 @@
+/*
+ * Instant split-view preview renderer (see live.py).
+ *
+ * The page loads vendor/marked/marked.js first. marked parses the text; the
+ * extensions below bring its output to the dialect of the Python pipeline
+ * (render.py): admonition, def_list, footnotes, abbr, md_in_html, attr_list,
+ * pymdownx inline extras and tasklist, nl2br, smarty, sane_lists with the
+ * Python-Markdown list rules, and toc heading ids. Code blocks are not
+ * coloured. benchmarks/compat.py checks the output against the golden files
+ * in benchmarks/compat/.
+ */
+(function () {
+    'use strict';
+
+    var ESC = {'&': '&amp;', '<': '&lt;', '>': '&gt;', '"': '&quot;', "'": '&#39;'};
+    function esc(s) { return String(s).replace(/[&<>"']/g, function (c) { return ESC[c]; }); }
+    function neesc(s) {
+        return s.replace(/&(amp|lt|gt|quot|#39);/g, function (_, e) {
+            return {amp: '&', lt: '<', gt: '>', quot: '"', '#39': "'"}[e];
+        });
+    }
+
+    // Stanje jednog prolaza: definicije koje utiču na više blokova
+    // (fusnote: id -> {broj, token}; id-ovi fusnota mogu biti brojevi, pa red čuva niz fusnoteRed)
+    var stanje = {fusnote: {}, fusnoteRed: [], abbr: {}, abbrRe: null, naslovi: [], verzija: 0};
+
+    // ---- Linije (bez split-a cijelog ostatka dokumenta za svaki blok) ----
+
+    function linija(src, pos) {
+        var k = src.indexOf('\n', pos);
+        return k < 0 ? src.slice(pos) : src.slice(pos, k);
+    }
+    function iza(src, pos) {
+        var k = src.indexOf('\n', pos);
+        return k < 0 ? src.length : k + 1;
+    }
+    function prazna(l) { return !/\S/.test(l); }
+    // blockTokens je tabove na početku linije već pretvorio u razmake
+    function uvucena(l) { return /^ {4}/.test(l); }
+    function dedent(s) { return s.replace(/^ {1,4}/gm, ''); }
+
+    // Kraj uvučenog nastavka od pos: uvučene linije i prazne linije između njih
+    function krajUvucenog(src, pos) {
+        var kraj = pos;
+        while (pos < src.length) {
+            var l = linija(src, pos);
+            if (uvucena(l)) { pos = kraj = iza(src, pos); continue; }
+            if (!prazna(l)) break;
+            pos = iza(src, pos);
+        }
+        return kraj;
+    }
+
+    // start() za blok koji prekida paragraf: traži samo do kraja tekućeg paragrafa,
+    // inače bi svaki paragraf pretraživao ostatak dokumenta
+    function uParagrafu(re) {
+        return function (src) {
+            var kraj = src.search(/\n[ \t]*(?:\n|$)/), m = re.exec(kraj < 0 ? src : src.slice(0, kraj + 1));
+            return m ? m.index : undefined;
+        };
+    }
+
+    // Blokovi unutar kontejnera su paragrafi, a stanje liste oko njega ostaje
+    function blokovi(lexer, tekst) {
+        var top = lexer.state.top;
+        lexer.state.top = true;
+        var tokeni = lexer.blockTokens(tekst, []);
+        lexer.state.top = top;
+        return tokeni;
+    }
+
+    // ---- attr_list ----
+
+    var ATRIBUTI = /[ \t]*\{:?[ \t]*([^}\n]*?)[ \t]*\}[ \t]*$/;
+
+    function atributi(s) {
+        var a = {klase: []}, re = /([#.]?)([\w-]+)(?:=("[^"]*"|'[^']*'|[^\s"']*))?/g, m;
+        s = neesc(s);
+        while ((m = re.exec(s))) {
+            if (m[1] === '#') a.id = m[2];
+            else if (m[1] === '.') a.klase.push(m[2]);
+            else if (m[3] !== undefined) a[m[2]] = m[3].replace(/^(["'])(.*)\1$/, '$2');
+        }
+        return a;
+    }
+
+    function atributiHtml(a) {
+        var html = a.klase && a.klase.length ? ' class="' + esc(a.klase.join(' ')) + '"' : '';
+        Object.keys(a).forEach(function (k) {
+            if (k !== 'klase' && a[k]) html += ' ' + k + '="' + esc(a[k]) + '"';
+        });
+        return html;
+    }
+
+    // ---- toc: id naslova kao markdown.extensions.toc ----
+
+    function slug(tekst) {
+        return tekst.normalize('NFKD').replace(/[^\x00-\x7F]/g, '').replace(/[^\w\s-]/g, '')
+            .trim().toLowerCase().replace(/[-\s]+/g, '-');
+    }
+
+    // Tekst, slug i zadani id naslova se računaju jednom po tokenu i verziji globalnih
+    // definicija (referenca na fusnotu je dio teksta)
+    function tekstNaslova(t) {
+        if (t.nzVerzija !== stanje.verzija) {
+            t.nzVerzija = stanje.verzija;
+            var parser = new marked.Parser(marked.defaults);
+            var tekst = parser.parseInline(t.tokens, new marked.TextRenderer());
+            var a = ATRIBUTI.exec(t.text);
+            t.nzTekst = neesc(tekst.replace(ATRIBUTI, ''));
+            t.nzSlug = slug(t.nzTekst);
+            t.nzZadaniId = a ? atributi(a[1]).id || null : null;
+        }
+        return t.nzTekst;
+    }
+
+    function naslovi(t) {
+        if (!t.nzNaslovi) {
+            t.nzNaslovi = [];
+            (function obidji(o) {
+                if (o.type === 'heading') t.nzNaslovi.push(o);
+                for (var k in o) {
+                    var v = k.slice(0, 2) !== 'nz' && o[k];
+                    if (Array.isArray(v)) v.forEach(function (x) { if (x && typeof x === 'object') obidji(x); });
+                    else if (v && typeof v === 'object') obidji(v);
+                }
+            })(t);
+        }
+        return t.nzNaslovi;
+    }
+
+    function idNaslova(tokeni) {
+        // zadnji: id -> zadnji dodijeljeni id iz njegovog niza (skup zauzetih samo raste)
+        var svi = [], koristeni = {}, zadnji = {};
+        tokeni.forEach(function (t) { svi.push.apply(svi, naslovi(t)); });
+        stanje.naslovi = svi;
+        // Zadani id (attr_list) je zauzet prije nego što se prave ostali
+        svi.forEach(function (h) {
+            tekstNaslova(h);
+            h.nzId = h.nzZadaniId;
+            if (h.nzId) koristeni[h.nzId] = true;
+        });
+        svi.forEach(function (h) {
+            if (h.nzId) return;
+            var osnova = h.nzSlug, id = zadnji[osnova] || osnova, m;
+            while (!id || koristeni[id]) {
+                m = /^(.*)_([0-9]+)$/.exec(id);
+                id = m ? m[1] + '_' + (parseInt(m[2], 10) + 1) : id + '_1';
+            }
+            zadnji[osnova] = id;
+            h.nzId = id;
+            koristeni[id] = true;
+        });
+    }
+
+    // ---- Liste po pravilima Python-Markdowna (sane_lists) ----
+
+    var STAVKA = /^( {0,3})([*+-]|\d+\.)[ \t]+/;
+    var HR = /^ {0,3}([-*_])(?:[ \t]*\1){2,}[ \t]*$/;
+    var NASLOV = /^ {0,3}#{1,6}(?:[ \t]|$)/;
+    var FENCE = /^ {0,3}(?:```|~~~)/;
+    var CITAT = /^ {0,3}> ?/;
+
+    // Linija koja bi u marked-u počela listu, a kod nas je običan tekst
+    var NALIK_STAVCI = /^( {0,3})(?:([*+-])|(\d{1,9})[.)])[ \t]/;
+    function bezListe(l) {
+        var m = NALIK_STAVCI.exec(l);
+        if (!m || HR.test(l)) return l;
+        return m[2] ? m[1] + '\\' + l.slice(m[1].length) : m[1] + m[3] + '\\' + l.slice(m[1].length + m[3].length);
+    }
+
+    function stavka(l, uredjena) {
+        var m = STAVKA.exec(l);
+        return m && !HR.test(l) && /\d/.test(m[2]) === uredjena ? m : null;
+    }
+
+    var lista = {
+        name: 'nzLista',
+        level: 'block',
+        tokenizer: function (src) {
+            var l = linija(src, 0), m = STAVKA.exec(l);
+            if (!m || HR.test(l)) return;
+            var uredjena = /\d/.test(m[2]), stavke = [], tekuca = null, pos = 0, prazneIspred = false;
+            while (pos < src.length) {
+                l = linija(src, pos);
+                if ((m = stavka(l, uredjena))) {
+                    tekuca = {linije: [l.slice(m[0].length)], labava: prazneIspred};
+                    if (prazneIspred) stavke[stavke.length - 1].labava = true;
+                    stavke.push(tekuca);
+                    prazneIspred = false;
+                    pos = iza(src, pos);
+                    continue;
+                }
+                if (prazna(l)) {
+                    // Prazne linije ostaju u listi samo ispred uvučenog sadržaja ili nove stavke
+                    var q = pos;
+                    while (q < src.length && prazna(linija(src, q))) q = iza(src, q);
+                    var sljedeca = linija(src, q);
+                    if (q < src.length && uvucena(sljedeca)) {
+                        for (; pos < q; pos = iza(src, pos)) tekuca.linije.push('');
+                        tekuca.labava = true;
+                        continue;
+                    }
+                    if (q < src.length && stavka(sljedeca, uredjena)) {
+                        pos = q;
+                        prazneIspred = true;
+                        continue;
+                    }
+                    break;
+                }
+                if (uvucena(l)) {
+                    tekuca.linije.push(l.slice(4));
+                } else if (NASLOV.test(l) || HR.test(l) || FENCE.test(l)) {
+                    break;
+                } else {
+                    // Lijeni nastavak stavke; "- x" poslije "1. y" je tekst, ne nova lista
+                    tekuca.linije.push(bezListe(l));
+                }
+                pos = iza(src, pos);
+            }
+            // Stavke su "tijesne" (text, ne paragraph); stanje oko liste ostaje
+            var lexer = this.lexer, top = lexer.state.top, token = {
+                type: 'nzLista',
+                raw: src.slice(0, pos),
+                uredjena: uredjena,
+                pocetak: uredjena ? parseInt(STAVKA.exec(src)[2], 10) : 1,
+                stavke: stavke.map(function (s) {
+                    var tekst = s.linije.join('\n').replace(/\s+$/, '');
+                    var zadatak = /^\[([ xX])\][ \t]+/.exec(tekst);
+                    if (zadatak) tekst = tekst.slice(zadatak[0].length);
+                    lexer.state.top = false;
+                    return {
+                        labava: s.labava,
+                        zadatak: !!zadatak,
+                        oznacena: !!zadatak && zadatak[1] !== ' ',
+                        tokens: lexer.blockTokens(tekst, [])
+                    };
+                })
+            };
+            lexer.state.top = top;
+            return token;
+        },
+        renderer: function (t) {
+            var parser = this.parser, zadaci = t.stavke.some(function (s) { return s.zadatak; });
+            var tag = t.uredjena ? 'ol' : 'ul';
+            return '<' + tag + (zadaci ? ' class="task-list"' : '') +
+                (t.uredjena && t.pocetak !== 1 ? ' start="' + t.pocetak + '"' : '') + '>\n' +
+                t.stavke.map(function (s) {
+                    var kvacica = s.zadatak ? '<label class="task-list-control"><input type="checkbox" disabled' +
+                        (s.oznacena ? ' checked' : '') + '/><span class="task-list-indicator"></span></label> ' : '';
+                    var sadrzaj = parser.parse(s.tokens, s.labava);
+                    if (s.labava) sadrzaj = '\n' + (kvacica ? sadrzaj.replace(/^<p>/, '<p>' + kvacica) : sadrzaj);
+                    else sadrzaj = kvacica + sadrzaj;
+                    return '<li' + (s.zadatak ? ' class="task-list-item"' : '') + '>' + sadrzaj + '</li>\n';
+                }).join('') + '</' + tag + '>\n';
+        }
+    };
+
+    // ---- admonition ----
+
+    var ADMONITION = /^!!! ?([\w-]+(?: +[\w-]+)*)(?: +"(.*?)")? *(?:\n|$)/;
+
+    var admonition = {
+        name: 'nzAdmonition',
+        level: 'block',
+        start: uParagrafu(/^!!! ?[\w-]/m),
+        tokenizer: function (src) {
+            var m = ADMONITION.exec(src);
+            if (!m) return;
+            var kraj = krajUvucenog(src, m[0].length), klasa = m[1].toLowerCase();
+            var vrsta = klasa.split(' ')[0];
+            return {
+                type: 'nzAdmonition',
+                raw: src.slice(0, kraj),
+                klasa: klasa,
+                naslov: m[2] !== undefined ? m[2] : vrsta[0].toUpperCase() + vrsta.slice(1),
+                tokens: blokovi(this.lexer, dedent(src.slice(m[0].length, kraj)))
+            };
+        },
+        renderer: function (t) {
+            return '<div class="admonition ' + esc(t.klasa) + '">\n' +
+                (t.naslov ? '<p class="admonition-title">' + esc(t.naslov) + '</p>\n' : '') +
+                this.parser.parse(t.tokens) + '</div>\n';
+        }
+    };
+
+    // ---- def_list ----
+
+    var DEFINICIJA = /^ {0,3}:[ \t]+/;
+    var DRUGI_BLOK = /^ {0,3}(?:#|>|[*+-][ \t]|\d+[.)][ \t]|```|~~~|!!!|<|\[\^|\*\[)/;
+
+    function grupaDefinicija(src, pos) {
+        var termini = [], l;
+        while (pos < src.length && !prazna(l = linija(src, pos)) && !DEFINICIJA.test(l)) {
+            if (!termini.length && DRUGI_BLOK.test(l)) return null;
+            termini.push(l.trim());
+            pos = iza(src, pos);
+        }
+        if (!termini.length) return null;
+        var definicije = [], labava = false, q;
+        for (;;) {
+            // Prazna linija ispred definicije je čini labavom (<p>)
+            for (q = pos; q < src.length && prazna(linija(src, q)); q = iza(src, q)) labava = true;
+            var m = q < src.length && DEFINICIJA.exec(l = linija(src, q));
+            if (!m) break;
+            var tekst = [l.slice(m[0].length)];
+            pos = iza(src, q);
+            while (pos < src.length && !prazna(l = linija(src, pos)) && !DEFINICIJA.test(l)) {
+                tekst.push(uvucena(l) ? l.slice(4) : l);
+                pos = iza(src, pos);
+            }
+            var kraj = krajUvucenog(src, pos);
+            if (kraj > pos) {
+                tekst.push(dedent(src.slice(pos, kraj)));
+                labava = true;
+            }
+            definicije.push({tekst: tekst.join('\n'), labava: labava});
+            pos = kraj;
+            labava = false;
+        }
+        return definicije.length ? {termini: termini, definicije: definicije, kraj: pos} : null;
+    }
+
+    var definicije = {
+        name: 'nzDefinicije',
+        level: 'block',
+        tokenizer: function (src) {
+            var grupe = [], pos = 0, g;
+            while ((g = grupaDefinicija(src, pos))) {
+                grupe.push(g);
+                pos = g.kraj;
+                // Sljedeća grupa poslije praznih linija ide u isti <dl>
+                var q = pos;
+                while (q < src.length && prazna(linija(src, q))) q = iza(src, q);
+                if (q === pos || !grupaDefinicija(src, q)) break;
+                pos = q;
+            }
+            if (!grupe.length) return;
+            var lexer = this.lexer;
+            return {
+                type: 'nzDefinicije',
+                raw: src.slice(0, pos),
+                grupe: grupe.map(function (g) {
+                    return {
+                        termini: g.termini.map(function (t) { return {text: t, tokens: lexer.inline(t, [])}; }),
+                        definicije: g.definicije.map(function (d) {
+                            return {labava: d.labava, tokens: blokovi(lexer, d.tekst)};
+                        })
+                    };
+                })
+            };
+        },
+        renderer: function (t) {
+            var parser = this.parser;
+            return '<dl>\n' + t.grupe.map(function (g) {
+                return g.termini.map(function (d) {
+                    return '<dt>' + parser.parseInline(d.tokens) + '</dt>\n';
+                }).join('') + g.definicije.map(function (d) {
+                    if (!d.labava && d.tokens.length === 1 && d.tokens[0].type === 'paragraph')
+                        return '<dd>' + parser.parseInline(d.tokens[0].tokens) + '</dd>\n';
+                    return '<dd>\n' + parser.parse(d.tokens) + '</dd>\n';
+                }).join('');
+            }).join('') + '</dl>\n';
+        }
+    };
+
+    // ---- footnotes ----
+
+    var FUSNOTA = /^ {0,3}\[\^([^\]]+)\]:[ \t]*/;
+
+    var fusnota = {
+        name: 'nzFusnota',
+        level: 'block',
+        start: uParagrafu(/^ {0,3}\[\^[^\]]+\]:/m),
+        tokenizer: function (src) {
+            var m = FUSNOTA.exec(src);
+            if (!m) return;
+            var tekst = [linija(src, m[0].length)], pos = iza(src, m[0].length), l;
+            while (pos < src.length && !prazna(l = linija(src, pos)) && !FUSNOTA.test(l)) {
+                tekst.push(uvucena(l) ? l.slice(4) : l);
+                pos = iza(src, pos);
+            }
+            var kraj = krajUvucenog(src, pos);
+            if (kraj > pos) tekst.push('', dedent(src.slice(pos, kraj)));
+            return {
+                type: 'nzFusnota',
+                raw: src.slice(0, kraj),
+                id: m[1],
+                tokens: blokovi(this.lexer, tekst.join('\n'))
+            };
+        },
+        // Definicija se prikazuje na kraju dokumenta (fusnoteHtml)
+        renderer: function () { return ''; }
+    };
+
+    var referenca = {
+        name: 'nzReferenca',
+        level: 'inline',
+        start: function (src) { var i = src.indexOf('[^'); return i < 0 ? undefined : i; },
+        tokenizer: function (src) {
+            var m = /^\[\^([^\]\s]+)\]/.exec(src);
+            if (m) return {type: 'nzReferenca', raw: m[0], id: m[1]};
+        },
+        renderer: function (t) {
+            var f = stanje.fusnote[t.id];
+            if (!f) return esc(t.raw);
+            return '<sup id="fnref:' + esc(t.id) + '"><a class="footnote-ref" href="#fn:' + esc(t.id) + '">' +
+                f.broj + '</a></sup>';
+        }
+    };
+
+    function fusnoteHtml() {
+        var ids = stanje.fusnoteRed;
+        if (!ids.length) return '';
+        var parser = new marked.Parser(marked.defaults);
+        return '<div class="footnote">\n<hr />\n<ol>\n' + ids.map(function (id) {
+            var f = stanje.fusnote[id];
+            var nazad = '&#160;<a class="footnote-backref" href="#fnref:' + esc(id) +
+                '" title="Jump back to footnote ' + f.broj + ' in the text">&#8617;</a>';
+            var html = parser.parse(f.token.tokens), kraj = html.lastIndexOf('</p>');
+            html = kraj >= 0 && !/\S/.test(html.slice(kraj + 4))
+                ? html.slice(0, kraj) + nazad + html.slice(kraj)
+                : html + '<p>' + nazad + '</p>\n';
+            return '<li id="fn:' + esc(id) + '">\n' + html + '</li>\n';
+        }).join('') + '</ol>\n</div>\n';
+    }
+
+    // ---- abbr ----
+
+    var skracenica = {
+        name: 'nzSkracenica',
+        level: 'block',
+        start: uParagrafu(/^ {0,3}\*\[[^\]]+\]:/m),
+        tokenizer: function (src) {
+            var m = /^ {0,3}\*\[([^\]]+)\]:[ \t]*(.*?)[ \t]*(?:\n|$)/.exec(src);
+            if (m) return {type: 'nzSkracenica', raw: m[0], kratica: m[1].trim(), naziv: m[2]};
+        },
+        renderer: function () { return ''; }
+    };
+
+    function postaviSkracenice(abbr) {
+        var kratice = Object.keys(abbr).sort(function (a, b) { return b.length - a.length; });
+        stanje.abbr = {};
+        kratice.forEach(function (k) { stanje.abbr[esc(k)] = abbr[k]; });
+        stanje.abbrRe = kratice.length ? new RegExp('(?<!\\w)(?:' + kratice.map(function (k) {
+            return esc(k).replace(/[.*+?^${}()|[\]\\]/g, '\\$&');
+        }).join('|') + ')(?!\\w)', 'g') : null;
+    }
+
+    // ---- HTML blokovi: sirovi do para, ili markdown="1" (md_in_html) ----
+
+    var BLOK_TAGOVI = new RegExp('^(?:address|article|aside|blockquote|body|canvas|colgroup|dd|details|div|dl|dt|' +
+        'fieldset|figcaption|figure|footer|form|h[1-6]|header|hgroup|html|iframe|legend|li|main|map|math|menu|nav|' +
+        'noscript|object|ol|output|p|pre|progress|script|section|style|summary|table|tbody|td|textarea|tfoot|th|' +
+        'thead|tr|ul|video)$', 'i');
+    var HTML_POCETAK = /^ {0,3}<([a-zA-Z][\w-]*)(?=[\s>\/])[^\n]*/;
+    var MD_HTML = /^ {0,3}<([a-zA-Z][\w-]*)((?:\s+[^>]*?)?)\s+markdown=(?:"(?:1|block)"|'(?:1|block)'|1)([^>]*)>[ \t]*(?:\n|$)/;
+
+    // Zatvarajući tag para na početku linije (ugniježđeni isti tagovi se broje)
+    function zatvarajuci(src, tag, od) {
+        var re = new RegExp('^[ \\t]*<(/?)' + tag + '(?=[\\s>])[^>]*>', 'gim'), dubina = 1, z;
+        re.lastIndex = od;
+        while ((z = re.exec(src))) {
+            if (z.index < od) continue;
+            dubina += z[1] ? -1 : 1;
+            if (!dubina) return z;
+        }
+        return null;
+    }
+
+    var htmlMarkdown = {
+        name: 'nzHtmlMarkdown',
+        level: 'block',
+        tokenizer: function (src) {
+            var m = MD_HTML.exec(src);
+            if (!m) return;
+            var tag = m[1].toLowerCase(), z = zatvarajuci(src, tag, m[0].length);
+            // Nezatvoren tag ostaje običan HTML
+            if (!z) return;
+            return {
+                type: 'nzHtmlMarkdown',
+                raw: src.slice(0, iza(src, z.index)),
+                tag: tag,
+                atributi: (m[2] + m[3]).trim(),
+                tokens: blokovi(this.lexer, src.slice(m[0].length, z.index))
+            };
+        },
+        renderer: function (t) {
+            return '<' + t.tag + (t.atributi ? ' ' + t.atributi : '') + '>\n' + this.parser.parse(t.tokens) + '</' + t.tag + '>\n';
+        }
+    };
+
+    var htmlBlok = {
+        name: 'nzHtmlBlok',
+        level: 'block',
+        tokenizer: function (src) {
+            var m = HTML_POCETAK.exec(src);
+            if (!m || !BLOK_TAGOVI.test(m[1]) || MD_HTML.test(src)) return;
+            var tag = m[1].toLowerCase(), z;
+            // Tag zatvoren u istoj liniji ili nezatvoren: marked-ov html blok
+            if (new RegExp('</' + tag + '\\s*>', 'i').test(m[0]) || !(z = zatvarajuci(src, tag, m[0].length))) return;
+            var raw = src.slice(0, iza(src, z.index));
+            return {type: 'html', raw: raw, pre: false, text: raw};
+        }
+    };
+
+    // ---- toc: [TOC] ----
+
+    var toc = {
+        name: 'nzToc',
+        level: 'block',
+        tokenizer: function (src) {
+            var m = /^ {0,3}\[TOC\][ \t]*(?:\n(?=[ \t]*(?:\n|$))|$)/.exec(src);
+            if (m) return {type: 'nzToc', raw: m[0]};
+        },
+        renderer: function () {
+            // Gniježđenje kao nest_toc_tokens iz markdown.extensions.toc
+            var vrh = [], nivoi = [], roditelji = [], zadnji = null;
+            stanje.naslovi.forEach(function (h) {
+                var t = {h: h, djeca: []}, nivo = h.depth;
+                if (!zadnji) {
+                    nivoi = [nivo];
+                    vrh.push(t);
+                } else {
+                    if (nivo < nivoi[nivoi.length - 1]) {
+                        nivoi.pop();
+                        var skini = 0;
+                        for (var i = roditelji.length - 1; i >= 0 && nivo <= roditelji[i].h.depth; i--) skini++;
+                        if (skini) {
+                            nivoi = nivoi.slice(0, -skini);
+                            roditelji = roditelji.slice(0, -skini);
+                        }
+                        nivoi.push(nivo);
+                    }
+                    if (nivo === nivoi[nivoi.length - 1]) {
+                        (roditelji.length ? roditelji[roditelji.length - 1].djeca : vrh).push(t);
+                    } else {
+                        zadnji.djeca.push(t);
+                        roditelji.push(zadnji);
+                        nivoi.push(nivo);
+                    }
+                }
+                zadnji = t;
+            });
+            function lista(stavke) {
+                return '<ul>\n' + stavke.map(function (t) {
+                    return '<li><a href="#' + esc(t.h.nzId) + '">' + esc(tekstNaslova(t.h)) + '</a>' +
+                        (t.djeca.length ? lista(t.djeca) : '') + '</li>\n';
+                }).join('') + '</ul>\n';
+            }
+            return '<div class="toc">\n' + lista(vrh) + '</div>\n';
+        }
+    };
+
+    // ---- pymdownx: keys, caret, tilde, mark ----
+
+    // Nazivi tipki i aliasi iz pymdownx.keymap_db
+    var KEYMAP = {
+        "0": "0", "1": "1", "2": "2", "3": "3", "4": "4", "5": "5", "6": "6", "7": "7", "8": "8", "9": "9",
+        "a": "A", "b": "B", "c": "C", "d": "D", "e": "E", "f": "F", "g": "G", "h": "H", "i": "I", "j": "J",
+        "k": "K", "l": "L", "m": "M", "n": "N", "o": "O", "p": "P", "q": "Q", "r": "R", "s": "S", "t": "T",
+        "u": "U", "v": "V", "w": "W", "x": "X", "y": "Y", "z": "Z", "space": "Space", "backslash": "\\",
+        "bar": "|", "brace-left": "{", "brace-right": "}", "bracket-left": "[", "bracket-right": "]",
+        "colon": ":", "comma": ",", "double-quote": "\"", "equal": "=", "exclam": "!", "grave": "`",
+        "greater": ">", "less": "<", "minus": "-", "period": ".", "plus": "+", "question": "?", "semicolon": ";",
+        "single-quote": "'", "slash": "/", "tilde": "~", "underscore": "_", "arrow-up": "Up",
+        "arrow-down": "Down", "arrow-left": "Left", "arrow-right": "Right", "page-up": "Page Up",
+        "page-down": "Page Down", "home": "Home", "end": "End", "backspace": "Backspace", "delete": "Del",
+        "insert": "Ins", "tab": "Tab", "break": "Break", "caps-lock": "Caps Lock", "clear": "Clear",
+        "eject": "Eject", "enter": "Enter", "escape": "Esc", "help": "Help", "print-screen": "Print Screen",
+        "scroll-lock": "Scroll Lock", "num0": "Num 0", "num1": "Num 1", "num2": "Num 2", "num3": "Num 3",
+        "num4": "Num 4", "num5": "Num 5", "num6": "Num 6", "num7": "Num 7", "num8": "Num 8", "num9": "Num 9",
+        "num-asterisk": "Num *", "num-clear": "Num Clear", "num-delete": "Num Del", "num-equal": "Num =",
+        "num-lock": "Num Lock", "num-minus": "Num -", "num-plus": "Num +", "num-separator": "Num .",
+        "num-slash": "Num /", "num-enter": "Num Enter", "alt": "Alt", "alt-graph": "AltGr", "command": "Cmd",
+        "control": "Ctrl", "function": "Fn", "left-alt": "Left Alt", "left-command": "Left Command",
+        "left-control": "Left Ctrl", "left-meta": "Left Meta", "left-option": "Left Option",
+        "left-shift": "Left Shift", "left-super": "Left Super", "left-windows": "Left Win", "meta": "Meta",
+        "option": "Option", "right-alt": "Right Alt", "right-command": "Right Command",
+        "right-control": "Right Ctrl", "right-meta": "Right Meta", "right-option": "Right Option",
+        "right-shift": "Right Shift", "right-super": "Right Super", "right-windows": "Right Win",
+        "shift": "Shift", "super": "Super", "windows": "Win", "f1": "F1", "f2": "F2", "f3": "F3", "f4": "F4",
+        "f5": "F5", "f6": "F6", "f7": "F7", "f8": "F8", "f9": "F9", "f10": "F10", "f11": "F11", "f12": "F12",
+        "f13": "F13", "f14": "F14", "f15": "F15", "f16": "F16", "f17": "F17", "f18": "F18", "f19": "F19",
+        "f20": "F20", "f21": "F21", "f22": "F22", "f23": "F23", "f24": "F24", "backtab": "Back Tab",
+        "browser-back": "Browser Back", "browser-favorites": "Browser Favorites",
+        "browser-forward": "Browser Forward", "browser-home": "Browser Home",
+        "browser-refresh": "Browser Refresh", "browser-search": "Browser Search", "browser-stop": "Browser Stop",
+        "context-menu": "Menu", "copy": "Copy", "mail": "Mail", "media": "Media",
+        "media-next-track": "Next Track", "media-pause": "Pause", "media-play": "Play",
+        "media-play-pause": "Play/Pause", "media-prev-track": "Previous Track", "media-stop": "Stop",
+        "print": "Print", "reset": "Reset", "select": "Select", "sleep": "Sleep", "volume-down": "Volume Down",
+        "volume-mute": "Mute", "volume-up": "Volume Up", "zoom": "Zoom", "power": "Power",
+        "fingerprint": "Fingerprint", "left-button": "Left Button", "middle-button": "Middle Button",
+        "right-button": "Right Button", "x-button1": "X Button 1", "x-button2": "X Button 2"
+    };
+    var KEYMAP_ALIASI = {
+        "add": "num-plus", "altgr": "alt-graph", "apps": "context-menu", "back": "backspace",
+        "bksp": "backspace", "bktab": "backtab", "cancel": "break", "capital": "caps-lock",
+        "close-brace": "brace-right", "close-bracket": "bracket-right", "clr": "clear", "cmd": "command",
+        "cplk": "caps-lock", "ctrl": "control", "dblquote": "double-quote", "decimal": "num-separator",
+        "del": "delete", "divide": "num-slash", "down": "arrow-down", "esc": "escape", "return": "enter",
+        "exclamation": "exclam", "favorites": "browser-favorites", "fn": "function",
+        "forward": "browser-forward", "grave-accent": "grave", "greater-than": "greater", "gt": "greater",
+        "hyphen": "minus", "ins": "insert", "lalt": "left-alt", "launch-mail": "mail", "launch-media": "media",
+        "lbutton": "left-button", "lcmd": "left-command", "lcommand": "left-command", "lcontrol": "left-control",
+        "lctrl": "left-control", "left": "arrow-left", "left-cmd": "left-command", "left-ctrl": "left-control",
+        "lopt": "left-option", "loption": "left-option", "left-opt": "left-option", "left-win": "left-windows",
+        "less-than": "less", "lmeta": "left-meta", "lshift": "left-shift", "lsuper": "left-super", "lt": "less",
+        "lwin": "left-windows", "lwindows": "left-windows", "mbutton": "middle-button", "menu": "context-menu",
+        "multiply": "num-asterisk", "mute": "volume-mute", "next": "page-down", "next-track": "media-next-track",
+        "num-del": "num-delete", "numlk": "num-lock", "open-brace": "brace-left", "open-bracket": "bracket-left",
+        "opt": "option", "page-dn": "page-down", "page-up": "page-up", "pause": "media-pause",
+        "pg-dn": "page-down", "pg-up": "page-up", "pipe": "bar", "play": "media-play",
+        "play-pause": "media-play-pause", "prev-track": "media-prev-track", "prior": "page-up",
+        "prtsc": "print-screen", "question-mark": "question", "ralt": "right-alt", "rbutton": "right-button",
+        "rcontrol": "right-control", "rcmd": "right-command", "rcommand": "right-command",
+        "rctrl": "right-control", "refresh": "browser-refresh", "right": "arrow-right",
+        "right-cmd": "right-command", "right-ctrl": "right-control", "right-meta": "right-meta",
+        "right-opt": "right-option", "right-win": "right-windows", "rmeta": "right-meta", "ropt": "right-option",
+        "roption": "right-option", "rshift": "right-shift", "rsuper": "right-super", "rwin": "right-windows",
+        "rwindows": "right-windows", "scroll": "scroll-lock", "search": "browser-search",
+        "separator": "num-separator", "spc": "space", "stop": "media-stop", "subtract": "num-minus",
+        "tabulator": "tab", "up": "arrow-up", "vol-down": "volume-down", "vol-mute": "volume-mute",
+        "vol-up": "volume-up", "win": "windows", "xbutton1": "x-button1", "xbutton2": "x-button2"
+    };
+
+    var KLJUC = /[\w-]+|"(?:\\.|[^"\\])*"|'(?:\\.|[^'\\])*'/g;
+
+    var tipke = {
+        name: 'nzTipke',
+        level: 'inline',
+        start: function (src) { var i = src.indexOf('++'); return i < 0 ? undefined : i; },
+        tokenizer: function (src) {
+            var m = /^\+\+((?:[\w-]+|"(?:\\.|[^"\\])*"|'(?:\\.|[^'\\])*')(?:\+(?:[\w-]+|"(?:\\.|[^"\\])*"|'(?:\\.|[^'\\])*'))*)\+\+/.exec(src);
+            if (!m) return;
+            var tipkeLista = [];
+            var svePoznate = m[1].match(KLJUC).every(function (k) {
+                if (/^["']/.test(k)) {
+                    tipkeLista.push({naziv: k.slice(1, -1).replace(/\\(.)/g, '$1').trim()});
+                    return true;
+                }
+                var norm = k.toLowerCase().replace(/_/g, '-');
+                norm = KEYMAP_ALIASI[norm] || norm;
+                if (!KEYMAP[norm]) return false;
+                tipkeLista.push({klasa: norm, naziv: KEYMAP[norm]});
+                return true;
+            });
+            if (svePoznate) return {type: 'nzTipke', raw: m[0], tipke: tipkeLista};
+        },
+        renderer: function (t) {
+            return '<span class="keys">' + t.tipke.map(function (k) {
+                return '<kbd' + (k.klasa ? ' class="key-' + esc(k.klasa) + '"' : '') + '>' + esc(k.naziv) + '</kbd>';
+            }).join('<span>+</span>') + '</span>';
+        }
+    };
+
+    function omotac(ime, tag, znak, re) {
+        return {
+            name: ime,
+            level: 'inline',
+            start: function (src) { var i = src.indexOf(znak); return i < 0 ? undefined : i; },
+            tokenizer: function (src) {
+                var m = re.exec(src);
+                if (m) return {type: ime, raw: m[0], tokens: this.lexer.inlineTokens(m[1], [])};
+            },
+            renderer: function (t) { return '<' + tag + '>' + this.parser.parseInline(t.tokens) + '</' + tag + '>'; }
+        };
+    }
+
+    var mark = omotac('nzMark', 'mark', '==', /^==(?=\S)([\s\S]*?\S)==/);
+    var ins = omotac('nzIns', 'ins', '^^', /^\^\^(?=\S)([\s\S]*?\S)\^\^/);
+    var sup = omotac('nzSup', 'sup', '^', /^\^((?:\\.|[^\^\s\\])+)\^/);
+    // ~~x~~ ostaje za gfm del
+    var sub = omotac('nzSub', 'sub', '~', /^~((?:\\.|[^~\s\\])+)~(?!~)/);
+
+    // ---- Renderer i tokenizer prilagođeni izlazu render.py ----
+
+    var naslov = {
+        name: 'heading',
+        renderer: function (t) {
+            var html = this.parser.parseInline(t.tokens), a = ATRIBUTI.exec(html), atr = {klase: []};
+            if (a) {
+                html = html.slice(0, a.index);
+                atr = atributi(a[1]);
+            }
+            if (t.nzId) atr.id = t.nzId;
+            return '<h' + t.depth + atributiHtml(atr) + '>' + html + '</h' + t.depth + '>\n';
+        }
+    };
+
+    var paragraf = {
+        name: 'paragraph',
+        renderer: function (t) {
+            var html = this.parser.parseInline(t.tokens), atr = {};
+            // {: .klasa } u zadnjoj liniji paragrafa
+            var a = /(?:^|\n)\{:?[ \t]*([^}\n]*?)[ \t]*\}[ \t]*$/.exec(html);
+            if (a && a.index > 0) {
+                html = html.slice(0, a.index).replace(/\s+$/, '');
+                atr = atributi(a[1]);
+            }
+            return '<p' + atributiHtml(atr) + '>' + html + '</p>\n';
+        }
+    };
+
+    var kod = {
+        name: 'code',
+        renderer: function (t) {
+            return '<div class="highlight"><pre><span></span><code>' + esc(t.text.replace(/\n$/, '')) +
+                '\n</code></pre></div>\n';
+        }
+    };
+
+    marked.use({
+        gfm: true,
+        breaks: true,
+        smartypants: true,
+        headerIds: false,
+        mangle: false,
+        extensions: [lista, admonition, definicije, fusnota, skracenica, htmlMarkdown, htmlBlok, toc,
+                     referenca, tipke, mark, ins, sup, sub, naslov, paragraf, kod],
+        tokenizer: {
+            // Lista ne prekida paragraf (Python-Markdown); ugrađene liste zamjenjuje nzLista
+            paragraph: function (src) {
+                var izmijenjeno = '', zadnji = 0, mjesta = [], pos = iza(src, 0), l;
+                while (pos < src.length && !prazna(l = linija(src, pos))) {
+                    var b = bezListe(l);
+                    if (b !== l) {
+                        izmijenjeno += src.slice(zadnji, pos) + b;
+                        mjesta.push(pos + mjesta.length + b.indexOf('\\'));
+                        zadnji = pos + l.length;
+                    }
+                    pos = iza(src, pos);
+                }
+                if (!mjesta.length) return false;
+                // Paragraf ne ide preko prve prazne linije (pos)
+                var token = marked.Tokenizer.prototype.paragraph.call(this, izmijenjeno + src.slice(zadnji, pos));
+                if (!token) return false;
+                // raw mora biti dio originalnog teksta
+                var duzina = token.raw.length;
+                mjesta.forEach(function (m) { if (m < token.raw.length) duzina--; });
+                token.raw = src.slice(0, duzina);
+                return token;
+            },
+            // Citati razdvojeni praznom linijom su jedan blockquote
+            blockquote: function (src) {
+                if (!CITAT.test(src)) return false;
+                var linije = [], pos = 0, l;
+                while (pos < src.length) {
+                    l = linija(src, pos);
+                    if (CITAT.test(l)) {
+                        linije.push(l.replace(CITAT, ''));
+                    } else if (prazna(l)) {
+                        var q = pos;
+                        while (q < src.length && prazna(linija(src, q))) q = iza(src, q);
+                        if (q >= src.length || !CITAT.test(linija(src, q))) break;
+                        for (; pos < q; pos = iza(src, pos)) linije.push('');
+                        continue;
+                    } else if (NASLOV.test(l) || HR.test(l) || FENCE.test(l) || prazna(linije[linije.length - 1])) {
+                        break;
+                    } else {
+                        linije.push(l);
+                    }
+                    pos = iza(src, pos);
+                }
+                var tekst = linije.join('\n');
+                return {type: 'blockquote', raw: src.slice(0, pos), text: tekst, tokens: blokovi(this.lexer, tekst)};
+            },
+            list: function () { return undefined; }
+        },
+        renderer: {
+            text: function (tekst) {
+                if (!stanje.abbrRe) return tekst;
+                return tekst.replace(stanje.abbrRe, function (k) {
+                    return '<abbr title="' + esc(stanje.abbr[k]) + '">' + k + '</abbr>';
+                });
+            },
+            br: function () { return '<br />\n'; },
+            hr: function () { return '<hr />\n'; },
+            image: function (href, title, tekst) {
+                return '<img alt="' + esc(tekst) + '" src="' + esc(href) + '"' +
+                    (title ? ' title="' + esc(title) + '"' : '') + ' loading="lazy" />';
+            },
+            tablecell: function (sadrzaj, f) {
+                var tag = f.header ? 'th' : 'td';
+                return '<' + tag + (f.align ? ' style="text-align: ' + f.align + ';"' : '') + '>' + sadrzaj + '</' + tag + '>\n';
+            }
+        }
+    });
+
+    // ---- Dokument: leksiranje i render samo promijenjenih blokova ----
+    //
+    // Tekst se leksira u dijelovima. Granica dijela je linija poslije prazne linije
+    // na kojoj nijedan blok iznad ne može nastaviti: ne počinje razmakom, nije stavka
+    // liste, citat, definicija ni HTML, a iznad nje nije otvoren fence ni HTML blok.
+    // Leksiranje dijela tada daje iste tokene kao leksiranje cijelog teksta, pa se po
+    // izmjeni leksiraju samo dijelovi između nepromijenjenog početka i kraja.
+
+    var OGRADA = /^ {0,3}(`{3,}|~{3,})/;
+    var NASTAVAK = /^(?:[*+-](?:[ \t]|$)|\d+[.)](?:[ \t]|$)|[\s>:<]|$)/;
+    // marked-ovi HTML blokovi koji idu preko praznih linija (do kraja teksta ako nisu zatvoreni)
+    var HTML_SIROVI = [[/^ {0,3}<!--/, '-->'], [/^ {0,3}<\?/, '?>'], [/^ {0,3}<!\[CDATA\[/, ']]>'], [/^ {0,3}<![A-Z]/i, '>']];
+    var HTML_SADRZAJ = /^ {0,3}<(script|pre|style|textarea)(?=[\s>]|$)/i;
+    var HTML_TAG = /^ {0,3}<([a-zA-Z][\w-]*)/;
+
+    // Zatvara li linija fence otvoren sa ograda (isto pravilo kao marked)
+    function zatvara(l, ograda) {
+        var i = l.search(/[^ ]/);
+        return i >= 0 && i <= 3 && l.startsWith(ograda, i) && /^[~`]* *$/.test(l.slice(i + ograda.length));
+    }
+
+    function krajOgrade(src, pos, ograda) {
+        for (; pos < src.length; pos = iza(src, pos)) {
+            if (zatvara(linija(src, pos), ograda)) return iza(src, pos);
+        }
+        return src.length;
+    }
+
+    // HTML blok koji bi mogao početi linijom l na pos: kraj (0 ako ide samo do prazne
+    // linije) i da li je tražio par do kraja teksta bez uspjeha
+    function htmlOd(src, pos, l) {
+        var m, z, i;
+        for (i = 0; i < HTML_SIROVI.length; i++) {
+            if ((m = HTML_SIROVI[i][0].exec(l))) {
+                z = src.indexOf(HTML_SIROVI[i][1], pos + m[0].length);
+                if (z < 0) return {kraj: src.length, otvoren: true};
+                // Osim komentara, blok završava odmah iza oznake: ostatak linije je novi
+                // blok, pa dio ide do kraja teksta ako je to blok koji može ići preko
+                // praznih linija (fence, HTML, oznaka definicije)
+                z += HTML_SIROVI[i][1].length;
+                if (i > 0 && /^ {0,3}(?:```|~~~|<|\*?\[)/.test(linija(src, z))) return {kraj: src.length, otvoren: true};
+                return {kraj: iza(src, z - 1), otvoren: false};
+            }
+        }
+        var rez = {kraj: 0, otvoren: false}, re;
+        // "<div" do kraja linije: marked-ov html blok pojede novi red, pa i prvu praznu liniju
+        if (/^ {0,3}<\/?[a-zA-Z][\w-]*$/.test(l)) {
+            re = /\n *\n/g;
+            re.lastIndex = iza(src, pos);
+            rez = (z = re.exec(src)) ? {kraj: re.lastIndex, otvoren: false} : {kraj: src.length, otvoren: true};
+        }
+        if (!(m = HTML_TAG.exec(l))) return rez.kraj ? rez : null;
+        var tag = m[1].toLowerCase();
+        if (HTML_SADRZAJ.test(l)) {
+            re = new RegExp('</' + tag + '>', 'gi');
+            re.lastIndex = pos;
+            rez.kraj = Math.max(rez.kraj, (z = re.exec(src)) ? iza(src, z.index) : src.length);
+            rez.otvoren = rez.otvoren || !z;
+        }
+        // nzHtmlBlok i nzHtmlMarkdown idu do para na početku linije (otvarajući tag
+        // sa markdown= može ići i preko više linija)
+        var md = MD_HTML.exec(src.slice(pos));
+        if ((md || BLOK_TAGOVI.test(tag)) && !new RegExp('</' + tag + '\\s*>', 'i').test(l)) {
+            // Par se poklapa i preko kraja svoje linije ([^>]*>)
+            if ((z = zatvarajuci(src, tag, pos + (md ? md[0].length : l.length)))) rez.kraj = Math.max(rez.kraj, iza(src, z.index + z[0].length - 1));
+            else rez.otvoren = true;
+        }
+        return rez;
+    }
+
+    // Par koji na početku bloka nađu nzHtmlMarkdown ili nzHtmlBlok: sve do njega je jedan token
+    function htmlBlokDo(src, pos, l) {
+        var m = MD_HTML.exec(src.slice(pos));
+        if (!m) {
+            m = HTML_POCETAK.exec(l + '\n');
+            if (!m || !BLOK_TAGOVI.test(m[1]) || new RegExp('</' + m[1] + '\\s*>', 'i').test(m[0])) return null;
+        }
+        return zatvarajuci(src, m[1].toLowerCase(), pos + m[0].length);
+    }
+
+    // Oznaka definicije ([x]:, [^x]:, *[x]:) i naslov linka mogu ići preko praznih linija
+    function definicijaOd(src, pos, l) {
+        var m = /^ {0,3}\*?\[/.exec(l), re = /(?:\\[\s\S]|[^\]\\])*\]/y, i, z;
+        if (!m) return null;
+        re.lastIndex = pos + m[0].length;
+        if (!re.exec(src)) return {kraj: 0, otvoren: true};
+        var rez = {kraj: iza(src, re.lastIndex - 1), otvoren: false};
+        if (src[re.lastIndex] !== ':') return rez;
+        // Adresa može biti u sljedećoj liniji
+        if (!/\S/.test(src.slice(re.lastIndex + 1, rez.kraj))) rez.kraj = iza(src, rez.kraj);
+        // Naslov počinje u istoj liniji ili u jednoj od dvije sljedeće
+        var dalje = src.slice(re.lastIndex, iza(src, iza(src, rez.kraj)));
+        ['"', "'", '('].forEach(function (znak) {
+            if ((i = dalje.indexOf(znak)) < 0) return;
+            z = src.indexOf(znak === '(' ? ')' : znak, re.lastIndex + i + 1);
+            if (z < 0) rez.otvoren = true;
+            else rez.kraj = Math.max(rez.kraj, iza(src, z));
+        });
+        return rez;
+    }
+
+    // Može li dio početi linijom l na pos (prethodna linija je prazna)
+    function granica(src, pos, l) {
+        if (NASTAVAK.test(l)) return false;
+        // Termin ispred ":" (i poslije praznih linija) nastavlja listu definicija iznad
+        while (pos < src.length && !prazna(l = linija(src, pos))) {
+            if (DEFINICIJA.test(l)) return false;
+            pos = iza(src, pos);
+        }
+        while (pos < src.length && prazna(l = linija(src, pos))) pos = iza(src, pos);
+        return !(pos < src.length && DEFINICIJA.test(l));
+    }
+
+    // Linija poslije teksta je termin liste definicija ako do prazne linije slijedi ":"
+    function termin(src, pos) {
+        for (var l; pos < src.length && !prazna(l = linija(src, pos)); pos = iza(src, pos)) {
+            if (DEFINICIJA.test(l)) return true;
+        }
+        return false;
+    }
+
+    // Kraj dijela koji počinje na od; otvoren: blok u dijelu je tražio zatvaranje do
+    // kraja teksta, pa dio zavisi i od teksta iza sebe
+    function dio(src, od) {
+        var ograda = null, sumnjiva = false, niz = false, zabranjeno = 0, prazno = true, otvoren = false, pos, m, h;
+        function zabrani(kraj, doKraja) {
+            otvoren = otvoren || doKraja;
+            zabranjeno = Math.max(zabranjeno, kraj);
+        }
+        for (pos = od; pos < src.length; pos = iza(src, pos)) {
+            var l = linija(src, pos);
+            if (ograda) {
+                // Fence koji marked možda nije vidio (u HTML-u, definiciji, fusnoti): svaka
+                // linija unutra može biti HTML ili početak drugog fence-a
+                if (sumnjiva && (m = OGRADA.exec(l))) {
+                    var kraj = krajOgrade(src, iza(src, pos), m[1]);
+                    zabrani(kraj, kraj === src.length);
+                }
+                if (zatvara(l, ograda)) ograda = null;
+                prazno = false;
+                if (!sumnjiva) continue;
+            } else if (prazna(l)) {
+                prazno = true;
+                continue;
+            } else {
+                if (prazno && pos > od && pos >= zabranjeno && granica(src, pos, l)) return {kraj: pos, otvoren: otvoren};
+                if (prazno && pos >= zabranjeno && (m = htmlBlokDo(src, pos, l))) {
+                    zabrani(iza(src, m.index + m[0].length - 1), false);
+                    pos = m.index;
+                    prazno = niz = false;
+                    continue;
+                }
+                // niz: linije od zadnje prazne mogu biti blok koji fence ne prekida
+                niz = (!prazno && niz) || pos < zabranjeno;
+                if ((m = OGRADA.exec(l))) {
+                    ograda = m[1];
+                    sumnjiva = niz || (ograda[0] === '`' && l.indexOf('`', m[0].length) >= 0) ||
+                        (!prazno && termin(src, pos));
+                }
+                niz = niz || /^ {0,3}(?:<|:[ \t]|\[\^)/.test(l);
+                prazno = false;
+            }
+            if ((h = htmlOd(src, pos, l) || definicijaOd(src, pos, l))) zabrani(h.kraj, h.otvoren);
+        }
+        return {kraj: src.length, otvoren: otvoren || !!ograda};
+    }
+
+    function Dokument() {
+        this.dijelovi = [];
+        this.tokeni = [];
+        this.linkovi = null;
+        this.globalno = null;
+        this.verzija = 0;
+        this.tocKljuc = '';
+        this.tocVerzija = 0;
+        this.fusnote = {kljuc: null, html: ''};
+    }
+
+    // Blok tokeni dijela; inline dio čeka na definicije linkova iz svih dijelova
+    function leksiraj(lexer, tekst, otvoren) {
+        lexer.tokens = [];
+        lexer.tokens.links = Object.create(null);
+        lexer.inlineQueue = [];
+        var tokeni = lexer.blockTokens(tekst, []), linkovi = Object.keys(lexer.tokens.links).length ? lexer.tokens.links : null;
+        return {tekst: tekst, otvoren: otvoren, tokeni: tokeni, linkovi: linkovi, red: lexer.inlineQueue};
+    }
+
+    // Leksira samo dijelove između nepromijenjenog početka i kraja teksta; ostali
+    // zadržavaju svoje tokene (i keširani HTML)
+    Dokument.prototype.azuriraj = function (tekst) {
+        if (tekst.indexOf('\r') >= 0) tekst = tekst.replace(/\r\n|\r/g, '\n');
+        var lexer = new marked.Lexer(marked.defaults), stari = this.dijelovi, p = 0, s = 0, pos = 0, kraj = tekst.length, d;
+        // Isti početak i kraj (=== poredi brže od startsWith). Dio čiji blok traži par do
+        // kraja teksta zavisi i od izmjene iza njega.
+        while (p < stari.length && !stari[p].otvoren && tekst.substr(pos, stari[p].tekst.length) === stari[p].tekst) {
+            pos += stari[p++].tekst.length;
+        }
+        // Iza zadržanog početka mora i dalje biti granica (zadnji dio teksta ne mora
+        // završiti praznom linijom)
+        while (p && pos < tekst.length &&
+               !(/(?:^|\n)[^\S\n]*\n$/.test(stari[p - 1].tekst) && granica(tekst, pos, linija(tekst, pos)))) {
+            pos -= stari[--p].tekst.length;
+        }
+        while (s < stari.length - p && kraj - (d = stari[stari.length - 1 - s]).tekst.length >= pos &&
+               tekst.slice(kraj - d.tekst.length, kraj) === d.tekst) {
+            kraj -= d.tekst.length;
+            s++;
+        }
+        var pocetci = new Map(), novi = [], i;
+        for (i = 0; i < s; i++) {
+            pocetci.set(kraj, i);
+            kraj += stari[stari.length - s + i].tekst.length;
+        }
+        while (pos < tekst.length && !pocetci.has(pos)) {
+            d = dio(tekst, pos);
+            novi.push(leksiraj(lexer, tekst.slice(pos, d.kraj), d.otvoren));
+            pos = d.kraj;
+        }
+        s = pos < tekst.length ? s - pocetci.get(pos) : 0;
+        var dijelovi = stari.slice(0, p).concat(novi, stari.slice(stari.length - s));
+
+        // Definicije linkova važe za cijeli tekst (prva pobjeđuje)
+        var linkovi = Object.create(null);
+        dijelovi.forEach(function (d) {
+            if (d.linkovi) for (var k in d.linkovi) if (!(k in linkovi)) linkovi[k] = d.linkovi[k];
+        });
+        var json = JSON.stringify(linkovi);
+        // Promijenjena definicija linka mijenja inline leksiranje bilo kog dijela
+        if (json !== this.linkovi) {
+            dijelovi = dijelovi.map(function (d) { return d.red ? d : leksiraj(lexer, d.tekst, d.otvoren); });
+            this.linkovi = json;
+            // i HTML fusnota, čiji ključ gleda samo izvor
+            this.verzija++;
+        }
+        lexer.tokens.links = linkovi;
+        dijelovi.forEach(function (d) {
+            if (!d.red) return;
+            d.red.forEach(function (q) { lexer.inlineTokens(q.src, q.tokens); });
+            d.red = null;
+        });
+        this.dijelovi = dijelovi;
+        var tokeni = this.tokeni = [];
+        dijelovi.forEach(function (d) { for (var j = 0; j < d.tokeni.length; j++) tokeni.push(d.tokeni[j]); });
+
+        var fusnote = {}, red = [], abbr = {};
+        tokeni.forEach(function (t) {
+            if (t.type === 'nzFusnota' && !fusnote[t.id]) {
+                red.push(t.id);
+                fusnote[t.id] = {broj: red.length, token: t};
+            } else if (t.type === 'nzSkracenica') {
+                abbr[t.kratica] = t.naziv;
+            }
+        });
+        stanje.fusnote = fusnote;
+        stanje.fusnoteRed = red;
+        postaviSkracenice(abbr);
+        // Brojevi fusnota i skraćenice mijenjaju HTML bilo kog bloka
+        var globalno = JSON.stringify(red) + JSON.stringify(abbr);
+        if (globalno !== this.globalno) {
+            this.globalno = globalno;
+            this.verzija++;
+        }
+        stanje.verzija = this.verzija;
+        idNaslova(tokeni);
+        var tocKljuc = stanje.naslovi.map(function (h) { return h.depth + h.nzId + '\u0000' + h.nzTekst; }).join('\u0000');
+        if (tocKljuc !== this.tocKljuc) {
+            this.tocKljuc = tocKljuc;
+            this.tocVerzija++;
+        }
+        // Naslovi u fusnotama dobijaju id-ove u redu sa ostalim naslovima
+        var kljucFusnota = this.verzija + red.map(function (id) {
+            var t = fusnote[id].token;
+            return t.raw + naslovi(t).map(function (h) { return '\u0000' + h.nzId; }).join('');
+        }).join('\u0000');
+        if (kljucFusnota !== this.fusnote.kljuc) this.fusnote = {kljuc: kljucFusnota, html: fusnoteHtml()};
+    };
+
+    // Ključ HTML-a bloka: globalne definicije i id-ovi naslova u njemu
+    Dokument.prototype.kljuc = function (t) {
+        var h = naslovi(t), k = this.verzija + '\u0000' + (h.length ? h.map(function (x) { return x.nzId; }).join('\u0000') : '');
+        // [TOC] zavisi od svih naslova
+        return t.type === 'nzToc' ? k + '\u0000' + this.tocVerzija : k;
+    };
+
+    Dokument.prototype.html = function (t) {
+        var k = this.kljuc(t);
+        if (t.nzKljuc !== k) {
+            t.nzHtml = marked.Parser.parse([t], marked.defaults);
+            t.nzKljuc = k;
+        }
+        return t.nzHtml;
+    };
+
+    function dokument(tekst) {
+        var d = new Dokument();
+        d.azuriraj(tekst);
+        return d.tokeni.map(function (t) { return d.html(t); }).join('') + d.fusnote.html;
+    }
+
+    window.nzLiveRender = {dokument: dokument, Dokument: Dokument};
+
+    // ---- DOM: zamjena samo promijenjenih blokova ----
+
+    var root = typeof document !== 'undefined' && document.getElementById('nz-live');
+    if (!root) return;
+    var tekst = '', doc = new Dokument(), prikazani = [], fusnoteCvorovi = [], fusnoteHtml_ = null, zakazano = false;
+
+    function cvorovi(html) {
+        var t = document.createElement('template');
+        t.innerHTML = html;
+        var n = Array.prototype.slice.call(t.content.childNodes);
+        // Blok bez izlaza (prazne linije, definicije) drži mjesto komentarom
+        return n.length ? n : [document.createComment('')];
+    }
+
+    function osvjezi() {
+        zakazano = false;
+        doc.azuriraj(tekst);
+        var tokeni = doc.tokeni, kljucevi = tokeni.map(function (t) { return doc.kljuc(t); }), p = 0, s = 0;
+        while (p < tokeni.length && p < prikazani.length &&
+               prikazani[p].token === tokeni[p] && prikazani[p].kljuc === kljucevi[p]) p++;
+        while (s < tokeni.length - p && s < prikazani.length - p &&
+               prikazani[prikazani.length - 1 - s].token === tokeni[tokeni.length - 1 - s] &&
+               prikazani[prikazani.length - 1 - s].kljuc === kljucevi[tokeni.length - 1 - s]) s++;
+        var sidro = s ? prikazani[prikazani.length - s].cvorovi[0] : null;
+        prikazani.slice(p, prikazani.length - s).forEach(function (b) {
+            b.cvorovi.forEach(function (n) { n.remove(); });
+        });
+        var umetnuti = [];
+        for (var i = p; i < tokeni.length - s; i++) {
+            var b = {token: tokeni[i], kljuc: kljucevi[i], cvorovi: cvorovi(doc.html(tokeni[i]))};
+            b.cvorovi.forEach(function (n) { root.insertBefore(n, sidro); });
+            umetnuti.push(b);
+        }
+        prikazani = prikazani.slice(0, p).concat(umetnuti, prikazani.slice(prikazani.length - s));
+        if (doc.fusnote.html !== fusnoteHtml_) {
+            fusnoteCvorovi.forEach(function (n) { n.remove(); });
+            fusnoteHtml_ = doc.fusnote.html;
+            fusnoteCvorovi = fusnoteHtml_ ? cvorovi(fusnoteHtml_) : [];
+            fusnoteCvorovi.forEach(function (n) { root.parentNode.insertBefore(n, root.nextSibling); });
+        }
+    }
+
+    function zakazi() {
+        if (!zakazano) { zakazano = true; requestAnimationFrame(osvjezi); }
+    }
+
+    new QWebChannel(qt.webChannelTransport, function (kanal) {
+        var most = kanal.objects.nzLive;
+        most.tekst.connect(function (t) {
+            tekst = t;
+            zakazi();
+        });
+        most.izmjena.connect(function (pozicija, uklonjeno, umetnuto) {
+            // Promjena formata (syntax highlighter) javlja isti tekst — ništa za crtanje
+            if (tekst.substr(pozicija, uklonjeno) === umetnuto) return;
+            tekst = tekst.slice(0, pozicija) + umetnuto + tekst.slice(pozicija + uklonjeno);
+            zakazi();
+        });
+        most.spreman();
+    });
+})();
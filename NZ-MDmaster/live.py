@@ -0,0 +1,113 @@
+"""
+Instant split-view preview rendered inside the page.
+The preview page gets a bundled Markdown parser (marked, vendored under
+vendor/marked — no network, no Python in the loop), the extensions in
+live.js that give it the dialect of the Python pipeline, and a QWebChannel
+bridge. The editor sends the text once and then only its edits (position,
+removed, inserted — UTF-16, the unit of both QTextDocument and JavaScript
+strings); the page re-lexes only the part of the text between its unchanged
+start and end, re-renders only the top-level blocks that changed and swaps their DOM nodes, at most once per animation frame.
+The GUI thread does no rendering while typing; leaving split view renders
+the document with the full Python pipeline again.
+"""
+
+import os
+import re
+
+from PySide6.QtCore import QObject, QFile, QIODevice, Signal, Slot
+from PySide6.QtWebChannel import QWebChannel
+
+# Stranica po izmjeni leksira samo promijenjene dijelove (~11 ms za 1 MB); veći tekst
+# ide kroz Python pipeline (sekcije, virtuelne tabele)
+MAX_LIVE = 1024 * 1024
+
+_OVDJE = os.path.dirname(os.path.abspath(__file__))
+SKRIPTE = (
+    os.path.join(_OVDJE, "vendor", "marked", "marked.js"),
+    os.path.join(_OVDJE, "live.js"),
+)
+_SKRIPTE_HTML = None
+_KRAJ_SKRIPTE = re.compile(r"</(script)", re.IGNORECASE)
+
+
+class _Most(QObject):
+    """Objekat koji stranica vidi kao nzLive."""
+
+    # cijeli tekst editora (početak i resinhronizacija)
+    tekst = Signal(str)
+    # pozicija, uklonjeno, umetnuto — izmjena teksta u UTF-16 jedinicama
+    izmjena = Signal(int, int, str)
+    spreman_signal = Signal()
+
+    @Slot()
+    def spreman(self):
+        self.spreman_signal.emit()
+
+
+class LivePreview(QObject):
+    """
+    prikazi() učitava stranicu sa rendererom u PreviewBuffer; kad se javi,
+    dobija tekst_fn(), a zatim izmjene iz izmjena(). zaustavi() prekida slanje.
+    """
+
+    def __init__(self, buffer, tekst_fn, parent=None):
+        super().__init__(parent)
+        self.buffer = buffer
+        self.tekst_fn = tekst_fn
+        self._most = _Most(self)
+        self._most.spreman_signal.connect(self._on_spreman)
+        self._kanal = QWebChannel(self)
+        self._kanal.registerObject("nzLive", self._most)
+        buffer.postavi_kanal(self._kanal)
+        self.aktivan = False
+        self._spreman = False
+
+    def html(self) -> str:
+        """Body stranice: kontejner, qwebchannel.js i renderer."""
+        return f'<div id="nz-live"></div>{_qwebchannel_js()}{_skripte()}'
+
+    def prikazi(self, html: str, base_url, zadrzi_scroll=False):
+        self.aktivan = True
+        self._spreman = False
+        self.buffer.postavi_html(html, base_url, zadrzi_scroll)
+
+    def _on_spreman(self):
+        if self.aktivan:
+            self._spreman = True
+            self._most.tekst.emit(self.tekst_fn())
+
+    def posalji_tekst(self):
+        """Cijeli tekst ponovo (npr. poslije zamjene sadržaja editora)."""
+        if self._spreman:
+            self._most.tekst.emit(self.tekst_fn())
+
+    def izmjena(self, pozicija: int, uklonjeno: int, umetnuto: str):
+        # Prije nego što se stranica javi izmjene se ne šalju — tada dobija cijeli tekst
+        if self._spreman:
+            self._most.izmjena.emit(pozicija, uklonjeno, umetnuto)
+
+    def zaustavi(self):
+        self.aktivan = self._spreman = False
+
+
+def _qwebchannel_js() -> str:
+    """qwebchannel.js iz Qt resursa, ugrađen u stranicu (base URL je file://)."""
+    f = QFile(":/qtwebchannel/qwebchannel.js")
+    if f.open(QIODevice.ReadOnly):
+        kod = bytes(f.readAll()).decode("utf-8")
+        f.close()
+        return "<script>" + kod.replace("</", "<\\/") + "</script>"
+    return '<script src="qrc:///qtwebchannel/qwebchannel.js"></script>'
+
+
+def _skripte() -> str:
+    """marked.js i live.js ugrađeni u stranicu; čitaju se sa diska jednom."""
+    global _SKRIPTE_HTML
+    if _SKRIPTE_HTML is None:
+        dijelovi = []
+        for putanja in SKRIPTE:
+            with open(putanja, "r", encoding="utf-8") as f:
+                # Samo </script završava skriptu; opšte "</" -> "<\/" bi pokvarilo regex literale
+                dijelovi.append("<script>" + _KRAJ_SKRIPTE.sub(r"<\\/\1", f.read()) + "</script>")
+        _SKRIPTE_HTML = "".join(dijelovi)
+    return _SKRIPTE_HTML
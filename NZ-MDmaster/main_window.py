@@ -7,9 +7,11 @@ import os
 import json
 import tempfile
 import re
+import hashlib
+import time
+import argparse
 from pathlib import Path
 
-import markdown
 from PySide6.QtWidgets import (
     QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
     QSplitter, QTreeView, QToolBar, QStatusBar, QLineEdit,
@@ -19,13 +21,13 @@ from PySide6.QtWidgets import (
     QPlainTextEdit, QInputDialog, QColorDialog,
 )
 from PySide6.QtWebEngineWidgets import QWebEngineView
-from PySide6.QtWebEngineCore import QWebEnginePage
+from PySide6.QtWebEngineCore import QWebEnginePage, QWebEngineProfile
 from PySide6.QtGui import (
     QAction, QKeySequence, QDesktopServices, QColor,
     QIcon, QPixmap, QCursor, QTextCursor, QShortcut,
 )
 from PySide6.QtCore import (
-    Qt, QUrl, QTimer, QDir, QFileSystemWatcher,
+    Qt, QUrl, QTimer, QDir, QFileSystemWatcher, QPoint, Signal,
 )
 
 import importlib.util as _ilu
@@ -36,11 +38,49 @@ del _ilu, _spec, _m
 
 from translations import _t, set_lang
 from editor import MarkdownEditor
-from web import BalkanMDPage, ContentContainer
+from web import (
+    PreviewBuffer, ContentContainer, ImageSchemeHandler, SectionSchemeHandler, registruj_sheme,
+)
+from images import IMAGE_SCHEME
+from sections import SECTION_SCHEME, SectionStore
+from outline import HeadingIndex, OutlinePanel, toc_entries, editor_entries
+from linkgraph import LinkGraph, linkovi_fajla, izvuci_linkove
+from workspace import WorkspaceIndexer
+from backlinks import BacklinksPanel
+from frontmatter import MetaIndex, analizator as frontmatter_analizator
+from facets import FacetBar, FacetFilterModel
+from quickopen import PathIndex, QuickOpenDialog, frecency_iz_recent
+from linkcheck import provjeri_folder
+from linkcheck_panel import LinkCheckPanel, LinkCheckThread
 from styles import ucitaj_css
+from render import (
+    RenderCache, sastavi_html, procitaj_tekst, MARKDOWN_EKSTENZIJE,
+    je_obican_tekst, renderuj_tekst, stranice_teksta, TEKST_STRANICA,
+    izdvoji_tabele, dovrsi_body,
+)
+from pdf_export import PdfExportQueue
+from preview_server import PreviewServer
+from prefetch import Prefetcher
+from render_worker import RenderWatchdog, BUDZET, PRIVREMENI_MS
+from live import LivePreview, MAX_LIVE
+from debounce import AdaptiveDebounce, TrosakRendera
+from changes import ChangeDispatcher, ODMAH, MIROVANJE, DEBOUNCE
+from positions import ReadingPositions, SKRIPTA_SIDRA, skripta_vracanja
+from engines import ENGINES, PODRAZUMIJEVANI as PODRAZUMIJEVANI_ENGINE
+from build import izgradi
+from tracing import tracer, formatiraj_mjeru
+from textstats import BrojacRijeci, izbroj_rijeci, minute_citanja
+from journal import (
+    EditJournal, atomicno_sacuvaj, pronadji_oporavak, odbaci_journal, journali_na_cekanju,
+)
 from settings_mgr import ucitaj_postavke, sacuvaj_postavke, SETTINGS_FILE
 
 
+def _otisak(tekst):
+    """Hash sadržaja — za poređenje editora sa zadnjim sačuvanim stanjem"""
+    return hashlib.sha1(tekst.encode("utf-8", "surrogatepass")).digest()
+
+
 class BalkanMDViewer(QMainWindow):
     """
     Glavni prozor aplikacije.
@@ -48,6 +88,9 @@ class BalkanMDViewer(QMainWindow):
     Jednostavno ko pasulj.
     """
 
+    # nastavak, (body, meta) — rezultat watchdoga iz njegovog threada u GUI thread
+    render_stigao = Signal(object, object)
+
     def __init__(self, pocetni_fajl=None):
         super().__init__()
 
@@ -65,13 +108,25 @@ class BalkanMDViewer(QMainWindow):
         self.edit_mode = False
         self.edit_paused_watcher = False
 
+        # Dirty tracking: hash zadnjeg sačuvanog/učitanog sadržaja i stat našeg zadnjeg upisa
+        self._sacuvani_otisak = None
+        self._vlastiti_upis = None
+
+        # Journal izmjena između snimanja (oporavak nakon pada); delte se upisuju u serijama
+        self.journal = EditJournal()
+        self.journal_timer = QTimer(self)
+        self.journal_timer.setSingleShot(True)
+        self.journal_timer.timeout.connect(self._isprazni_journal)
+
         # Split mode state
         self.split_mode = False
         self.split_splitter = None
-        self.split_timer = QTimer(self)
-        self.split_timer.setSingleShot(True)
-        self.split_timer.timeout.connect(self._split_preview_update)
-        self._split_text_changed_conn = None
+        # Koliko su renderi koštali (do loadFinished) — iz toga debounce i najduže čekanje
+        self.trosak_rendera = TrosakRendera()
+        self._render_mjerenje = None
+        self.split_debounce = AdaptiveDebounce(
+            self.trosak_rendera, lambda: self.editor.document().characterCount(), 400, self
+        )
 
         # Omogući drag & drop
         self.setAcceptDrops(True)
@@ -80,10 +135,11 @@ class BalkanMDViewer(QMainWindow):
         self.file_watcher = QFileSystemWatcher()
         self.file_watcher.fileChanged.connect(self.on_file_changed)
 
-        # Debounce timer za reload (da ne refresha 100 puta u sekundi)
-        self.reload_timer = QTimer(self)
-        self.reload_timer.setSingleShot(True)
-        self.reload_timer.timeout.connect(self.reload_trenutni_fajl)
+        # Debounce za reload (da ne refresha 100 puta u sekundi)
+        self.reload_debounce = AdaptiveDebounce(
+            self.trosak_rendera, lambda: len(self.trenutni_sadrzaj or ""), 300, self
+        )
+        self.reload_debounce.okini.connect(self.reload_trenutni_fajl)
 
         # Glavni widget
         central_widget = QWidget()
@@ -109,6 +165,11 @@ class BalkanMDViewer(QMainWindow):
         self.word_count_label.hide()
         self.status_bar.addPermanentWidget(self.word_count_label)
 
+        # Breakdown zadnjeg renderovanja (opcionalno, iz postavki)
+        self.render_time_label = QLabel()
+        self.render_time_label.hide()
+        self.status_bar.addPermanentWidget(self.render_time_label)
+
         # --- GLAVNI SPLITTER ---
         self.glavni_splitter = QSplitter(Qt.Horizontal)
         self.glavni_splitter.setHandleWidth(6)
@@ -132,9 +193,13 @@ class BalkanMDViewer(QMainWindow):
         self.file_model.setNameFilters(["*.md", "*.markdown", "*.mdown", "*.txt"])
         self.file_model.setNameFilterDisables(False)
 
+        # Proxy za filtriranje po front matter facetama
+        self.tree_proxy = FacetFilterModel(self)
+        self.tree_proxy.setSourceModel(self.file_model)
+
         self.tree_view = QTreeView()
-        self.tree_view.setModel(self.file_model)
-        self.tree_view.setRootIndex(self.file_model.index(QDir.homePath()))
+        self.tree_view.setModel(self.tree_proxy)
+        self.tree_view.setRootIndex(self._tree_index(QDir.homePath()))
 
         # Sakrij nepotrebne kolone
         for i in range(1, 4):
@@ -167,14 +232,78 @@ class BalkanMDViewer(QMainWindow):
         # Klik i dvostruki klik na fajl
         self.tree_view.clicked.connect(self.klik_na_fajl)
 
+        # Facete (tagovi, status, ...) iz front mattera — indeks se puni tek kad se otvore
+        self.meta_index = MetaIndex()
+        self._facet_polje = ""
+        self.facet_bar = FacetBar(_t("facet_all"), _t("facet_any"))
+        self.facet_bar.setToolTip(_t("tip_facets"))
+        self.facet_bar.otvaranje.connect(self._aktiviraj_facete)
+        self.facet_bar.filter_promijenjen.connect(self._primijeni_facet_filter)
+        self.facet_timer = QTimer(self)
+        self.facet_timer.setSingleShot(True)
+        self.facet_timer.timeout.connect(self._refresh_facets)
+
+        self.sidebar = QWidget()
+        sidebar_layout = QVBoxLayout(self.sidebar)
+        sidebar_layout.setContentsMargins(0, 0, 0, 0)
+        sidebar_layout.setSpacing(0)
+        sidebar_layout.addWidget(self.facet_bar)
+        sidebar_layout.addWidget(self.tree_view)
+
         # === DESNA STRANA: CONTENT CONTAINER (Preview + Editor) ===
         self.pregledac = QWebEngineView()
         self.pregledac.setZoomFactor(1.0)
 
-        # Custom page za interceptanje linkova
-        self.custom_page = BalkanMDPage(self.pregledac)
-        self.custom_page.md_link_clicked.connect(lambda path: self.ucitaj_fajl(path))
-        self.pregledac.setPage(self.custom_page)
+        # Dvije custom stranice (interceptanje linkova): sljedeći dokument se učitava u
+        # rezervnu i zamjenjuje prikazanu tek kad je spreman — bez bijelog bljeska
+        self.preview_buffer = PreviewBuffer(self.pregledac, self)
+        self.preview_buffer.md_link_clicked.connect(lambda path: self.ucitaj_fajl(path))
+        self.preview_buffer.page_requested.connect(self._idi_na_stranicu)
+        # Split view bez Python rendera: stranica sama renderuje izmjene editora
+        self.live_preview = LivePreview(self.preview_buffer, self.editor.toPlainText, self)
+        # Trenutna stranica velikog .txt fajla
+        self.txt_stranica = 0
+        # Renderovani markdown po sadržaju — dijele ga pregled i preview server. Render
+        # ide u radni proces pod vremenskim budžetom, pa patološki ulaz ne zamrzne prozor
+        self.render_watchdog = RenderWatchdog()
+        self.render_cache = RenderCache(watchdog=self.render_watchdog)
+        self.render_stigao.connect(lambda nastavak, rezultat: nastavak(*rezultat))
+        self._profil_rendera = "puni"
+        # Redni broj zadnjeg zahtjeva za pregled — stariji rezultati se odbacuju
+        self._render_broj = 0
+        # Rezultat kasni (radnik se pokreće, težak tekst): do tada običan tekst
+        self._privremeni_prikaz = False
+        self.privremeni_timer = QTimer(self)
+        self.privremeni_timer.setSingleShot(True)
+        self.privremeni_timer.setInterval(PRIVREMENI_MS)
+        self.privremeni_timer.timeout.connect(self._prikazi_privremeni)
+        self._privremeni_tekst = ""
+        self.preview_server = None
+        # Linkovi i susjedi otvorenog dokumenta se renderuju unaprijed dok korisnik miruje
+        self.prefetcher = Prefetcher(self.render_cache, self)
+        # Gdje je čitanje stalo, po fajlu (naslov + udio, ne pikseli); vraća se pri otvaranju
+        self.pozicije = ReadingPositions()
+        self._vrati_sidro = None
+        self.pozicija_timer = QTimer(self)
+        self.pozicija_timer.setSingleShot(True)
+        self.pozicija_timer.timeout.connect(self._zapamti_sidro_pregleda)
+        self.preview_buffer.skrolovano.connect(lambda: self.pozicija_timer.start(500))
+        QApplication.instance().installEventFilter(self.prefetcher)
+        self.preview_buffer.pregled_spreman.connect(self._on_preview_loaded)
+
+        # nzimg: — lokalne slike smanjene na širinu pregleda, keširane na disku
+        self.image_handler = ImageSchemeHandler(self._image_target_width, self)
+        QWebEngineProfile.defaultProfile().installUrlSchemeHandler(
+            IMAGE_SCHEME.encode(), self.image_handler
+        )
+        # nzsec: — vrlo dugi dokumenti se prikazuju u sekcijama koje stranica traži po potrebi
+        self.section_store = SectionStore()
+        self._dugi_dokument = None
+        self._velike_tabele = None
+        self.section_handler = SectionSchemeHandler(self.section_store, self)
+        QWebEngineProfile.defaultProfile().installUrlSchemeHandler(
+            SECTION_SCHEME.encode(), self.section_handler
+        )
 
         # Context menu za zoom
         self.pregledac.setContextMenuPolicy(Qt.CustomContextMenu)
@@ -195,7 +324,7 @@ class BalkanMDViewer(QMainWindow):
         self.content_container.setChildren(self.pregledac, self.editor_panel)
 
         # Dodaj widgete u splitter
-        self.glavni_splitter.addWidget(self.tree_view)
+        self.glavni_splitter.addWidget(self.sidebar)
         self.glavni_splitter.addWidget(self.content_container)
         self.glavni_splitter.setStretchFactor(0, 15)
         self.glavni_splitter.setStretchFactor(1, 85)
@@ -208,6 +337,64 @@ class BalkanMDViewer(QMainWindow):
         # Trenutni sadržaj
         self.trenutni_sadrzaj = ""
 
+        # Outline: toc_tokens zadnjeg renderovanja + inkrementalni indeks naslova iz editora
+        self._toc_tokens = []
+        self.outline_index = HeadingIndex(self.editor.document())
+        self.outline_dock = OutlinePanel(_t("outline"), self)
+        self.outline_dock.heading_activated.connect(self._jump_to_heading)
+        self.outline_dock.visibilityChanged.connect(
+            lambda visible: visible and self._refresh_outline()
+        )
+        self.addDockWidget(Qt.RightDockWidgetArea, self.outline_dock)
+        self.outline_dock.hide()
+        self.outline_action = self.outline_dock.toggleViewAction()
+        self.outline_action.setText(_t("outline"))
+        self.outline_action.setShortcut("Ctrl+Shift+O")
+        self.view_menu.addAction(self.outline_action)
+        self.outline_timer = QTimer(self)
+        self.outline_timer.setSingleShot(True)
+        self.outline_timer.timeout.connect(self._refresh_outline)
+
+        # Backlinks: graf linkova workspace-a (gradi se u pozadini kad se panel prvi put otvori)
+        self.link_graph = LinkGraph()
+        self.path_index = PathIndex()
+        self.quick_open_dialog = None
+        self.quick_open_timer = QTimer(self)
+        self.quick_open_timer.setSingleShot(True)
+        self.quick_open_timer.timeout.connect(lambda: self.quick_open_dialog.osvjezi())
+        self.workspace = None
+        # Folder izabran kroz "Promijeni folder"; bez njega workspace je folder otvorenog fajla
+        self.workspace_folder = None
+        self.backlinks_dock = BacklinksPanel(_t("backlinks"), self)
+        self.backlinks_dock.file_activated.connect(lambda path: self.ucitaj_fajl(path))
+        self.backlinks_dock.visibilityChanged.connect(
+            lambda visible: visible and self._refresh_backlinks()
+        )
+        self.addDockWidget(Qt.RightDockWidgetArea, self.backlinks_dock)
+        self.tabifyDockWidget(self.outline_dock, self.backlinks_dock)
+        self.backlinks_dock.hide()
+        self.backlinks_action = self.backlinks_dock.toggleViewAction()
+        self.backlinks_action.setText(_t("backlinks"))
+        self.backlinks_action.setShortcut("Ctrl+Shift+K")
+        self.view_menu.addAction(self.backlinks_action)
+        self.backlinks_timer = QTimer(self)
+        self.backlinks_timer.setSingleShot(True)
+        self.backlinks_timer.timeout.connect(self._refresh_backlinks)
+
+        # Provjera linkova (dock se popunjava iz LinkCheckThread-a)
+        self.linkcheck_thread = None
+        self.linkcheck_dock = LinkCheckPanel(
+            _t("check_links"),
+            [_t("lc_col_file"), _t("lc_col_line"), _t("lc_col_link"), _t("lc_col_problem")],
+            self,
+        )
+        self.linkcheck_dock.problem_activated.connect(self._open_at_line)
+        self.addDockWidget(Qt.BottomDockWidgetArea, self.linkcheck_dock)
+        self.linkcheck_dock.hide()
+
+        # Red za PDF export (kreira se pri prvom exportu)
+        self.pdf_queue = None
+
         # Postavke
         self.settings = ucitaj_postavke()
 
@@ -218,6 +405,15 @@ class BalkanMDViewer(QMainWindow):
         self.default_zoom_val = self.settings.get("default_zoom", 1.0)
         self.default_editor = self.settings.get("default_editor", "xdg-open")
         self.recent_files = self.settings.get("recent_files", [])
+        self.show_render_timings_val = self.settings.get("show_render_timings", False)
+        self.preview_server_val = self.settings.get("preview_server", True)
+        self.prefetch_val = self.settings.get("prefetch", True)
+        self.live_val = self.settings.get("live_preview", False)
+        self.remember_position_val = self.settings.get("remember_position", True)
+        self.prefetcher.ukljucen = self.prefetch_val
+        self.render_watchdog.budzet = self.settings.get("render_budget", BUDZET)
+        self.render_cache.engine = self.settings.get("render_engine", PODRAZUMIJEVANI_ENGINE)
+        self.render_watchdog.pokreni()
 
         # Primijeni zoom iz postavki (override hardkodiranog 1.0)
         self.pregledac.setZoomFactor(self.default_zoom_val)
@@ -229,17 +425,31 @@ class BalkanMDViewer(QMainWindow):
         sidebar_visible = self.settings.get("sidebar_visible", True)
         sidebar_width = self.settings.get("sidebar_width", 250)
         if sidebar_visible:
-            self.tree_view.show()
+            self.sidebar.show()
         else:
-            self.tree_view.hide()
+            self.sidebar.hide()
+        if self.settings.get("outline_visible", False):
+            self.outline_dock.show()
+        if self.settings.get("backlinks_visible", False):
+            self.backlinks_dock.show()
         # Postavi širinu splitter-a tek kad je window prikazan
         QTimer.singleShot(0, lambda: self.glavni_splitter.setSizes([sidebar_width, self.width() - sidebar_width]))
 
         # Keyboard shortcuts
         self._setup_shortcuts()
 
-        # Word count signal
-        self.editor.textChanged.connect(self._update_word_count)
+        self.editor.document().modificationChanged.connect(self._update_window_title)
+        # Izmjene editora idu kroz jedan dispatcher: tačne delte odmah, brojanje riječi i
+        # outline kad kucanje zastane, pregled kroz adaptivni debounce — sve sa opsezima
+        # promijenjenih linija umjesto cijelog teksta
+        self.brojac_rijeci = BrojacRijeci()
+        self.izmjene = ChangeDispatcher(self.editor.document(), self.split_debounce, self)
+        self.izmjene.pretplati(ODMAH, self._on_contents_change)
+        self.izmjene.pretplati(MIROVANJE, self._na_mirovanju)
+        self.izmjene.pretplati(
+            DEBOUNCE, self._split_preview_update,
+            kad=lambda: self.split_mode and not self.live_preview.aktivan,
+        )
 
         # Početni ekran
         self.osvjezi_pregled(self._pocetni_ekran())
@@ -248,6 +458,11 @@ class BalkanMDViewer(QMainWindow):
         if pocetni_fajl and os.path.isfile(pocetni_fajl):
             # Malo zakasni da se prozor prvo renderuje
             QTimer.singleShot(100, lambda: self.ucitaj_fajl(pocetni_fajl))
+        else:
+            # Nesačuvane izmjene iz prethodne sesije — ucitaj_fajl nudi oporavak
+            na_cekanju = journali_na_cekanju()
+            if na_cekanju:
+                QTimer.singleShot(100, lambda: self.ucitaj_fajl(na_cekanju[0]))
 
     def _pocetni_ekran(self):
         """Returns markdown for the welcome screen."""
@@ -290,11 +505,24 @@ class BalkanMDViewer(QMainWindow):
         reload_action.triggered.connect(self.reload_trenutni_fajl)
         file_menu.addAction(reload_action)
 
+        quick_open_action = QAction(_t("quick_open"), self)
+        quick_open_action.setShortcut("Ctrl+P")
+        quick_open_action.triggered.connect(self.quick_open)
+        file_menu.addAction(quick_open_action)
+
         export_pdf_action = QAction(_t("export_pdf"), self)
         export_pdf_action.setShortcut("Ctrl+Shift+E")
         export_pdf_action.triggered.connect(self.export_pdf)
         file_menu.addAction(export_pdf_action)
 
+        export_folder_pdf_action = QAction(_t("export_folder_pdf"), self)
+        export_folder_pdf_action.triggered.connect(self.export_folder_pdf)
+        file_menu.addAction(export_folder_pdf_action)
+
+        check_links_action = QAction(_t("check_links"), self)
+        check_links_action.triggered.connect(self.check_links)
+        file_menu.addAction(check_links_action)
+
         file_menu.addSeparator()
 
         folder_action = QAction(_t("change_folder"), self)
@@ -313,6 +541,7 @@ class BalkanMDViewer(QMainWindow):
 
         # ===== PREGLED MENI =====
         view_menu = menubar.addMenu(_t("menu_view"))
+        self.view_menu = view_menu
 
         zoom_in = QAction(_t("zoom_in"), self)
         zoom_in.setShortcut(QKeySequence.ZoomIn)
@@ -664,40 +893,70 @@ class BalkanMDViewer(QMainWindow):
     # ===== WORD COUNT =====
 
     def _update_word_count(self):
-        if self.edit_mode:
-            tekst = self.editor.toPlainText()
+        if self.edit_mode or self.split_mode:
+            # Brojač prati editor po linijama — pokupi samo izmjene koje još čekaju
+            self.izmjene.isprazni(MIROVANJE)
+            duzina = self.editor.document().characterCount() - 1
+            words = self.brojac_rijeci.ukupno
         else:
-            tekst = self.trenutni_sadrzaj
-        if not tekst.strip():
+            duzina = len(self.trenutni_sadrzaj)
+            words = None
+        if je_obican_tekst(self.trenutni_fajl) and duzina > TEKST_STRANICA:
+            # Logovi: vrijeme čitanja nema smisla, a brojanje bi koštalo koliko i prikaz
             self.word_count_label.hide()
             return
-        words = len(re.findall(r'\S+', tekst))
-        minutes = max(1, round(words / 200))
+        if words is None:
+            words = izbroj_rijeci(self.trenutni_sadrzaj)
+        if not words:
+            self.word_count_label.hide()
+            return
+        minutes = minute_citanja(words)
         self.word_count_label.setText(_t("word_count", words=words, minutes=minutes))
         self.word_count_label.show()
 
     # ===== PDF EXPORT =====
 
+    def _pdf_queue(self):
+        """Lazy kreiranje reda za PDF export (offscreen stranice, ne živi pregled)"""
+        if self.pdf_queue is None:
+            self.pdf_queue = PdfExportQueue(
+                self.css_stil, self.settings.get("pdf_concurrency", 2), self
+            )
+            self.pdf_queue.progress.connect(self._on_pdf_progress)
+            self.pdf_queue.finished.connect(self._on_pdf_finished)
+        return self.pdf_queue
+
     def export_pdf(self):
         if not self.trenutni_fajl:
             return
         default = str(Path(self.trenutni_fajl).with_suffix('.pdf'))
         path, _ = QFileDialog.getSaveFileName(self, _t("export_pdf"), default, "PDF (*.pdf)")
         if path:
-            try:
-                self.pregledac.page().pdfPrintingFinished.disconnect(self._on_pdf_done)
-            except RuntimeError:
-                pass
-            self.pregledac.page().pdfPrintingFinished.connect(self._on_pdf_done)
-            self.pregledac.page().printToPdf(path)
+            # U edit/split modu exportuj ono što je u editoru, i nesačuvano
+            tekst = self.editor.toPlainText() if (self.edit_mode or self.split_mode) else self.trenutni_sadrzaj
+            self._pdf_queue().dodaj(self.trenutni_fajl, path, tekst)
 
-    def _on_pdf_done(self, path, ok):
-        try:
-            self.pregledac.page().pdfPrintingFinished.disconnect(self._on_pdf_done)
-        except RuntimeError:
-            pass
-        if ok:
-            self.status_bar.showMessage(_t("status_pdf_saved", path=path))
+    def export_folder_pdf(self):
+        """Batch export: svi markdown fajlovi iz foldera, PDF pored svakog fajla"""
+        folder = QFileDialog.getExistingDirectory(
+            self, _t("export_folder_pdf"), self.file_model.rootPath() or QDir.homePath()
+        )
+        if not folder:
+            return
+        broj = self._pdf_queue().dodaj_folder(folder)
+        if not broj:
+            self.status_bar.showMessage(_t("status_pdf_none", path=folder))
+
+    def _on_pdf_progress(self, done, total, path, ms, ok):
+        kljuc = "status_pdf_progress" if ok else "status_pdf_failed"
+        self.status_bar.showMessage(
+            _t(kljuc, done=done, total=total, name=os.path.basename(path), ms=round(ms))
+        )
+
+    def _on_pdf_finished(self, ok, total):
+        if total == 1 and ok == 1:
+            return  # poruka iz _on_pdf_progress je dovoljna
+        self.status_bar.showMessage(_t("status_pdf_batch_done", ok=ok, total=total))
 
     # ===== SPLIT VIEW =====
 
@@ -713,9 +972,15 @@ class BalkanMDViewer(QMainWindow):
         if not self.edit_mode and self.trenutni_fajl:
             try:
                 with open(self.trenutni_fajl, "r", encoding="utf-8") as f:
-                    self.editor.setPlainText(f.read())
+                    content = f.read()
+                self.editor.setPlainText(content)
+                self.editor.document().setModified(False)
+                self._sacuvani_otisak = _otisak(content)
+                self.journal.zapocni(self.trenutni_fajl, content)
             except Exception:
                 pass
+        # Pregled je u split modu uvijek vidljiv — ne smije ostati zamrznut
+        self._resume_preview()
         self.split_splitter = QSplitter(Qt.Horizontal)
         # Reparent editor_panel and pregledac
         self.editor_panel.setParent(self.split_splitter)
@@ -734,24 +999,28 @@ class BalkanMDViewer(QMainWindow):
         ))
         # Ukloni Ctrl+B sa sidebar akcije da nema konflikta s bold prečicom u editoru
         self.toggle_sidebar_action.setShortcut("")
-        self._split_text_changed_conn = self.editor.textChanged.connect(
-            lambda: self.split_timer.start(400)
-        )
+        if self.live_val and self.trenutni_fajl:
+            self.osvjezi_pregled(self.editor.toPlainText(), zadrzi_scroll=True)
         self.split_action.setText(_t("btn_single"))
 
     def _exit_split_mode(self):
-        # Disconnect live-update
-        try:
-            self.editor.textChanged.disconnect(self._split_text_changed_conn)
-        except Exception:
-            pass
-        # Save editor content
+        # Live stranica se zamjenjuje punim Python renderom
+        bio_live = self.live_preview.aktivan
+        self.live_preview.zaustavi()
+        # Save editor content (samo ako je stvarno izmijenjen)
+        promijenjeno = False
         if self.trenutni_fajl:
             try:
-                with open(self.trenutni_fajl, "w", encoding="utf-8") as f:
-                    f.write(self.editor.toPlainText())
-            except Exception:
-                pass
+                promijenjeno = self._snimi_editor()
+                self.journal.zavrsi()
+            except Exception as e:
+                self._zadrzi_journal()
+                QMessageBox.critical(
+                    self, _t("dlg_error"), _t("msg_save_err", err=str(e))
+                )
+            content = self.editor.toPlainText()
+            promijenjeno = promijenjeno or content != self.trenutni_sadrzaj
+            self.trenutni_sadrzaj = content
         # Re-attach widgets to content_container (setChildren resetuje na preview stanje)
         self.content_container.setChildren(self.pregledac, self.editor_panel)
         self.glavni_splitter.replaceWidget(1, self.content_container)
@@ -768,22 +1037,59 @@ class BalkanMDViewer(QMainWindow):
             self.edit_mode = False
             self.edit_toggle_action.setText(_t("btn_edit"))
             self.toggle_sidebar_action.setShortcut("Ctrl+B")
-        # Refresh preview
-        if self.trenutni_fajl:
+        # Refresh preview — pregled već prikazuje tekst editora osim ako debounce još čeka
+        if self.trenutni_fajl and (promijenjeno or bio_live or self.split_debounce.na_cekanju()):
+            self.split_debounce.otkazi()
             self.reload_trenutni_fajl()
 
-    def _split_preview_update(self):
+    def _split_preview_update(self, promjene=None):
+        # Python pipeline renderuje cijeli tekst; opsezi su bitni samo live pregledu
         tekst = self.editor.toPlainText()
-        self.osvjezi_pregled(tekst)
+        self.osvjezi_pregled(tekst, zadrzi_scroll=True)
 
     # ===== SIDEBAR =====
 
+    def _tree_index(self, putanja):
+        """Indeks putanje u tree view-u (kroz facet proxy)"""
+        return self.tree_proxy.mapFromSource(self.file_model.index(putanja))
+
+    def _aktiviraj_facete(self):
+        """Prvo otvaranje liste faceta: učitaj indeks i uključi front matter analizator"""
+        if not self.meta_index.ucitan:
+            self.meta_index.ucitaj()
+        workspace = self._workspace_indexer()
+        workspace.dodaj_analizator("frontmatter", frontmatter_analizator(self.meta_index.kes()))
+        self._refresh_facets()
+
+    def _refresh_facets(self):
+        root = self.workspace.root if self.workspace else None
+        self.facet_bar.postavi_polja(self.meta_index.polja(root))
+        polje, vrijednost = self.facet_bar.trenutno()
+        if polje:
+            self.facet_bar.postavi_vrijednosti(self.meta_index.vrijednosti(polje, root))
+        self._primijeni_facet_filter(*self.facet_bar.trenutno())
+
+    def _primijeni_facet_filter(self, polje, vrijednost):
+        """Filter drveta iz indeksa (bez čitanja fajlova); prazno polje = bez filtera"""
+        root = self.workspace.root if self.workspace else None
+        if polje and polje != self._facet_polje:
+            self._facet_polje = polje
+            self.facet_bar.postavi_vrijednosti(self.meta_index.vrijednosti(polje, root))
+            vrijednost = self.facet_bar.trenutno()[1]
+        self._facet_polje = polje
+        if not polje:
+            self.tree_proxy.postavi_dozvoljene(None)
+            return
+        putanje = self.meta_index.fajlovi(polje, vrijednost or None, root)
+        self.tree_proxy.postavi_dozvoljene(putanje)
+        self.status_bar.showMessage(_t("status_facet_filter", count=len(putanje)), 3000)
+
     def toggle_sidebar(self):
         """Prikazuje/sakriva sidebar"""
-        if self.tree_view.isVisible():
-            self.tree_view.hide()
+        if self.sidebar.isVisible():
+            self.sidebar.hide()
         else:
-            self.tree_view.show()
+            self.sidebar.show()
 
     def edit_file(self):
         """Toggle edit mode umjesto otvaranja u eksternom editoru"""
@@ -829,8 +1135,11 @@ class BalkanMDViewer(QMainWindow):
 
         self.edit_mode = True
 
-        # Učitaj sadržaj u editor
-        self.editor.setPlainText(self.trenutni_sadrzaj)
+        # Učitaj sadržaj u editor (u split modu editor već ima najnoviji tekst)
+        if not (self.split_mode and self.editor.document().isModified()):
+            self.editor.setPlainText(self.trenutni_sadrzaj)
+            self.editor.document().setModified(False)
+            self.journal.zapocni(self.trenutni_fajl, self.trenutni_sadrzaj)
 
         # Pauziraj file watcher
         if self.trenutni_fajl:
@@ -844,9 +1153,9 @@ class BalkanMDViewer(QMainWindow):
         self.edit_toggle_action.setText(_t("btn_preview"))
         self.toggle_sidebar_action.setShortcut("")
 
-        # Animiraj prelaz (only if not split mode)
+        # Animiraj prelaz (only if not split mode); skriveni pregled se zamrzava
         if not self.split_mode:
-            self.content_container.slideTo('editor')
+            self.content_container.slideTo('editor', self._freeze_preview)
         self.status_bar.showMessage(_t("status_edit", name=os.path.basename(self.trenutni_fajl)))
 
     def prebaci_u_preview(self):
@@ -855,14 +1164,17 @@ class BalkanMDViewer(QMainWindow):
 
         # Sačuvaj sadržaj
         content = self.editor.toPlainText()
+        promijenjeno = content != self.trenutni_sadrzaj
         self.trenutni_sadrzaj = content
 
-        # Sačuvaj na disk
+        # Sačuvaj na disk samo ako je dokument izmijenjen
         if self.trenutni_fajl:
             try:
-                with open(self.trenutni_fajl, 'w', encoding='utf-8') as f:
-                    f.write(content)
+                self._snimi_editor()
+                if not self.split_mode:
+                    self.journal.zavrsi()
             except Exception as e:
+                self._zadrzi_journal()
                 QMessageBox.critical(
                     self, _t("dlg_error"), _t("msg_save_err", err=str(e))
                 )
@@ -872,8 +1184,12 @@ class BalkanMDViewer(QMainWindow):
             self.file_watcher.addPath(self.trenutni_fajl)
             self.edit_paused_watcher = False
 
-        # Update preview
-        self.osvjezi_pregled(content)
+        # Odmrzni pregled prije renderovanja
+        self._resume_preview()
+
+        # Update preview (zamrznuti pregled već prikazuje neizmijenjen sadržaj)
+        if promijenjeno or self.split_mode:
+            self.osvjezi_pregled(content, zadrzi_scroll=True)
 
         # Update toolbar
         self.edit_toggle_action.setText(_t("btn_edit"))
@@ -892,16 +1208,117 @@ class BalkanMDViewer(QMainWindow):
             return
         try:
             content = self.editor.toPlainText()
-            with open(self.trenutni_fajl, 'w', encoding='utf-8') as f:
-                f.write(content)
+            upisano = self._snimi_editor()
             self.trenutni_sadrzaj = content
-            self.status_bar.showMessage(_t("status_saved", name=os.path.basename(self.trenutni_fajl)))
+            poruka = "status_saved" if upisano else "status_no_changes"
+            self.status_bar.showMessage(_t(poruka, name=os.path.basename(self.trenutni_fajl)))
             self._update_word_count()
         except Exception as e:
             QMessageBox.critical(
                 self, _t("dlg_error"), _t("msg_save_err", err=str(e))
             )
 
+    def _snimi_editor(self):
+        """
+        Upisuje tekst editora u trenutni fajl samo ako se razlikuje od zadnjeg
+        sačuvanog; vraća True ako je fajl upisan. Greške propušta pozivaocu.
+        """
+        doc = self.editor.document()
+        if not self.trenutni_fajl or not doc.isModified():
+            return False
+        content = self.editor.toPlainText()
+        otisak = _otisak(content)
+        if otisak == self._sacuvani_otisak:
+            # Izmjene su poništene (undo) — na disku je već isti sadržaj
+            doc.setModified(False)
+            if self.journal.aktivan:
+                self.journal.zapocni(self.trenutni_fajl, content)
+            return False
+        atomicno_sacuvaj(self.trenutni_fajl, content)
+        st = os.stat(self.trenutni_fajl)
+        # Watcher će javiti ovaj upis; on_file_changed ga prepoznaje po mtime/size
+        self._vlastiti_upis = (self.trenutni_fajl, st.st_mtime_ns, st.st_size)
+        self._sacuvani_otisak = otisak
+        doc.setModified(False)
+        if self.journal.aktivan:
+            # Sačuvani sadržaj je nova osnova journala
+            self.journal.zapocni(self.trenutni_fajl, content)
+        if self.workspace:
+            self.workspace.osvjezi_fajl(self.trenutni_fajl)
+        if self.preview_server:
+            self.preview_server.javi_promjenu(self.trenutni_fajl)
+        return True
+
+    def _on_contents_change(self, promjene):
+        """Izmjena -> delta u journalu i live pregledu (pozicije su UTF-16, kao u Qt-u)"""
+        (promjena,) = promjene
+        if not (self.journal.aktivan or self.live_preview.aktivan):
+            return
+        umetnuto = self.izmjene.tekst(promjena)
+        if self.live_preview.aktivan:
+            if self.editor.document().characterCount() - 1 > MAX_LIVE:
+                # Prevelik za DOM stranice — dispatcher ovu izmjenu već šalje u debounce
+                self.live_preview.zaustavi()
+            else:
+                self.live_preview.izmjena(promjena.pozicija, promjena.uklonjeno, umetnuto)
+        if self.journal.aktivan:
+            self.journal.dodaj(promjena.pozicija, promjena.uklonjeno, umetnuto)
+            if not self.journal_timer.isActive():
+                self.journal_timer.start(1000)
+
+    def _na_mirovanju(self, promjene):
+        """Kucanje je zastalo: prebroj samo promijenjene linije, osvježi outline ako je highlighter dirao blokove"""
+        self.brojac_rijeci.primijeni(promjene, self.izmjene.linije)
+        if self.edit_mode or self.split_mode:
+            self._update_word_count()
+        if self.editor.highlighter.dirty_range is not None:
+            self._refresh_outline()
+
+    def _isprazni_journal(self):
+        try:
+            self.journal.isprazni(self.editor.toPlainText)
+        except OSError as e:
+            self.status_bar.showMessage(_t("status_journal_err", err=e), 5000)
+
+    def _zadrzi_journal(self):
+        """Snimanje nije uspjelo ili se zatvara sa izmjenama — journal ostaje za oporavak"""
+        self.journal_timer.stop()
+        self._isprazni_journal()
+        self.journal.zavrsi(obrisi=False)
+
+    def _je_vlastiti_upis(self, path):
+        """Da li fajl na disku i dalje izgleda tačno kako ga je ostavio naš zadnji upis"""
+        if not self._vlastiti_upis or self._vlastiti_upis[0] != path:
+            return False
+        try:
+            st = os.stat(path)
+        except OSError:
+            return False
+        return (st.st_mtime_ns, st.st_size) == self._vlastiti_upis[1:]
+
+    def _update_window_title(self, *_):
+        if not self.trenutni_fajl:
+            return
+        izmijenjen = (self.edit_mode or self.split_mode) and self.editor.document().isModified()
+        oznaka = " •" if izmijenjen else ""
+        self.setWindowTitle(f"{APP_NAME} - {os.path.basename(self.trenutni_fajl)}{oznaka}")
+
+    # ===== PREVIEW LIFECYCLE =====
+
+    def _freeze_preview(self):
+        """Zamrzni skriveni pregled (timeri, animacije, JS) dok traje edit mod"""
+        if not self.edit_mode or self.split_mode or self.pregledac.isVisible():
+            return
+        page = self.pregledac.page()
+        if page.lifecycleState() == QWebEnginePage.LifecycleState.Active:
+            page.setLifecycleState(QWebEnginePage.LifecycleState.Frozen)
+
+    def _resume_preview(self):
+        """Vrati pregled u aktivno stanje"""
+        page = self.pregledac.page()
+        if page.lifecycleState() != QWebEnginePage.LifecycleState.Active:
+            page.setLifecycleState(QWebEnginePage.LifecycleState.Active)
+
     # ===== EDITOR FORMATTING AKCIJE =====
 
     def _wrap_selection(self, prefix, suffix=None):
@@ -1060,8 +1477,15 @@ class BalkanMDViewer(QMainWindow):
         if not self.trenutni_fajl:
             self.status_bar.showMessage(_t("msg_no_file_edit"))
             return
+        server = self._preview_server() if self.preview_server_val else None
+        if server:
+            QDesktopServices.openUrl(QUrl(server.url(self.trenutni_fajl)))
+            self.status_bar.showMessage(_t("status_preview_server", port=server.port))
+            return
+        self._renderuj_html(self.trenutni_sadrzaj, self._otvori_html_u_browseru, include_base=True)
+
+    def _otvori_html_u_browseru(self, html, _meta):
         try:
-            html = self._renderuj_html(self.trenutni_sadrzaj, include_base=True)
             tmp = tempfile.NamedTemporaryFile(
                 mode='w', suffix='.html', delete=False, encoding='utf-8'
             )
@@ -1074,6 +1498,17 @@ class BalkanMDViewer(QMainWindow):
                 self, _t("dlg_error"), _t("dlg_error") + f": {str(e)}"
             )
 
+    def _preview_server(self):
+        """Lokalni live-preview server (pokreće se pri prvom otvaranju u browseru)"""
+        if self.preview_server is None:
+            try:
+                self.preview_server = PreviewServer(self.css_stil, self.render_cache)
+            except OSError as e:
+                print(f"Preview server greška: {e}")
+                return None
+            self.preview_server.dozvoli(self.file_model.rootPath() or QDir.homePath())
+        return self.preview_server
+
     # ===== COPY / SELECT =====
 
     def copy_selected_text(self):
@@ -1180,15 +1615,30 @@ class BalkanMDViewer(QMainWindow):
 
         # Čekaj da se stranica renderuje, pa tek onda highlightuj via JS
         def run_highlight(ok):
-            self.pregledac.loadFinished.disconnect(run_highlight)
+            self.preview_buffer.pregled_spreman.disconnect(run_highlight)
             def show_result(count):
                 if count:
                     self.status_bar.showMessage(
                         _t("status_found", term=search_term, count=int(count))
                     )
+            if self._velike_tabele is not None:
+                # Redovi virtuelnih tabela nisu u DOM-u — tabela sa pogotkom se filtrira na pojam
+                self.pregledac.page().runJavaScript(
+                    f"nzTabeleTrazi({json.dumps(search_term)}, !document.querySelector('mark'))"
+                )
+            dugi = self._dugi_dokument
+            if dugi is not None:
+                # Većina sekcija nije u DOM-u — pogoci se broje u Pythonu, stranica
+                # označava sekcije kako se učitavaju
+                count, prva = dugi.trazi(search_term)
+                self.pregledac.page().runJavaScript(
+                    f"nzOznaci({json.dumps(re.escape(search_term))}, {json.dumps(prva)})"
+                )
+                show_result(count)
+                return
             self.pregledac.page().runJavaScript(js_code, show_result)
 
-        self.pregledac.loadFinished.connect(run_highlight)
+        self.preview_buffer.pregled_spreman.connect(run_highlight)
         # Renderuj čist markdown — bez injektiranja HTML-a u markdown source
         self.osvjezi_pregled(self.trenutni_sadrzaj)
         self.status_bar.showMessage(_t("status_searching", term=search_term))
@@ -1309,7 +1759,9 @@ class BalkanMDViewer(QMainWindow):
         )
         if folder:
             self.file_model.setRootPath(folder)
-            self.tree_view.setRootIndex(self.file_model.index(folder))
+            self.tree_view.setRootIndex(self._tree_index(folder))
+            self.workspace_folder = folder
+            self._azuriraj_workspace_root()
             self.status_bar.showMessage(_t("status_folder", path=folder))
 
     def otvori_fajl(self):
@@ -1329,6 +1781,10 @@ class BalkanMDViewer(QMainWindow):
             QMessageBox.warning(self, _t("dlg_error"), _t("msg_file_missing", path=putanja))
             return
 
+        # Pozicija fajla koji se napušta (linija editora još postoji)
+        if putanja != self.trenutni_fajl:
+            self._zapamti_poziciju()
+
         # Ako smo u edit modu, prebaci u preview
         if self.edit_mode:
             self.prebaci_u_preview()
@@ -1339,6 +1795,13 @@ class BalkanMDViewer(QMainWindow):
             self.istorija.append(putanja)
             self.istorija_index = len(self.istorija) - 1
 
+        # Split mod bez snimanja: izmjene prethodnog fajla ostaju u journalu
+        if self.journal.aktivan:
+            if self.editor.document().isModified():
+                self._zadrzi_journal()
+            else:
+                self.journal.zavrsi()
+
         # Ukloni stari fajl iz watchera
         if self.trenutni_fajl:
             try:
@@ -1346,31 +1809,45 @@ class BalkanMDViewer(QMainWindow):
             except Exception:
                 pass
 
+        self._vrati_sidro = None
+        if putanja != self.trenutni_fajl:
+            self.txt_stranica = 0
+            sidro = self.pozicije.sidro(putanja) if self.remember_position_val else None
+            if sidro:
+                self._vrati_sidro = (putanja, sidro)
+                self.txt_stranica = sidro.get("s", 0)
         self.trenutni_fajl = putanja
+        self._azuriraj_workspace_root()
 
         # Dodaj novi fajl u watcher
         self.file_watcher.addPath(putanja)
 
+        tracer.nova_mjera()
         try:
-            try:
-                with open(putanja, "r", encoding="utf-8") as f:
-                    content = f.read()
-                encoding_note = ""
-            except UnicodeDecodeError:
-                with open(putanja, "r", encoding="latin-1") as f:
-                    content = f.read()
-                encoding_note = " (latin-1)"
+            with tracer.span("read", path=putanja):
+                content, encoding = procitaj_tekst(putanja)
+            encoding_note = "" if encoding == "utf-8" else f" ({encoding})"
         except Exception as e:
             QMessageBox.warning(self, _t("dlg_error"), _t("msg_read_err", err=e))
             return
+        tracer.zadrzi()
 
         self.trenutni_sadrzaj = content
+        self._sacuvani_otisak = _otisak(content)
+        if self.split_mode:
+            # Editor u split modu mora pratiti otvoreni fajl
+            self.editor.setPlainText(content)
+            self.editor.document().setModified(False)
+            self.journal.zapocni(putanja, content)
+            self.split_debounce.otkazi()
+            if self._vrati_sidro and "l" in self._vrati_sidro[1]:
+                self._editor_to_block(self._vrati_sidro[1]["l"])
         self.osvjezi_pregled(content)
-        self.setWindowTitle(f"{APP_NAME} - {os.path.basename(putanja)}")
+        self._update_window_title()
         self.status_bar.showMessage(_t("status_loaded", path=putanja + encoding_note))
 
         # Expand i selektuj fajl u tree view
-        index = self.file_model.index(putanja)
+        index = self._tree_index(putanja)
         if index.isValid():
             self.tree_view.setCurrentIndex(index)
             self.tree_view.scrollTo(index)
@@ -1381,10 +1858,35 @@ class BalkanMDViewer(QMainWindow):
         # Update recent files and word count on successful load
         self._update_recent_files(putanja)
         self._update_word_count()
+        self.backlinks_timer.start(0)
+
+        self._ponudi_oporavak(putanja, content)
+
+    def _ponudi_oporavak(self, putanja, content):
+        """Ako journal ima nesačuvane izmjene ovog fajla, ponudi da se vrate u editor"""
+        oporavljeno = pronadji_oporavak(putanja, content)
+        if oporavljeno is None:
+            odbaci_journal(putanja)
+            return
+        odgovor = QMessageBox.question(
+            self, _t("dlg_recover"), _t("msg_recover", name=os.path.basename(putanja)),
+            QMessageBox.Yes | QMessageBox.No, QMessageBox.Yes,
+        )
+        if odgovor != QMessageBox.Yes:
+            odbaci_journal(putanja)
+            return
+        if not self.edit_mode:
+            self.prebaci_u_edit()
+        # Kao jedna izmjena: undo vraća sadržaj sa diska, a journal je odmah bilježi
+        cursor = QTextCursor(self.editor.document())
+        cursor.select(QTextCursor.Document)
+        cursor.insertText(oporavljeno)
+        self._isprazni_journal()
+        self.status_bar.showMessage(_t("status_recovered", name=os.path.basename(putanja)))
 
     def klik_na_fajl(self, index):
         """Handler za klik na fajl u tree view"""
-        putanja = self.file_model.filePath(index)
+        putanja = self.file_model.filePath(self.tree_proxy.mapToSource(index))
         if os.path.isfile(putanja):
             ext = os.path.splitext(putanja)[1].lower()
             if ext in [".md", ".markdown", ".mdown", ".txt"]:
@@ -1392,143 +1894,466 @@ class BalkanMDViewer(QMainWindow):
 
     def on_file_changed(self, path):
         """Kad se fajl promijeni izvana, reload sa debounce"""
-        if path == self.trenutni_fajl and self.auto_refresh_val:
-            # Na Linux/inotify, atomično saveanje (temp→rename) automatski uklanja
-            # path iz watchera — trebamo ga dodati nazad
+        if self.workspace:
+            self.workspace.osvjezi_fajl(path)
+        if self.preview_server:
+            self.preview_server.javi_promjenu(path)
+        # Atomično snimanje (temp→rename, i naše) na Linux/inotify uklanja path iz
+        # watchera — vrati ga i kad je auto-refresh isključen
+        if path == self.trenutni_fajl and not self.edit_paused_watcher and os.path.exists(path):
             if path not in self.file_watcher.files():
                 self.file_watcher.addPath(path)
-            self.reload_timer.start(300)
+        if path == self.trenutni_fajl and self.auto_refresh_val:
+            # Naš vlastiti upis — pregled već prikazuje taj sadržaj
+            if self._je_vlastiti_upis(path):
+                return
+            self.reload_debounce.zakazi()
 
     def reload_trenutni_fajl(self):
         """Ponovo učitava trenutni fajl"""
         if self.trenutni_fajl and os.path.isfile(self.trenutni_fajl):
-            # Sačuvaj scroll poziciju
-            self.pregledac.page().runJavaScript(
-                "window.scrollY",
-                lambda scroll_pos: self._reload_with_scroll(scroll_pos),
-            )
+            self._reload_with_scroll()
         else:
+            self.reload_debounce.zavrseno()
             self.status_bar.showMessage(_t("reload"))
 
-    def _reload_with_scroll(self, scroll_pos):
+    def _reload_with_scroll(self):
         """Reload sa očuvanjem scroll pozicije"""
         try:
-            with open(self.trenutni_fajl, "r", encoding="utf-8") as f:
-                content = f.read()
+            tracer.nova_mjera()
+            with tracer.span("read", path=self.trenutni_fajl):
+                with open(self.trenutni_fajl, "r", encoding="utf-8") as f:
+                    content = f.read()
+            tracer.zadrzi()
 
             self.trenutni_sadrzaj = content
-            self.osvjezi_pregled(content)
-
-            # Vrati scroll poziciju nakon renderovanja
-            if scroll_pos:
-                QTimer.singleShot(
-                    100,
-                    lambda: self.pregledac.page().runJavaScript(
-                        f"window.scrollTo(0, {scroll_pos})"
-                    ),
-                )
+            self._sacuvani_otisak = _otisak(content)
+            # Scroll se prenosi na novu stranicu prije nego što je prikazana
+            self.osvjezi_pregled(content, zadrzi_scroll=True)
 
             self.status_bar.showMessage(_t("status_reloaded", name=os.path.basename(self.trenutni_fajl)))
         except Exception as e:
+            # Ništa se ne učitava — debounce ne smije čekati loadFinished
+            self.reload_debounce.zavrseno()
             self.status_bar.showMessage(_t("dlg_error") + f": {e}")
 
-    def _renderuj_html(self, tekst, include_base=False):
-        """Generiše kompletni HTML iz markdown teksta"""
-        try:
-            extensions = [
-                "fenced_code",
-                "tables",
-                "nl2br",
-                "toc",
-                "abbr",
-                "attr_list",
-                "def_list",
-                "footnotes",
-                "md_in_html",
-                "sane_lists",
-                "smarty",
-                "admonition",
-            ]
-
-            extension_configs = {}
+    def _renderuj_html(self, tekst, gotovo, include_base=False, stranica=None, kanal=None):
+        """
+        Generiše kompletni HTML iz markdown teksta (.txt: običan tekst, `stranica` ili sve)
+        i predaje ga u gotovo(html, meta). Markdown renderuje watchdog van GUI threada,
+        pa gotovo obično stiže kasnije; keširan i običan tekst odmah. Dugi dokument i
+        velike tabele pregleda se vraćaju u meta (dugi_dokument, velike_tabele).
+        """
+        base_url_tag = ""
+        if include_base and self.trenutni_fajl:
+            base_url_tag = f"<base href='file://{os.path.dirname(self.trenutni_fajl)}/'>"
 
-            try:
-                import pymdownx
-
-                extensions.extend(
-                    [
-                        "pymdownx.highlight",
-                        "pymdownx.superfences",
-                        "pymdownx.tasklist",
-                        "pymdownx.magiclink",
-                        "pymdownx.betterem",
-                        "pymdownx.tilde",
-                        "pymdownx.mark",
-                        "pymdownx.caret",
-                        "pymdownx.keys",
-                    ]
-                )
-                extension_configs.update(
-                    {
-                        "pymdownx.highlight": {
-                            "use_pygments": True,
-                            "guess_lang": True,
-                            "linenums": False,
-                            "css_class": "highlight",
-                        },
-                        "pymdownx.tasklist": {
-                            "custom_checkbox": True,
-                            "clickable_checkbox": False,
-                        },
-                    }
-                )
-            except ImportError:
-                pass
+        def sastavi(html_content, meta):
+            with tracer.span("html"):
+                gotovo(sastavi_html(html_content, self.css_stil, base_url_tag), meta)
+
+        if je_obican_tekst(self.trenutni_fajl):
+            with tracer.span("plaintext", bytes=len(tekst)):
+                html_content = self._tekst_html(tekst, stranica)
+            sastavi(html_content, {})
+            return
 
-            html_content = markdown.markdown(
-                tekst, extensions=extensions, extension_configs=extension_configs
+        folder = os.path.dirname(self.trenutni_fajl) if self.trenutni_fajl else os.getcwd()
+        izvor, tabele = tekst, None
+        if not include_base:
+            # Zaglavlja velikih tabela su kratka — renderuju se ovdje, bez watchdoga
+            tekst, tabele = izdvoji_tabele(
+                tekst, folder, lambda t: self.render_cache.renderuj(t, nadzor=False),
+                store=self.section_store, tracer=tracer,
             )
 
-        except Exception as e:
-            html_content = f"""
-            <div style="color: #f85149; background: #21262d; padding: 16px; border-radius: 6px;">
-                <h3>Greška pri renderovanju</h3>
-                <pre>{str(e)}</pre>
-            </div>
-            <hr>
-            <pre>{tekst[:1000]}...</pre>
-            """
+        def stiglo(html_content, meta):
+            tabele_ = tabele
+            if meta["profil"] == "tekst" and tekst is not izvor:
+                # Watchdog je odustao od markdowna — izvor bez oznaka tabela
+                html_content, tabele_ = renderuj_tekst(izvor), None
+            html_content = dovrsi_body(
+                html_content, folder, tabele_, pregled=not include_base,
+                meta=meta, store=self.section_store, tracer=tracer,
+            )
+            sastavi(html_content, meta)
 
-        base_url_tag = ""
-        if include_base and self.trenutni_fajl:
-            base_url_tag = f"<base href='file://{os.path.dirname(self.trenutni_fajl)}/'>"
+        self.render_cache.zatrazi(
+            tekst, lambda body, meta: self.render_stigao.emit(stiglo, (body, meta)),
+            tracer=tracer, kanal=kanal,
+        )
+
+    def _base_url(self):
+        """Base URL pregleda za relativne linkove"""
+        if self.trenutni_fajl:
+            return QUrl.fromLocalFile(os.path.dirname(self.trenutni_fajl) + '/')
+        return QUrl()
 
-        return f"""<!DOCTYPE html>
-<html>
-<head>
-    <meta charset="utf-8">
-    {base_url_tag}
-    {self.css_stil}
-</head>
-<body>
-    {html_content}
-</body>
-</html>"""
-
-    def osvjezi_pregled(self, tekst=None):
-        """Renderuje markdown u HTML i prikazuje"""
+    def osvjezi_pregled(self, tekst=None, zadrzi_scroll=False):
+        """
+        Renderuje markdown u HTML i prikazuje (zadrzi_scroll: isti dokument, ista pozicija).
+        Ne čeka render: novi dokument se, ako rezultat kasni, do tada prikazuje kao običan
+        tekst; isti dokument ostaje prikazan kakav jeste.
+        """
         if tekst is None:
             tekst = self.trenutni_sadrzaj
+        self._render_broj += 1
+        broj = self._render_broj
+        self.privremeni_timer.stop()
+        self._privremeni_prikaz = False
+        if self._live_moguc(tekst):
+            self._prikazi_live(zadrzi_scroll)
+            return
+        self.live_preview.zaustavi()
+
+        self._render_mjerenje = (time.perf_counter(), len(tekst))
+        tracer.nova_mjera()
+        if not zadrzi_scroll:
+            # Pokreće se prije zahtjeva: keširan rezultat stiže odmah i zaustavlja ga
+            self._privremeni_tekst = tekst
+            self.privremeni_timer.start()
+        self._renderuj_html(
+            tekst, lambda html, meta: self._prikazi_render(broj, html, meta, zadrzi_scroll),
+            stranica=self.txt_stranica, kanal="pregled",
+        )
+
+    def _prikazi_render(self, broj, html, meta, zadrzi_scroll):
+        if broj != self._render_broj:
+            return
+        self.privremeni_timer.stop()
+        self._privremeni_prikaz = False
+        self._toc_tokens = meta.get("toc_tokens", [])
+        self._dugi_dokument = meta.get("dugi_dokument")
+        self._velike_tabele = meta.get("velike_tabele")
+        # Pojednostavljen render se javlja u status baru kad je pregled prikazan
+        self._profil_rendera = meta.get("profil", "puni")
+        self.outline_timer.start(0)
+
+        tracer.pocni("load")
+        with tracer.span("setHtml", bytes=len(html)):
+            self.preview_buffer.postavi_html(html, self._base_url(), zadrzi_scroll)
+
+    def _prikazi_privremeni(self):
+        """Render novog dokumenta kasni: običan tekst dok watchdog ne odgovori"""
+        self._privremeni_prikaz = True
+        self._dugi_dokument = self._velike_tabele = None
+        html = sastavi_html(renderuj_tekst(self._privremeni_tekst), self.css_stil)
+        self.preview_buffer.postavi_html(html, self._base_url(), False)
+        self.status_bar.showMessage(_t("status_rendering"))
+
+    def _live_moguc(self, tekst):
+        """Split view markdown fajla koji stane u live stranicu"""
+        return (
+            self.live_val and self.split_mode and self.trenutni_fajl is not None
+            and not je_obican_tekst(self.trenutni_fajl) and len(tekst) <= MAX_LIVE
+        )
 
-        html = self._renderuj_html(tekst)
+    def _prikazi_live(self, zadrzi_scroll):
+        """Isti dokument: stranica dobija tekst ponovo; inače se učitava nova (base URL fajla)"""
+        self._dugi_dokument = self._velike_tabele = None
+        self._profil_rendera = "puni"
+        if self.live_preview.aktivan and zadrzi_scroll:
+            self.live_preview.posalji_tekst()
+            # Bez učitavanja stranice nema ni loadFinished koji bi javio kraj refresha
+            self.split_debounce.zavrseno()
+            self.reload_debounce.zavrseno()
+            return
+        base_url = QUrl.fromLocalFile(os.path.dirname(self.trenutni_fajl) + '/')
+        self.live_preview.prikazi(sastavi_html(self.live_preview.html(), self.css_stil), base_url, zadrzi_scroll)
+
+    def _tekst_html(self, tekst, stranica=None):
+        """Običan tekst; veliki fajlovi se prikazuju stranicu po stranicu"""
+        if stranica is None:
+            return renderuj_tekst(tekst)
+        granice = stranice_teksta(tekst)
+        self.txt_stranica = stranica = min(stranica, len(granice) - 1)
+        pocetak, kraj = granice[stranica]
+        body = renderuj_tekst(tekst[pocetak:kraj])
+        if len(granice) == 1:
+            return body
+        linije_od = tekst.count("\n", 0, pocetak) + 1
+        linije_do = linije_od + tekst.count("\n", pocetak, kraj)
+        veze = []
+        for tekst_veze, cilj in (
+            (_t("txt_first"), 0), (_t("txt_prev"), stranica - 1),
+            (_t("txt_next"), stranica + 1), (_t("txt_last"), len(granice) - 1),
+        ):
+            if 0 <= cilj < len(granice) and cilj != stranica:
+                veze.append(f'<a href="nzpage:{cilj}">{tekst_veze}</a>')
+            else:
+                veze.append(f"<span>{tekst_veze}</span>")
+        opis = _t("txt_page", page=stranica + 1, pages=len(granice), first=linije_od, last=linije_do)
+        nav = f'<div class="nz-pages">{"".join(veze[:2])}<span>{opis}</span>{"".join(veze[2:])}</div>'
+        return nav + body + nav
+
+    def _idi_na_stranicu(self, stranica):
+        """Klik na nzpage: link u pregledu velikog .txt fajla"""
+        self.txt_stranica = max(0, stranica)
+        self.osvjezi_pregled(self.editor.toPlainText() if self.split_mode else None)
+
+    def _image_target_width(self):
+        """Širina u fizičkim pikselima koju slika u pregledu može zauzeti"""
+        return int(
+            self.pregledac.width()
+            * self.pregledac.zoomFactor()
+            * self.pregledac.devicePixelRatioF()
+        )
 
-        # Koristi base URL za relativne linkove
-        base_url = QUrl()
-        if self.trenutni_fajl:
-            base_url = QUrl.fromLocalFile(
-                os.path.dirname(self.trenutni_fajl) + '/'
+    def _on_preview_loaded(self, ok):
+        """loadFinished — zatvara 'load' span i osvježava readout u status baru"""
+        if self._privremeni_prikaz:
+            # Privremeni običan tekst: refresh traje dok ne stigne pravi render
+            return
+        debounce = self.split_debounce if self.split_mode else self.reload_debounce
+        tracer.zavrsi("load", ok=ok, debounce_ms=debounce.debounce_ms, max_wait_ms=debounce.max_ms)
+        if self._render_mjerenje is not None:
+            pocetak, velicina = self._render_mjerenje
+            self._render_mjerenje = None
+            self.trosak_rendera.zabiljezi((time.perf_counter() - pocetak) * 1000.0, velicina)
+        self.split_debounce.zavrseno()
+        self.reload_debounce.zavrseno()
+        self._update_render_timings()
+        if self._vrati_sidro:
+            putanja, sidro = self._vrati_sidro
+            self._vrati_sidro = None
+            if putanja == self.trenutni_fajl and "u" in sidro:
+                self.pregledac.page().runJavaScript(skripta_vracanja(sidro.get("h", ""), sidro["u"]))
+        if self._profil_rendera != "puni":
+            self.status_bar.showMessage(_t(
+                "status_render_" + self._profil_rendera, seconds=f"{self.render_watchdog.budzet:g}"
+            ))
+        self._zakazi_prefetch()
+
+    def _zakazi_prefetch(self):
+        """Kandidati za prefetch: lokalni .md linkovi dokumenta (redom), pa susjedi u drvetu"""
+        if not self.prefetch_val or self.edit_mode or self.split_mode or not self.trenutni_fajl:
+            self.prefetcher.zakazi([])
+            return
+        kandidati = []
+        if not je_obican_tekst(self.trenutni_fajl):
+            linkovi = izvuci_linkove(self.trenutni_sadrzaj, self.trenutni_fajl)
+            kandidati += sorted(linkovi, key=lambda cilj: linkovi[cilj][0])
+        index = self._tree_index(self.trenutni_fajl)
+        if index.isValid():
+            for red in (index.row() + 1, index.row() - 1):
+                susjed = index.siblingAtRow(red)
+                if susjed.isValid():
+                    kandidati.append(self.file_model.filePath(self.tree_proxy.mapToSource(susjed)))
+        self.prefetcher.zakazi([
+            p for p in kandidati
+            if p != self.trenutni_fajl and p.lower().endswith(MARKDOWN_EKSTENZIJE) and os.path.isfile(p)
+        ])
+
+    def _update_render_timings(self):
+        if not self.show_render_timings_val:
+            self.render_time_label.hide()
+            return
+        tekst = formatiraj_mjeru(tracer.zadnja_mjera)
+        if tekst:
+            # Izabrani debounce / najduže čekanje za sljedeći refresh
+            debounce = self.split_debounce if self.split_mode else self.reload_debounce
+            tekst += _t("render_debounce", ms=debounce.debounce_ms, max=debounce.max_ms)
+        self.render_time_label.setText(_t("render_timings", timings=tekst) if tekst else "")
+        self.render_time_label.setVisible(bool(tekst))
+
+    # ===== OUTLINE =====
+
+    def _refresh_outline(self):
+        """Primijeni prljave blokove na indeks naslova i osvježi outline panel"""
+        dirty = self.editor.highlighter.dirty_range
+        if dirty is not None:
+            self.editor.highlighter.dirty_range = None
+            self.outline_index.update(dirty)
+        if not self.outline_dock.isVisible():
+            return
+        if self.edit_mode or self.split_mode:
+            entries = editor_entries(self.outline_index, self._toc_tokens)
+        else:
+            entries = [(lvl, txt, anchor, -1) for lvl, txt, anchor in toc_entries(self._toc_tokens)]
+        self.outline_dock.set_entries(entries)
+
+    def _jump_to_heading(self, anchor, block_number):
+        """Skok na naslov: anchor u pregledu i/ili linija u editoru"""
+        preview_visible = self.split_mode or not self.edit_mode
+        if preview_visible and anchor:
+            # Dugi dokument: naslov je možda u sekciji koja još nije učitana
+            self.pregledac.page().runJavaScript(
+                f"if (window.nzScrollTo) nzScrollTo({json.dumps(anchor)}); else {{"
+                f"var e = document.getElementById({json.dumps(anchor)});"
+                "if (e) e.scrollIntoView({block: 'start'}); }"
+            )
+        if (self.edit_mode or self.split_mode) and block_number >= 0:
+            self._editor_to_block(block_number)
+
+    def _editor_to_block(self, block_number):
+        """Postavi kursor editora na početak bloka (linije) i centriraj ga"""
+        block = self.editor.document().findBlockByNumber(block_number)
+        if block.isValid():
+            self.editor.setTextCursor(QTextCursor(block))
+            self.editor.centerCursor()
+            self.editor.setFocus()
+
+    # ===== POZICIJA ČITANJA =====
+
+    def _zapamti_sidro_pregleda(self):
+        """Čita sidro prikazanog pregleda (naslov + udio) kad skrolovanje stane"""
+        if (
+            not self.trenutni_fajl or not self.remember_position_val
+            or self._vrati_sidro or self.preview_buffer.ucitava
+        ):
+            return
+        putanja = self.trenutni_fajl
+        self.pregledac.page().runJavaScript(
+            SKRIPTA_SIDRA, lambda r, putanja=putanja: self._sidro_procitano(putanja, r)
+        )
+
+    def _sidro_procitano(self, putanja, r):
+        if r:
+            self.pozicije.postavi(putanja, h=r[0] or None, u=round(r[1], 4))
+        else:
+            self.pozicije.postavi(putanja, h=None, u=None)
+        if putanja == self.trenutni_fajl:
+            self.pozicije.postavi(putanja, s=self.txt_stranica or None)
+
+    def _zapamti_poziciju(self):
+        """Pozicija trenutnog fajla prije napuštanja (drugi fajl ili zatvaranje)"""
+        if not self.trenutni_fajl or not self.remember_position_val:
+            return
+        if self.pozicija_timer.isActive():
+            # Skrolovano maloprije: stara stranica je još prikazana, sidro stiže asinhrono
+            self.pozicija_timer.stop()
+            self._zapamti_sidro_pregleda()
+        if self.edit_mode or self.split_mode:
+            sredina = QPoint(0, self.editor.viewport().height() // 2)
+            self.pozicije.postavi(
+                self.trenutni_fajl, l=self.editor.cursorForPosition(sredina).blockNumber()
+            )
+        self.pozicije.postavi(self.trenutni_fajl, s=self.txt_stranica or None)
+        self.pozicije.sacuvaj()
+
+    # ===== BACKLINKS =====
+
+    def _workspace_indexer(self):
+        """
+        Pravi workspace indekser pri prvom pozivu. Obilazak kreće tek kad postoji
+        root (izabrani folder ili folder otvorenog fajla) — nikad cijeli home.
+        """
+        if self.workspace is None:
+            self.workspace = WorkspaceIndexer(parent=self)
+            self.workspace.azurirano.connect(self._on_workspace_updated)
+            self.workspace.skenirano.connect(
+                lambda n: self.status_bar.showMessage(_t("status_workspace_indexed", count=n), 3000)
+            )
+            self._azuriraj_workspace_root()
+        return self.workspace
+
+    def _azuriraj_workspace_root(self):
+        """Root indeksa: izabrani folder, inače folder trenutnog fajla ako je van starog root-a"""
+        if self.workspace is None:
+            return
+        if self.workspace_folder:
+            root = self.workspace_folder
+        elif self.trenutni_fajl:
+            root = self.workspace.root
+            putanja = os.path.abspath(self.trenutni_fajl)
+            if not root or not putanja.startswith(root.rstrip(os.sep) + os.sep):
+                root = os.path.dirname(putanja)
+        else:
+            return
+        root = os.path.normpath(os.path.abspath(root))
+        if root != self.workspace.root:
+            self.path_index.postavi_root(root)
+            self.workspace.postavi_root(root)
+
+    def _on_workspace_updated(self, promjene, uklonjeni):
+        """Rezultati iz pozadinskog indeksera -> graf linkova i quick open indeks"""
+        facete = bool(uklonjeni and self.meta_index.ucitan)
+        for putanja in uklonjeni:
+            self.link_graph.ukloni(putanja)
+            self.path_index.ukloni(putanja)
+            self.meta_index.ukloni(putanja)
+        for putanja, vrijednosti in promjene.items():
+            self.path_index.dodaj(putanja)
+            if "links" in vrijednosti:
+                self.link_graph.postavi(putanja, vrijednosti["links"])
+            if "frontmatter" in vrijednosti:
+                self.meta_index.postavi(putanja, vrijednosti["frontmatter"])
+                facete = True
+        if facete:
+            self.facet_timer.start(300)
+        self.backlinks_timer.start(100)
+        if self.quick_open_dialog and self.quick_open_dialog.isVisible():
+            self.quick_open_timer.start(300)
+
+    def _refresh_backlinks(self):
+        if not self.backlinks_dock.isVisible():
+            return
+        workspace = self._workspace_indexer()
+        workspace.dodaj_analizator("links", linkovi_fajla)
+        backlinks = self.link_graph.backlinks(self.trenutni_fajl) if self.trenutni_fajl else []
+        self.backlinks_dock.set_backlinks(backlinks, workspace.root, _t("backlinks_none"))
+
+    # ===== QUICK OPEN =====
+
+    def quick_open(self):
+        """Ctrl+P: fuzzy pretraga fajlova workspace-a (indeks se puni u pozadini)"""
+        self._workspace_indexer()
+        for putanja in self.recent_files:
+            if os.path.isfile(putanja):
+                self.path_index.dodaj(putanja)
+        if self.quick_open_dialog is None:
+            self.quick_open_dialog = QuickOpenDialog(
+                self.path_index, _t("quick_open_placeholder"), self
+            )
+            self.quick_open_dialog.file_chosen.connect(lambda path: self.ucitaj_fajl(path))
+        self.quick_open_dialog.otvori(frecency_iz_recent(self.recent_files))
+
+    # ===== PROVJERA LINKOVA =====
+
+    def check_links(self):
+        """Provjeri linkove i slike u svim fajlovima workspace foldera (u pozadini)"""
+        if self.linkcheck_thread and self.linkcheck_thread.isRunning():
+            self.linkcheck_dock.show()
+            return
+        # Isti root kao workspace indekser; bez workspace-a se ne obilazi home
+        folder = self._workspace_indexer().root
+        if not folder:
+            self.status_bar.showMessage(_t("lc_no_workspace"), 5000)
+            return
+        self.linkcheck_thread = LinkCheckThread(folder, parent=self)
+        self.linkcheck_thread.napredak.connect(
+            lambda done, total: self.linkcheck_dock.set_status(
+                _t("lc_progress", done=done, total=total)
             )
-        self.pregledac.setHtml(html, base_url)
+        )
+        self.linkcheck_thread.gotovo.connect(
+            lambda problemi, folder=folder: self._on_links_checked(problemi, folder)
+        )
+        self.linkcheck_dock.set_status(_t("lc_progress", done=0, total="…"))
+        self.linkcheck_dock.show()
+        self.linkcheck_dock.raise_()
+        self.linkcheck_thread.start()
+
+    def _on_links_checked(self, problemi, folder):
+        razlozi = {
+            "missing_file": _t("lc_missing_file"),
+            "missing_image": _t("lc_missing_image"),
+            "missing_anchor": _t("lc_missing_anchor"),
+        }
+        self.linkcheck_dock.set_problemi(problemi, folder, razlozi)
+        poruka = _t("lc_done", count=len(problemi), folder=folder)
+        self.linkcheck_dock.set_status(poruka)
+        self.status_bar.showMessage(poruka)
+
+    def _open_at_line(self, putanja, linija):
+        """Otvori fajl u editoru na zadanoj liniji (1-based)"""
+        if putanja != self.trenutni_fajl:
+            self.ucitaj_fajl(putanja)
+            if putanja != self.trenutni_fajl:
+                return
+        if not self.edit_mode:
+            self.prebaci_u_edit()
+        self._editor_to_block(linija - 1)
 
     # ===== DRAG & DROP =====
 
@@ -1801,7 +2626,7 @@ class BalkanMDViewer(QMainWindow):
         sidebar_layout = QVBoxLayout()
 
         self.show_sidebar_check = QCheckBox(_t("settings_show_sidebar"))
-        self.show_sidebar_check.setChecked(self.tree_view.isVisible())
+        self.show_sidebar_check.setChecked(self.sidebar.isVisible())
         sidebar_layout.addWidget(self.show_sidebar_check)
 
         self.auto_hide_sidebar = QCheckBox(_t("settings_auto_hide"))
@@ -1835,6 +2660,53 @@ class BalkanMDViewer(QMainWindow):
         zoom_hbox.addWidget(self.default_zoom)
         preview_layout.addLayout(zoom_hbox)
 
+        self.show_render_timings = QCheckBox(_t("settings_render_timings"))
+        self.show_render_timings.setChecked(self.show_render_timings_val)
+        preview_layout.addWidget(self.show_render_timings)
+
+        self.preview_server_check = QCheckBox(_t("settings_preview_server"))
+        self.preview_server_check.setChecked(self.preview_server_val)
+        preview_layout.addWidget(self.preview_server_check)
+
+        self.prefetch_check = QCheckBox(_t("settings_prefetch"))
+        self.prefetch_check.setChecked(self.prefetch_val)
+        preview_layout.addWidget(self.prefetch_check)
+
+        self.live_check = QCheckBox(_t("settings_live_preview"))
+        self.live_check.setChecked(self.live_val)
+        preview_layout.addWidget(self.live_check)
+
+        self.remember_position_check = QCheckBox(_t("settings_remember_position"))
+        self.remember_position_check.setChecked(self.remember_position_val)
+        preview_layout.addWidget(self.remember_position_check)
+
+        engine_hbox = QHBoxLayout()
+        engine_hbox.addWidget(QLabel(_t("settings_render_engine")))
+        self.engine_combo = QComboBox()
+        for engine in ENGINES.values():
+            if engine.dostupan():
+                self.engine_combo.addItem(engine.naziv, engine.ime)
+            else:
+                self.engine_combo.addItem(_t("settings_engine_missing", name=engine.naziv), engine.ime)
+                self.engine_combo.model().item(self.engine_combo.count() - 1).setEnabled(False)
+        current_idx = self.engine_combo.findData(self.render_cache.engine)
+        if current_idx >= 0:
+            self.engine_combo.setCurrentIndex(current_idx)
+        engine_hbox.addWidget(self.engine_combo)
+        preview_layout.addLayout(engine_hbox)
+
+        budget_hbox = QHBoxLayout()
+        budget_hbox.addWidget(QLabel(_t("settings_render_budget")))
+        self.render_budget = QDoubleSpinBox()
+        self.render_budget.setRange(0.0, 60.0)
+        self.render_budget.setSingleStep(0.5)
+        self.render_budget.setDecimals(1)
+        self.render_budget.setSuffix(" s")
+        self.render_budget.setSpecialValueText(_t("settings_render_budget_off"))
+        self.render_budget.setValue(self.render_watchdog.budzet)
+        budget_hbox.addWidget(self.render_budget)
+        preview_layout.addLayout(budget_hbox)
+
         preview_group.setLayout(preview_layout)
         layout.addWidget(preview_group)
 
@@ -1866,12 +2738,29 @@ class BalkanMDViewer(QMainWindow):
         self.remember_sidebar_pos_val = self.remember_sidebar_pos.isChecked()
         self.auto_refresh_val = self.auto_refresh.isChecked()
         self.default_zoom_val = self.default_zoom.value()
+        self.show_render_timings_val = self.show_render_timings.isChecked()
+        self._update_render_timings()
+        self.preview_server_val = self.preview_server_check.isChecked()
+        self.prefetch_val = self.prefetcher.ukljucen = self.prefetch_check.isChecked()
+        self._zakazi_prefetch()
+        self.render_watchdog.budzet = self.render_budget.value()
+        self.remember_position_val = self.remember_position_check.isChecked()
+        if self.live_check.isChecked() != self.live_val:
+            self.live_val = self.live_check.isChecked()
+            if self.split_mode:
+                self.osvjezi_pregled(self.editor.toPlainText(), zadrzi_scroll=True)
+        if self.engine_combo.currentData() != self.render_cache.engine:
+            self.render_cache.engine = self.engine_combo.currentData()
+            if self.trenutni_fajl and not self.edit_mode:
+                self.osvjezi_pregled(
+                    self.editor.toPlainText() if self.split_mode else None, zadrzi_scroll=True
+                )
 
         # Sidebar visibility (show_sidebar_check takes immediate effect)
         if self.show_sidebar_check.isChecked():
-            self.tree_view.show()
+            self.sidebar.show()
         else:
-            self.tree_view.hide()
+            self.sidebar.hide()
 
         # Default zoom
         current_zoom = self.pregledac.zoomFactor()
@@ -1892,13 +2781,23 @@ class BalkanMDViewer(QMainWindow):
         return {
             "language": self.settings.get("language", "en"),
             "auto_hide_sidebar": getattr(self, "auto_hide_sidebar_val", False),
-            "sidebar_visible": self.tree_view.isVisible(),
+            "sidebar_visible": self.sidebar.isVisible(),
             "sidebar_width": sidebar_width,
             "remember_sidebar_pos": getattr(self, "remember_sidebar_pos_val", True),
             "auto_refresh": getattr(self, "auto_refresh_val", True),
             "default_zoom": getattr(self, "default_zoom_val", 1.0),
             "default_editor": getattr(self, "default_editor", "xdg-open"),
             "recent_files": getattr(self, "recent_files", []),
+            "show_render_timings": getattr(self, "show_render_timings_val", False),
+            "preview_server": getattr(self, "preview_server_val", True),
+            "prefetch": getattr(self, "prefetch_val", True),
+            "live_preview": getattr(self, "live_val", False),
+            "remember_position": getattr(self, "remember_position_val", True),
+            "render_budget": self.render_watchdog.budzet,
+            "render_engine": self.render_cache.engine,
+            "pdf_concurrency": self.settings.get("pdf_concurrency", 2),
+            "outline_visible": self.outline_dock.isVisible(),
+            "backlinks_visible": self.backlinks_dock.isVisible(),
         }
 
     # ===== CLOSE EVENT =====
@@ -1906,11 +2805,152 @@ class BalkanMDViewer(QMainWindow):
     def closeEvent(self, event):
         """Čuva postavke (uključujući širinu sidebara) pri zatvaranju prozora"""
         sacuvaj_postavke(self._collect_settings())
+        self._zapamti_poziciju()
+        # Nesačuvane izmjene ostaju u journalu i nude se pri sljedećem pokretanju
+        if self.journal.aktivan:
+            if self.editor.document().isModified():
+                self._zadrzi_journal()
+            else:
+                self.journal.zavrsi()
+        if self.workspace:
+            self.workspace.zaustavi()
+        self.meta_index.sacuvaj()
+        if self.preview_server:
+            self.preview_server.zaustavi()
+        self.prefetcher.zaustavi()
+        self.image_handler.zaustavi()
+        self.render_watchdog.zaustavi()
+        if self.linkcheck_thread and self.linkcheck_thread.isRunning():
+            self.linkcheck_thread.requestInterruption()
+            self.linkcheck_thread.wait()
         event.accept()
 
 
+def _parse_args(argv):
+    """Argumenti komandne linije (Qt-ove opcije se propuštaju dalje)"""
+    parser = argparse.ArgumentParser(prog="nzmdmaster", add_help=True)
+    parser.add_argument("fajl", nargs="?", help="Markdown file to open")
+    parser.add_argument(
+        "--trace", metavar="OUT.json",
+        help="write render-pipeline spans in Chrome trace-event format on exit",
+    )
+    parser.add_argument(
+        "--export-pdf", nargs="+", metavar="FILE_OR_DIR",
+        help="export markdown files (or whole folders) to PDF without opening the window",
+    )
+    parser.add_argument(
+        "--pdf-out", metavar="DIR",
+        help="output folder for --export-pdf (default: next to each file)",
+    )
+    parser.add_argument(
+        "--check-links", metavar="DIR",
+        help="report broken links, anchors and images in all markdown files under DIR",
+    )
+    parser.add_argument(
+        "--build", nargs=2, metavar=("SRC", "OUT"),
+        help="render all markdown files under SRC to HTML in OUT; "
+             "re-runs rebuild only pages whose sources or images changed",
+    )
+    parser.add_argument(
+        "--rebuild", action="store_true",
+        help="with --build: ignore the build manifest and render every page",
+    )
+    parser.add_argument(
+        "--jobs", type=int,
+        help="parallel jobs: documents --export-pdf prints at once (default: 2), "
+             "processes for --check-links and --build (default: CPU count)",
+    )
+    args, _ = parser.parse_known_args(argv)
+    return args
+
+
+def _export_pdf_cli(app, args):
+    """--export-pdf: isti red kao u GUI-ju, bez prozora; vraća exit kod"""
+    queue = PdfExportQueue(ucitaj_css(), args.jobs or 2)
+
+    # Zbir preko svih finished emisija — neuspjeh ranije serije ne smije nestati
+    rezultat = {"ok": 0, "total": 0, "greske": 0}
+
+    def progress(done, total, path, ms, ok):
+        status = "OK  " if ok else "FAIL"
+        print(f"[{done}/{total}] {status} {path}  ({ms:.0f} ms)", flush=True)
+        if not ok:
+            rezultat["greske"] += 1
+
+    def finished(ok, total):
+        rezultat["ok"] += ok
+        rezultat["total"] += total
+        app.quit()
+
+    queue.progress.connect(progress)
+    queue.finished.connect(finished)
+
+    for ulaz in args.export_pdf:
+        ulaz = os.path.abspath(ulaz)
+        if os.path.isdir(ulaz):
+            izlaz = os.path.join(args.pdf_out, os.path.basename(ulaz)) if args.pdf_out else None
+            queue.dodaj_folder(ulaz, izlaz, pokreni=False)
+        elif os.path.isfile(ulaz):
+            folder = args.pdf_out or os.path.dirname(ulaz)
+            ime = os.path.splitext(os.path.basename(ulaz))[0] + ".pdf"
+            queue.dodaj(ulaz, os.path.join(folder, ime), pokreni=False)
+        else:
+            print(f"Ne postoji: {ulaz}")
+            rezultat["greske"] += 1
+
+    # Tek kad je sve u redu — inače rana (sinhrona) greška završi "seriju" usred petlje
+    queue.pokreni()
+    if queue.aktivan():
+        app.exec()
+    if not rezultat["total"] or rezultat["greske"]:
+        return 1
+    return 0 if rezultat["ok"] == rezultat["total"] else 1
+
+
+def _check_links_cli(args):
+    """--check-links: ispisuje probleme kao putanja:linija; exit 1 ako ih ima"""
+    folder = os.path.abspath(args.check_links)
+    if not os.path.isdir(folder):
+        print(f"Ne postoji: {folder}")
+        return 2
+    problemi = provjeri_folder(folder, args.jobs)
+    for p in problemi:
+        print(f"{os.path.relpath(p.putanja, folder)}:{p.linija}: {p.razlog} {p.href}")
+    print(f"{len(problemi)} problem(s)", file=sys.stderr)
+    return 1 if problemi else 0
+
+
+def _build_cli(args):
+    """--build SRC OUT: inkrementalni build statičnog sajta; exit 2 ako SRC ne postoji"""
+    src, out = (os.path.abspath(p) for p in args.build)
+    if not os.path.isdir(src):
+        print(f"Ne postoji: {src}")
+        return 2
+
+    def napredak(done, total, rel):
+        print(f"[{done}/{total}] {rel}", flush=True)
+
+    r = izgradi(src, out, args.jobs, napredak, sve=args.rebuild)
+    print(
+        f"{r.izgradjeno} built, {r.nepromijenjeno} unchanged, {r.obrisano} removed "
+        f"({r.stranica} pages, {r.ms:.0f} ms)", file=sys.stderr,
+    )
+    return 0
+
+
 def main():
     """Entry point"""
+    args = _parse_args(sys.argv[1:])
+    if args.check_links:
+        sys.exit(_check_links_cli(args))
+    if args.build:
+        sys.exit(_build_cli(args))
+    if args.trace:
+        tracer.snimaj = True
+
+    # Custom scheme-ovi (nzimg:) moraju biti registrovani prije QApplication
+    registruj_sheme()
+
     # Load language from settings before building UI
     if os.path.isfile(SETTINGS_FILE):
         try:
@@ -1931,17 +2971,24 @@ def main():
     if icon_path.exists():
         app.setWindowIcon(QIcon(str(icon_path)))
 
+    if args.export_pdf:
+        sys.exit(_export_pdf_cli(app, args))
+
     # Provjeri da li je proslijeđen fajl kao argument
     pocetni_fajl = None
-    if len(sys.argv) > 1:
-        potencijalni_fajl = sys.argv[1]
-        if os.path.isfile(potencijalni_fajl):
-            pocetni_fajl = os.path.abspath(potencijalni_fajl)
+    if args.fajl and os.path.isfile(args.fajl):
+        pocetni_fajl = os.path.abspath(args.fajl)
 
     prozor = BalkanMDViewer(pocetni_fajl)
     prozor.show()
 
-    sys.exit(app.exec())
+    kod = app.exec()
+    if args.trace:
+        try:
+            tracer.sacuvaj(args.trace)
+        except OSError as e:
+            print(f"Greška pri čuvanju trace-a: {e}")
+    sys.exit(kod)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,147 @@
+"""
+Document outline: heading index kept up to date from the editor's syntax
+highlighter, plus the dockable outline panel.
+"""
+import re
+import html
+import bisect
+
+from markdown.extensions.toc import slugify, unique
+from PySide6.QtWidgets import QDockWidget, QTreeWidget, QTreeWidgetItem
+from PySide6.QtCore import Qt, Signal
+
+from syntax import heading_level
+
+_HEADING_MARKS = re.compile(r'^#{1,6}\s+|\s+#+\s*$')
+
+
+class HeadingIndex:
+    """
+    Block numbers of an editor document's headings, sorted.
+    update() re-reads the highlighter's heading state only inside the dirty
+    range; headings before it are kept and those after it shift by the change
+    in block count. No QTextBlock is kept between edits — after a deletion an
+    old handle can still look valid while pointing at a freed block.
+    """
+
+    def __init__(self, document):
+        self._document = document
+        self._brojevi = []
+        self._blokova = 0
+
+    def update(self, dirty_range):
+        prvi, od_kraja = dirty_range
+        blokova = self._document.blockCount()
+        zadnji = blokova - 1 - od_kraja
+        # Naslovi iza prljavog opsega: isti razmak od kraja, pomjeren broj
+        stari_zadnji = self._blokova - 1 - od_kraja
+        pomak = blokova - self._blokova
+        novi = []
+        block = self._document.findBlockByNumber(prvi)
+        while block.isValid() and block.blockNumber() <= zadnji:
+            if heading_level(block):
+                novi.append(block.blockNumber())
+            block = block.next()
+        self._brojevi = (
+            self._brojevi[:bisect.bisect_left(self._brojevi, prvi)]
+            + novi
+            + [n + pomak for n in self._brojevi[bisect.bisect_right(self._brojevi, stari_zadnji):]]
+        )
+        self._blokova = blokova
+
+    def entries(self):
+        """Lista (level, tekst, broj bloka) za sve naslove."""
+        rezultat = []
+        for n in self._brojevi:
+            block = self._document.findBlockByNumber(n)
+            rezultat.append((heading_level(block), _HEADING_MARKS.sub('', block.text()).strip(), n))
+        return rezultat
+
+
+def toc_entries(toc_tokens):
+    """Spljošti toc_tokens iz toc ekstenzije u listu (level, tekst, id)."""
+    rezultat = []
+
+    def obidji(tokens):
+        for t in tokens:
+            rezultat.append((t["level"], html.unescape(t["name"]), t["id"]))
+            obidji(t.get("children", []))
+
+    obidji(toc_tokens or [])
+    return rezultat
+
+
+def editor_entries(index, toc_tokens):
+    """
+    Naslovi iz editora sa anchor id-jevima. Ako se broj naslova poklapa sa
+    zadnjim renderom, id-jevi se uzimaju iz toc_tokens (tačni, uključujući
+    {#custom-id}); inače se računaju istim slugify/unique pravilom kao toc.
+    """
+    naslovi = index.entries()
+    toc = toc_entries(toc_tokens)
+    if len(toc) == len(naslovi):
+        return [(lvl, txt, toc[i][2], blk) for i, (lvl, txt, blk) in enumerate(naslovi)]
+    ids = set()
+    return [
+        (lvl, txt, unique(slugify(txt, '-'), ids), blk)
+        for lvl, txt, blk in naslovi
+    ]
+
+
+class OutlinePanel(QDockWidget):
+    """Dock sa stablom naslova; klik skače na anchor u pregledu i liniju u editoru."""
+
+    # anchor id, broj bloka u editoru (-1 ako nije poznat)
+    heading_activated = Signal(str, int)
+
+    def __init__(self, title, parent=None):
+        super().__init__(title, parent)
+        self.setObjectName("outline_dock")
+        self.tree = QTreeWidget()
+        self.tree.setHeaderHidden(True)
+        self.tree.setStyleSheet("""
+            QTreeWidget {
+                background-color: #0d1117;
+                color: #c9d1d9;
+                border: none;
+                font-size: 13px;
+            }
+            QTreeWidget::item {
+                padding: 2px;
+            }
+            QTreeWidget::item:hover {
+                background: #161b22;
+            }
+            QTreeWidget::item:selected {
+                background: #1f6feb;
+                color: white;
+            }
+        """)
+        self.tree.itemClicked.connect(self._on_item_clicked)
+        self.tree.itemActivated.connect(self._on_item_clicked)
+        self.setWidget(self.tree)
+        self._entries = None
+
+    def set_entries(self, entries):
+        """entries: lista (level, tekst, anchor, broj bloka); ne gradi stablo ponovo ako se ništa nije promijenilo."""
+        if entries == self._entries:
+            return
+        self._entries = entries
+        self.tree.setUpdatesEnabled(False)
+        self.tree.clear()
+        stack = []  # (level, item)
+        for level, tekst, anchor, block in entries:
+            while stack and stack[-1][0] >= level:
+                stack.pop()
+            parent = stack[-1][1] if stack else self.tree
+            item = QTreeWidgetItem(parent, [tekst])
+            item.setData(0, Qt.UserRole, anchor)
+            item.setData(0, Qt.UserRole + 1, block)
+            stack.append((level, item))
+        self.tree.expandAll()
+        self.tree.setUpdatesEnabled(True)
+
+    def _on_item_clicked(self, item, _column=0):
+        self.heading_activated.emit(
+            item.data(0, Qt.UserRole) or "", int(item.data(0, Qt.UserRole + 1))
+        )
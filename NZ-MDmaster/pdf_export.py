@@ -0,0 +1,142 @@
+"""
+Background PDF export through offscreen QWebEnginePages.
+Jobs go through a queue with a cap on concurrency, so the live preview stays
+free for reading or editing while documents print.
+"""
+import os
+import time
+import tempfile
+
+from PySide6.QtCore import QObject, QUrl, Signal
+from PySide6.QtWebEngineCore import QWebEnginePage
+
+from render import (
+    renderuj_markdown, renderuj_tekst, je_obican_tekst, sastavi_html, procitaj_tekst,
+    markdown_fajlovi,
+)
+from images import obradi_slike
+
+# QWebEnginePage.setHtml ne prima sadržaj veći od ~2 MB
+SETHTML_LIMIT = 1_900_000
+
+
+class PdfExportQueue(QObject):
+    """Red PDF exporta; svaki posao dobija svoj offscreen QWebEnginePage."""
+
+    # done, total, pdf path, ms, ok
+    progress = Signal(int, int, str, float, bool)
+    # ok count, total
+    finished = Signal(int, int)
+
+    def __init__(self, css_stil, max_istovremeno=2, parent=None):
+        super().__init__(parent)
+        self.css_stil = css_stil
+        self.max_istovremeno = max(1, int(max_istovremeno))
+        self._red = []
+        self._aktivni = {}
+        self._ukupno = 0
+        self._gotovo = 0
+        self._uspjesno = 0
+
+    def aktivan(self) -> bool:
+        return bool(self._red or self._aktivni)
+
+    def dodaj(self, md_putanja, pdf_putanja, tekst=None, pokreni=True):
+        """
+        Dodaje posao; `tekst` (npr. nesačuvan sadržaj editora) ima prednost nad fajlom.
+        pokreni=False samo stavlja posao u red — cijela serija kreće sa pokreni().
+        """
+        self._red.append((md_putanja, pdf_putanja, tekst))
+        self._ukupno += 1
+        if pokreni:
+            self._pokreni_sljedece()
+
+    def pokreni(self):
+        """Pokreće poslove iz reda (poslije dodaj(..., pokreni=False))."""
+        self._pokreni_sljedece()
+
+    def dodaj_folder(self, folder, izlazni_folder=None, pokreni=True) -> int:
+        """Dodaje sve markdown fajlove iz foldera; PDF ide pored fajla ili u izlazni_folder."""
+        fajlovi = markdown_fajlovi(folder)
+        for md in fajlovi:
+            if izlazni_folder:
+                rel = os.path.relpath(md, folder)
+                pdf = os.path.join(izlazni_folder, os.path.splitext(rel)[0] + ".pdf")
+            else:
+                pdf = os.path.splitext(md)[0] + ".pdf"
+            self.dodaj(md, pdf, pokreni=False)
+        if pokreni:
+            self._pokreni_sljedece()
+        return len(fajlovi)
+
+    def _pokreni_sljedece(self):
+        while self._red and len(self._aktivni) < self.max_istovremeno:
+            self._pokreni(*self._red.pop(0))
+        if not self._red and not self._aktivni and self._ukupno:
+            ok, ukupno = self._uspjesno, self._ukupno
+            self._ukupno = self._gotovo = self._uspjesno = 0
+            self.finished.emit(ok, ukupno)
+
+    def _pokreni(self, md_putanja, pdf_putanja, tekst):
+        start = time.perf_counter()
+        try:
+            if tekst is None:
+                tekst, _ = procitaj_tekst(md_putanja)
+            folder = os.path.dirname(os.path.abspath(md_putanja))
+            base_tag = f"<base href='{QUrl.fromLocalFile(folder + '/').toString()}'>"
+            if je_obican_tekst(md_putanja):
+                body = renderuj_tekst(tekst)
+            else:
+                # Bez lazy loadinga — print ne čeka slike izvan viewporta
+                body = obradi_slike(renderuj_markdown(tekst), folder, lazy=False)
+            html = sastavi_html(body, self.css_stil, base_tag)
+            os.makedirs(os.path.dirname(os.path.abspath(pdf_putanja)), exist_ok=True)
+        except Exception as e:
+            print(f"PDF export greška ({md_putanja}): {e}")
+            self._zavrsi(None, pdf_putanja, start, False)
+            return
+
+        page = QWebEnginePage(self)
+        posao = {"start": start, "pdf": pdf_putanja, "tmp": None}
+        self._aktivni[page] = posao
+
+        def on_load(ok, page=page):
+            if not ok:
+                self._zavrsi(page, pdf_putanja, start, False)
+                return
+            page.printToPdf(pdf_putanja)
+
+        page.loadFinished.connect(on_load)
+        page.pdfPrintingFinished.connect(
+            lambda path, ok, page=page: self._zavrsi(page, path, start, ok)
+        )
+
+        if len(html.encode("utf-8")) < SETHTML_LIMIT:
+            page.setHtml(html, QUrl.fromLocalFile(folder + "/"))
+        else:
+            # Veliki dokumenti idu preko privremenog fajla; <base> čuva relativne putanje
+            tmp = tempfile.NamedTemporaryFile(
+                mode="w", suffix=".html", delete=False, encoding="utf-8"
+            )
+            tmp.write(html)
+            tmp.close()
+            posao["tmp"] = tmp.name
+            page.load(QUrl.fromLocalFile(tmp.name))
+
+    def _zavrsi(self, page, pdf_putanja, start, ok):
+        if page is not None:
+            posao = self._aktivni.pop(page, None)
+            if posao is None:
+                return
+            if posao["tmp"]:
+                try:
+                    os.remove(posao["tmp"])
+                except OSError:
+                    pass
+            page.deleteLater()
+        ms = (time.perf_counter() - start) * 1000.0
+        self._gotovo += 1
+        if ok:
+            self._uspjesno += 1
+        self.progress.emit(self._gotovo, self._ukupno, pdf_putanja, ms, ok)
+        self._pokreni_sljedece()
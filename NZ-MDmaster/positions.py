@@ -0,0 +1,122 @@
+"""
+Reading positions — no Qt imports at module level.
+For every recently read file the place where reading stopped is kept as an
+anchor instead of pixels, so it survives zoom, window size and small edits:
+the id of the last heading above the top of the preview plus how far the
+reader was between it and the next heading, the editor line in Edit/Split
+mode, and the page of a paged .txt file. The store is a compact JSON file
+next to the settings; past MAX_POZICIJA files the least recently read ones
+are dropped.
+"""
+import os
+import json
+from collections import OrderedDict
+
+from journal import atomicno_sacuvaj
+from settings_mgr import SETTINGS_FILE
+
+POSITIONS_FILE = os.path.join(os.path.dirname(SETTINGS_FILE), "positions.json")
+MAX_POZICIJA = 500
+_VERZIJA = 1
+
+_NASLOVI = "h1[id],h2[id],h3[id],h4[id],h5[id],h6[id]"
+
+# [id naslova ili '', udio puta do sljedećeg naslova (ili kraja)]; null na vrhu dokumenta
+SKRIPTA_SIDRA = """(function () {
+    var y = window.scrollY;
+    if (y < 1) return null;
+    var naslovi = document.querySelectorAll('%s'), i = -1;
+    function vrh(e) { return e.getBoundingClientRect().top + y; }
+    for (var k = 0; k < naslovi.length && vrh(naslovi[k]) <= y + 1; k++) i = k;
+    var od = i >= 0 ? vrh(naslovi[i]) : 0;
+    var dokle = i + 1 < naslovi.length ? vrh(naslovi[i + 1]) : document.documentElement.scrollHeight;
+    return [i >= 0 ? naslovi[i].id : '', dokle > od ? Math.min(1, (y - od) / (dokle - od)) : 0];
+})()""" % _NASLOVI
+
+
+def skripta_vracanja(naslov: str, udio: float) -> str:
+    """JS koji skroluje na sidro; naslov u neučitanoj sekciji dugog dokumenta ide preko nzScrollTo."""
+    return """(function (id, udio) {
+    var h = id ? document.getElementById(id) : null;
+    if (id && !h) { if (window.nzScrollTo) nzScrollTo(id); return; }
+    function vrh(e) { return e.getBoundingClientRect().top + window.scrollY; }
+    var naslovi = Array.prototype.slice.call(document.querySelectorAll('%s'));
+    var i = h ? naslovi.indexOf(h) : -1;
+    var od = h ? vrh(h) : 0;
+    var dokle = i + 1 < naslovi.length ? vrh(naslovi[i + 1]) : document.documentElement.scrollHeight;
+    window.scrollTo(0, od + udio * (dokle - od));
+})(%s, %s)""" % (_NASLOVI, json.dumps(naslov), json.dumps(float(udio)))
+
+
+class ReadingPositions:
+    """
+    putanja -> sidro {"h": id naslova, "u": udio, "l": linija editora, "s": stranica .txt},
+    od najdavnije do najskorije čitanog (LRU).
+    """
+
+    def __init__(self, fajl: str = POSITIONS_FILE, maks: int = MAX_POZICIJA):
+        self.fajl = fajl
+        self.maks = maks
+        self._sidra = OrderedDict()
+        self.ucitan = False
+        self._izmijenjen = False
+
+    def __len__(self):
+        return len(self._sidra)
+
+    def ucitaj(self):
+        self.ucitan = True
+        try:
+            with open(self.fajl, "r", encoding="utf-8") as f:
+                podaci = json.load(f)
+        except (OSError, ValueError):
+            return
+        if podaci.get("v") != _VERZIJA:
+            return
+        # JSON objekat čuva redoslijed — posljednji je najskorije čitan
+        self._sidra = OrderedDict(
+            (putanja, sidro) for putanja, sidro in podaci.get("fajlovi", {}).items()
+            if isinstance(sidro, dict)
+        )
+
+    def sidro(self, putanja: str):
+        """Sidro fajla (ili None); fajl postaje najskorije čitan."""
+        if not self.ucitan:
+            self.ucitaj()
+        sidro = self._sidra.get(putanja)
+        if sidro is not None:
+            self._sidra.move_to_end(putanja)
+        return sidro
+
+    def postavi(self, putanja: str, **polja):
+        """Mijenja data polja sidra; None briše polje, sidro bez polja se briše."""
+        if not self.ucitan:
+            self.ucitaj()
+        sidro = dict(self._sidra.get(putanja, {}))
+        for kljuc, vrijednost in polja.items():
+            if vrijednost is None:
+                sidro.pop(kljuc, None)
+            else:
+                sidro[kljuc] = vrijednost
+        if sidro == self._sidra.get(putanja):
+            return
+        self._izmijenjen = True
+        if not sidro:
+            self._sidra.pop(putanja, None)
+            return
+        self._sidra[putanja] = sidro
+        self._sidra.move_to_end(putanja)
+        while len(self._sidra) > self.maks:
+            self._sidra.popitem(last=False)
+
+    def sacuvaj(self):
+        if not self._izmijenjen:
+            return
+        try:
+            os.makedirs(os.path.dirname(self.fajl), exist_ok=True)
+            atomicno_sacuvaj(self.fajl, json.dumps(
+                {"v": _VERZIJA, "fajlovi": self._sidra}, ensure_ascii=False, separators=(",", ":")
+            ))
+            self._izmijenjen = False
+        except OSError as e:
+            print(f"Greška pri čuvanju pozicija čitanja: {e}")
@@ -0,0 +1,139 @@
+"""
+Speculative pre-rendering of the documents likely to be opened next.
+Once the window has been idle for a moment, the local Markdown links of the
+current document and its neighbours in the file tree are rendered by a
+low-priority thread into the shared RenderCache, so a link or tree click
+usually finds the body already rendered. Any key, click or wheel event
+cancels the work; it resumes at the next idle period. The thread uses at
+most a share of one CPU, skips large files, and the cache bounds the memory
+held by entries nobody has opened yet.
+"""
+import os
+import time
+import queue
+import threading
+
+from PySide6.QtCore import QObject, QThread, QTimer, QEvent, Signal
+
+from render import procitaj_tekst
+
+# Koliko dugo (ms) korisnik mora mirovati prije nego što prefetch krene
+IDLE_MS = 800
+MAX_KANDIDATA = 8
+# Veći fajlovi se ne renderuju unaprijed: render se ne može prekinuti u sredini
+MAX_VELICINA = 512 * 1024
+# Udio jednog CPU-a: poslije rendera od t sekundi radnik miruje t * (1 - UDIO) / UDIO
+UDIO_CPU = 0.5
+
+_AKTIVNOST = {
+    QEvent.KeyPress, QEvent.MouseButtonPress, QEvent.MouseButtonDblClick,
+    QEvent.Wheel, QEvent.InputMethod,
+}
+
+
+class _Radnik(QThread):
+    """Renderuje spisak putanja u keš; novi spisak zamjenjuje stari, prekini() ga otkazuje."""
+
+    # putanja čiji je body sada u kešu (ili se ne može renderovati)
+    gotovo = Signal(str)
+
+    def __init__(self, cache, parent=None):
+        super().__init__(parent)
+        self.cache = cache
+        self._red = queue.Queue()
+        self._prekid = threading.Event()
+
+    def posalji(self, putanje):
+        self._prekid.clear()
+        self._red.put(list(putanje))
+
+    def prekini(self):
+        self._prekid.set()
+
+    def zaustavi(self):
+        self._prekid.set()
+        self._red.put(None)
+
+    def run(self):
+        while True:
+            putanje = self._red.get()
+            # Važi samo najnoviji spisak
+            while True:
+                try:
+                    putanje = self._red.get_nowait()
+                except queue.Empty:
+                    break
+            if putanje is None:
+                return
+            for putanja in putanje:
+                if self._prekid.is_set():
+                    break
+                trajanje = self._renderuj(putanja)
+                self.gotovo.emit(putanja)
+                if self._prekid.wait(trajanje * (1.0 - UDIO_CPU) / UDIO_CPU):
+                    break
+
+    def _renderuj(self, putanja) -> float:
+        try:
+            if os.path.getsize(putanja) > MAX_VELICINA:
+                return 0.0
+            tekst, _ = procitaj_tekst(putanja)
+        except OSError:
+            return 0.0
+        start = time.perf_counter()
+        try:
+            self.cache.renderuj(tekst, spekulativno=True)
+        except Exception as e:
+            print(f"Prefetch greška ({putanja}): {e}")
+        return time.perf_counter() - start
+
+
+class Prefetcher(QObject):
+    """
+    zakazi(putanje) postavlja kandidate za trenutni dokument; render počinje
+    tek poslije IDLE_MS mirovanja. Instalira se kao event filter aplikacije.
+    """
+
+    def __init__(self, cache, parent=None):
+        super().__init__(parent)
+        self.ukljucen = True
+        self._kandidati = []
+        self._radnik = _Radnik(cache, self)
+        self._radnik.gotovo.connect(self._on_gotovo)
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.timeout.connect(self._pokreni)
+
+    def zakazi(self, putanje):
+        self._radnik.prekini()
+        self._kandidati = list(dict.fromkeys(putanje))[:MAX_KANDIDATA]
+        if self._kandidati and self.ukljucen:
+            self._timer.start(IDLE_MS)
+        else:
+            self._timer.stop()
+
+    def _pokreni(self):
+        if not self._kandidati:
+            return
+        if not self._radnik.isRunning():
+            self._radnik.start(QThread.LowestPriority)
+        self._radnik.posalji(self._kandidati)
+
+    def _on_gotovo(self, putanja):
+        if putanja in self._kandidati:
+            self._kandidati.remove(putanja)
+
+    def eventFilter(self, obj, event):
+        # Korisnik radi nešto: prekini i pokušaj ponovo kad opet miruje
+        if event.type() in _AKTIVNOST and self._kandidati:
+            self._radnik.prekini()
+            if self.ukljucen:
+                self._timer.start(IDLE_MS)
+        return False
+
+    def zaustavi(self):
+        self._timer.stop()
+        self._kandidati = []
+        if self._radnik.isRunning():
+            self._radnik.zaustavi()
+            self._radnik.wait(2000)
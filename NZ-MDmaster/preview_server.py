@@ -0,0 +1,211 @@
+"""
+Local live-preview server — no Qt imports at module level.
+Serves rendered documents (and the files next to them) on 127.0.0.1 for an
+external browser. Documents are rendered through the shared RenderCache and
+carry an ETag derived from the source text, so a reload of an unchanged
+document is answered with 304 without rendering. Open pages listen on a
+Server-Sent Events stream and reload themselves when the app reports a
+change.
+"""
+import os
+import json
+import queue
+import hashlib
+import secrets
+import threading
+import mimetypes
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import quote, unquote, urlsplit
+
+from render import (
+    MARKDOWN_EKSTENZIJE, procitaj_tekst, je_obican_tekst, renderuj_tekst, sastavi_html,
+)
+from images import obradi_slike
+
+# SSE komentar svakih N sekundi — otkriva zatvorene konekcije
+_PING = 15.0
+
+_LIVE_RELOAD = """<script>
+new EventSource({events}).onmessage = function (e) {{
+    if (JSON.parse(e.data) === {putanja}) location.reload();
+}};
+</script>"""
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server_version = "NZ-MDviewer"
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        srv = self.server.preview
+        host = (self.headers.get("Host") or "").rsplit(":", 1)[0]
+        # Zaštita od DNS rebindinga: samo loopback imena
+        if host not in ("127.0.0.1", "localhost"):
+            self.send_error(403)
+            return
+        putanja = urlsplit(self.path).path
+        prefiks = f"/{srv.token}/"
+        if not putanja.startswith(prefiks):
+            self.send_error(404)
+            return
+        ostatak = putanja[len(prefiks):]
+        if ostatak == "events":
+            self._events(srv)
+            return
+        if not ostatak.startswith("doc/"):
+            self.send_error(404)
+            return
+        fajl = os.path.normpath(unquote(ostatak[len("doc"):]))
+        if not srv.dozvoljeno(fajl) or not os.path.isfile(fajl):
+            self.send_error(404)
+            return
+        try:
+            if fajl.lower().endswith(MARKDOWN_EKSTENZIJE) or je_obican_tekst(fajl):
+                self._dokument(srv, fajl)
+            else:
+                self._fajl(fajl)
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+
+    def _odgovor(self, status, tip, podaci, etag):
+        self.send_response(status)
+        self.send_header("ETag", etag)
+        # Browser uvijek revalidira; nepromijenjen sadržaj dobija 304 bez tijela
+        self.send_header("Cache-Control", "no-cache")
+        if status == 304:
+            self.end_headers()
+            return
+        self.send_header("Content-Type", tip)
+        self.send_header("Content-Length", str(len(podaci)))
+        self.end_headers()
+        self.wfile.write(podaci)
+
+    def _nije_promijenjen(self, etag):
+        return etag in (self.headers.get("If-None-Match") or "")
+
+    def _dokument(self, srv, fajl):
+        tekst, _ = procitaj_tekst(fajl)
+        etag = '"' + hashlib.sha1(
+            (srv.css_otisak + srv.render_cache.engine + tekst).encode("utf-8", "surrogatepass")
+        ).hexdigest()[:20] + '"'
+        if self._nije_promijenjen(etag):
+            self._odgovor(304, None, b"", etag)
+            return
+        self._odgovor(200, "text/html; charset=utf-8", srv.renderuj(fajl, tekst), etag)
+
+    def _fajl(self, fajl):
+        st = os.stat(fajl)
+        etag = f'"{st.st_mtime_ns:x}-{st.st_size:x}"'
+        if self._nije_promijenjen(etag):
+            self._odgovor(304, None, b"", etag)
+            return
+        with open(fajl, "rb") as f:
+            podaci = f.read()
+        tip = mimetypes.guess_type(fajl)[0] or "application/octet-stream"
+        self._odgovor(200, tip, podaci, etag)
+
+    def _events(self, srv):
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Cache-Control", "no-cache")
+        self.end_headers()
+        red = srv.prijavi()
+        try:
+            while True:
+                try:
+                    putanja = red.get(timeout=_PING)
+                except queue.Empty:
+                    self.wfile.write(b": ping\n\n")
+                    self.wfile.flush()
+                    continue
+                if putanja is None:
+                    break
+                self.wfile.write(f"data: {json.dumps(putanja)}\n\n".encode("utf-8"))
+                self.wfile.flush()
+        except (BrokenPipeError, ConnectionResetError, OSError):
+            pass
+        finally:
+            srv.odjavi(red)
+            self.close_connection = True
+
+
+class PreviewServer:
+    """
+    HTTP server u pozadinskom threadu. URL-ovi sadrže nasumičan token, a
+    poslužuju se samo fajlovi ispod dozvoljenih foldera.
+    """
+
+    def __init__(self, css_stil, render_cache, port=0):
+        self.css_stil = css_stil
+        self.css_otisak = hashlib.sha1(css_stil.encode("utf-8")).hexdigest()
+        self.render_cache = render_cache
+        self.token = secrets.token_urlsafe(12)
+        self._korijeni = set()
+        self._klijenti = set()
+        self._lock = threading.Lock()
+        self._httpd = ThreadingHTTPServer(("127.0.0.1", port), _Handler)
+        self._httpd.daemon_threads = True
+        self._httpd.preview = self
+        self._thread = threading.Thread(
+            target=self._httpd.serve_forever, name="nz-preview-server", daemon=True
+        )
+        self._thread.start()
+
+    @property
+    def port(self) -> int:
+        return self._httpd.server_address[1]
+
+    def url(self, putanja: str) -> str:
+        """URL dokumenta; njegov folder postaje dozvoljen."""
+        putanja = os.path.abspath(putanja)
+        self.dozvoli(os.path.dirname(putanja))
+        return f"http://127.0.0.1:{self.port}/{self.token}/doc{quote(putanja)}"
+
+    def dozvoli(self, folder: str):
+        with self._lock:
+            self._korijeni.add(os.path.abspath(folder).rstrip(os.sep) + os.sep)
+
+    def dozvoljeno(self, putanja: str) -> bool:
+        with self._lock:
+            return any(putanja.startswith(k) for k in self._korijeni)
+
+    def renderuj(self, fajl: str, tekst: str) -> bytes:
+        folder = os.path.dirname(fajl)
+        if je_obican_tekst(fajl):
+            body = renderuj_tekst(tekst)
+        else:
+            body = obradi_slike(self.render_cache.renderuj(tekst), folder, lazy=True)
+        body += _LIVE_RELOAD.format(
+            events=json.dumps(f"/{self.token}/events"),
+            putanja=json.dumps(fajl).replace("</", "<\\/"),
+        )
+        return sastavi_html(body, self.css_stil).encode("utf-8", "surrogatepass")
+
+    def prijavi(self) -> queue.Queue:
+        red = queue.Queue()
+        with self._lock:
+            self._klijenti.add(red)
+        return red
+
+    def odjavi(self, red):
+        with self._lock:
+            self._klijenti.discard(red)
+
+    def javi_promjenu(self, putanja: str):
+        """Otvorene stranice ovog dokumenta se ponovo učitavaju (SSE)."""
+        putanja = os.path.abspath(putanja)
+        with self._lock:
+            klijenti = list(self._klijenti)
+        for red in klijenti:
+            red.put(putanja)
+
+    def zaustavi(self):
+        with self._lock:
+            klijenti = list(self._klijenti)
+        for red in klijenti:
+            red.put(None)
+        self._httpd.shutdown()
+        self._httpd.server_close()
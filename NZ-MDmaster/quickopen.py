@@ -0,0 +1,265 @@
+"""
+Quick open (Ctrl+P): fuzzy file finder over an in-memory path index.
+PathIndex keeps a character bitmask per path, so most non-matching paths are
+rejected with one integer AND before any string work; extending the query
+only re-filters the previous candidates. Candidates are gathered in tiers
+(name prefix, name substring, path substring, subsequence) using C-level
+string checks, and only a small pool of them is scored in Python.
+"""
+import os
+import re
+import heapq
+from itertools import islice
+
+from PySide6.QtWidgets import QDialog, QVBoxLayout, QLineEdit, QListWidget, QListWidgetItem
+from PySide6.QtCore import Qt, Signal
+
+_SEPARATORI = "/\\_-. "
+
+# Koliko kandidata se detaljno boduje (ostali tierovi se ne gledaju kad ih je dovoljno)
+_POOL = 300
+
+
+def _maska(tekst: str) -> int:
+    """64-bitna maska znakova (a-z, 0-9 i ostali u zajedničke bite)."""
+    m = 0
+    for ch in set(tekst):
+        if "a" <= ch <= "z":
+            m |= 1 << (ord(ch) - 97)
+        elif "0" <= ch <= "9":
+            m |= 1 << (26 + ord(ch) - 48)
+        else:
+            m |= 1 << (36 + ord(ch) % 28)
+    return m
+
+
+def _podniz_skor(upit: str, tekst: str):
+    """Skor pohlepnog poklapanja upita kao podniza u tekstu, ili None."""
+    skor = 0
+    poz, prethodna = -1, -2
+    for ch in upit:
+        poz = tekst.find(ch, poz + 1)
+        if poz < 0:
+            return None
+        if poz == prethodna + 1:
+            skor += 5
+        if poz == 0 or tekst[poz - 1] in _SEPARATORI:
+            skor += 8
+        prethodna = poz
+    return skor
+
+
+class PathIndex:
+    """Putanje sa maskama; dodaj()/ukloni() su O(1), trazi() filtrira i rangira."""
+
+    def __init__(self):
+        self._putanje = []      # apsolutne putanje (None = obrisano mjesto)
+        self._male = []         # relativna putanja, mala slova
+        self._imena = []        # ime fajla, mala slova
+        self._maske = []
+        self._pozicija = {}     # putanja -> indeks
+        self._slobodna = []
+        self.root = ""
+        self._zadnji_upit = None
+        self._zadnji_kandidati = None
+
+    def __len__(self):
+        return len(self._pozicija)
+
+    def postavi_root(self, root):
+        """Novi root: putanje se prikazuju i pretražuju relativno na njega."""
+        self.root = root
+        putanje = list(self._pozicija)
+        self.__init__()
+        self.root = root
+        for p in putanje:
+            self.dodaj(p)
+
+    def relativna(self, putanja):
+        if self.root and putanja.startswith(self.root.rstrip(os.sep) + os.sep):
+            return os.path.relpath(putanja, self.root)
+        return putanja
+
+    def dodaj(self, putanja):
+        if putanja in self._pozicija:
+            return
+        mala = self.relativna(putanja).lower()
+        if self._slobodna:
+            i = self._slobodna.pop()
+            self._putanje[i], self._male[i], self._maske[i] = putanja, mala, _maska(mala)
+            self._imena[i] = os.path.basename(mala)
+        else:
+            i = len(self._putanje)
+            self._putanje.append(putanja)
+            self._male.append(mala)
+            self._imena.append(os.path.basename(mala))
+            self._maske.append(_maska(mala))
+        self._pozicija[putanja] = i
+        self._zadnji_upit = None
+
+    def ukloni(self, putanja):
+        i = self._pozicija.pop(putanja, None)
+        if i is None:
+            return
+        self._putanje[i] = None
+        self._male[i] = self._imena[i] = ""
+        self._maske[i] = 0  # ne prolazi filter ni za jedan neprazan upit
+        self._slobodna.append(i)
+        self._zadnji_upit = None
+
+    def trazi(self, upit: str, frecency=None, limit: int = 50) -> list:
+        """
+        Najboljih `limit` putanja za upit (subsequence, bez razmaka). frecency je
+        {putanja: bonus}; prazan upit vraća putanje po frecency-ju.
+        """
+        frecency = frecency or {}
+        upit = upit.lower().replace(" ", "")
+        if not upit:
+            self._zadnji_upit = None
+            poznate = [p for p in frecency if p in self._pozicija]
+            return sorted(poznate, key=lambda p: -frecency[p])[:limit]
+
+        # Maska: produžen upit filtrira samo prethodne kandidate
+        qm = _maska(upit)
+        maske = self._maske
+        if self._zadnji_upit and upit.startswith(self._zadnji_upit):
+            kandidati = [i for i in self._zadnji_kandidati if maske[i] & qm == qm]
+        else:
+            kandidati = [i for i in range(len(maske)) if maske[i] & qm == qm]
+        self._zadnji_upit, self._zadnji_kandidati = upit, kandidati
+
+        male, imena = self._male, self._imena
+        pool = [i for i in kandidati if imena[i].startswith(upit)]
+        if len(pool) < _POOL:
+            pool += [i for i in kandidati if upit in imena[i] and not imena[i].startswith(upit)]
+        if len(pool) < _POOL:
+            pool += [i for i in kandidati if upit in male[i] and upit not in imena[i]]
+        if len(pool) < _POOL:
+            # [^a]*a[^b]*b... — linearno, bez backtrackinga kao kod .*?
+            rx = re.compile("".join(f"[^{re.escape(c)}]*{re.escape(c)}" for c in upit))
+            vec = set(pool)
+            pool += islice(
+                (i for i in kandidati if i not in vec and rx.match(male[i])), _POOL * 4
+            )
+        # Nedavni fajlovi se uvijek boduju, i kad ne ulaze u pool
+        pool = set(pool[:_POOL * 4])
+        pool.update(self._pozicija[p] for p in frecency if p in self._pozicija)
+
+        rezultat = []
+        for i in pool:
+            tekst = male[i]
+            skor = _podniz_skor(upit, tekst)
+            if skor is None:
+                continue
+            ime = imena[i]
+            if upit in ime:
+                skor += 40 if ime.startswith(upit) else 25
+            else:
+                skor_imena = _podniz_skor(upit, ime)
+                if skor_imena is not None:
+                    skor += 15 + skor_imena
+            skor -= len(tekst) * 0.1
+            rezultat.append((skor + frecency.get(self._putanje[i], 0), i))
+        return [self._putanje[i] for _, i in heapq.nlargest(limit, rezultat)]
+
+
+def frecency_iz_recent(recent_files) -> dict:
+    """Bonus po poziciji u listi nedavnih fajlova (prvi = najnoviji)."""
+    n = len(recent_files)
+    return {p: 30.0 * (n - i) / n for i, p in enumerate(recent_files)}
+
+
+class QuickOpenDialog(QDialog):
+    """Ctrl+P paleta: polje za upit + lista rangiranih fajlova."""
+
+    file_chosen = Signal(str)
+
+    def __init__(self, index, placeholder, parent=None):
+        super().__init__(parent, Qt.Popup | Qt.FramelessWindowHint)
+        self.index = index
+        self.frecency = {}
+        self.setMinimumWidth(560)
+        self.setStyleSheet("""
+            QDialog {
+                background-color: #161b22;
+                border: 1px solid #30363d;
+            }
+            QLineEdit {
+                background-color: #0d1117;
+                color: #c9d1d9;
+                border: 1px solid #30363d;
+                border-radius: 4px;
+                padding: 6px;
+                font-size: 14px;
+            }
+            QListWidget {
+                background-color: #161b22;
+                color: #c9d1d9;
+                border: none;
+                font-size: 13px;
+            }
+            QListWidget::item {
+                padding: 3px;
+            }
+            QListWidget::item:selected {
+                background: #1f6feb;
+                color: white;
+            }
+        """)
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(6, 6, 6, 6)
+        self.upit = QLineEdit()
+        self.upit.setPlaceholderText(placeholder)
+        self.upit.textChanged.connect(self.osvjezi)
+        self.upit.installEventFilter(self)
+        layout.addWidget(self.upit)
+        self.lista = QListWidget()
+        self.lista.itemActivated.connect(self._izaberi)
+        self.lista.itemClicked.connect(self._izaberi)
+        layout.addWidget(self.lista)
+
+    def otvori(self, frecency):
+        self.frecency = frecency
+        self.upit.clear()
+        self.osvjezi()
+        parent = self.parentWidget()
+        if parent:
+            sirina = max(self.minimumWidth(), parent.width() // 2)
+            self.resize(sirina, 400)
+            vrh = parent.mapToGlobal(parent.rect().topLeft())
+            self.move(vrh.x() + (parent.width() - sirina) // 2, vrh.y() + 60)
+        self.show()
+        self.upit.setFocus()
+
+    def osvjezi(self, *_):
+        rezultati = self.index.trazi(self.upit.text(), self.frecency)
+        self.lista.clear()
+        for putanja in rezultati:
+            rel = self.index.relativna(putanja)
+            folder = os.path.dirname(rel)
+            item = QListWidgetItem(f"{os.path.basename(rel)}    {folder}" if folder else rel)
+            item.setToolTip(putanja)
+            item.setData(Qt.UserRole, putanja)
+            self.lista.addItem(item)
+        if self.lista.count():
+            self.lista.setCurrentRow(0)
+
+    def eventFilter(self, obj, event):
+        # Strelice i Enter iz polja za upit upravljaju listom
+        if obj is self.upit and event.type() == event.Type.KeyPress:
+            key = event.key()
+            if key in (Qt.Key_Down, Qt.Key_Up):
+                red = self.lista.currentRow() + (1 if key == Qt.Key_Down else -1)
+                if 0 <= red < self.lista.count():
+                    self.lista.setCurrentRow(red)
+                return True
+            if key in (Qt.Key_Return, Qt.Key_Enter):
+                item = self.lista.currentItem()
+                if item:
+                    self._izaberi(item)
+                return True
+        return super().eventFilter(obj, event)
+
+    def _izaberi(self, item):
+        self.hide()
+        self.file_chosen.emit(item.data(Qt.UserRole))
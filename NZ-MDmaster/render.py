@@ -0,0 +1,417 @@
+"""
+Markdown → HTML render pipeline — no Qt imports at module level.
+Shared by the preview window and command-line tools so every consumer
+renders documents exactly the same way.
+"""
+import os
+import html
+import hashlib
+import threading
+from collections import OrderedDict
+from contextlib import nullcontext
+
+from engines import PODRAZUMIJEVANI, engine_za
+from images import obradi_slike
+from sections import DUGI_DOKUMENT, DugiDokument
+from tables import MIN_REDOVA, VelikeTabele, skripta as tabele_skripta
+from translations import _t
+
+# Ekstenzije fajlova koje se renderuju kao markdown
+MARKDOWN_EKSTENZIJE = (".md", ".markdown", ".mdown")
+
+# Fajlovi koji se prikazuju kao običan tekst, mimo markdown pipeline-a
+TEKST_EKSTENZIJE = (".txt",)
+
+# Znakova po stranici običnog teksta: setHtml ne prima više od ~2 MB, a escaping uvećava
+TEKST_STRANICA = 256 * 1024
+
+# Linija po <pre> bloku — browser radi layout više manjih blokova umjesto jednog ogromnog
+_TEKST_BLOK = 500
+
+# Profili renderovanja, od punog ka najjeftinijem: "smanjeni" izostavlja ekstenzije
+# čiji regexi na patološkom ulazu rade sekundama, "tekst" prikazuje izvor bez obrade
+PROFILI = ("puni", "smanjeni", "tekst")
+_SMANJENI_BEZ = {"smarty", "abbr", "pymdownx.magiclink"}
+
+# Folderi koji se preskaču pri obilasku workspace-a (pored skrivenih)
+PRESKOCI_FOLDERE = {"node_modules", "__pycache__", "venv", "site-packages"}
+
+
+def preskoci_folder(ime: str) -> bool:
+    return ime.startswith(".") or ime in PRESKOCI_FOLDERE
+
+
+def markdown_fajlovi(folder: str) -> list:
+    """Svi markdown fajlovi u folderu (rekurzivno), sortirani."""
+    rezultat = []
+    for root, dirs, files in os.walk(folder):
+        dirs[:] = sorted(d for d in dirs if not preskoci_folder(d))
+        for ime in sorted(files):
+            if ime.lower().endswith(MARKDOWN_EKSTENZIJE):
+                rezultat.append(os.path.join(root, ime))
+    return rezultat
+
+
+def procitaj_tekst(putanja: str):
+    """Čita fajl kao UTF-8, uz latin-1 fallback; vraća (tekst, encoding)."""
+    try:
+        with open(putanja, "r", encoding="utf-8") as f:
+            return f.read(), "utf-8"
+    except UnicodeDecodeError:
+        with open(putanja, "r", encoding="latin-1") as f:
+            return f.read(), "latin-1"
+
+
+def _markdown_ekstenzije(profil: str = "puni"):
+    """Vraća (extensions, extension_configs) za Python-Markdown."""
+    extensions = [
+        "fenced_code",
+        "tables",
+        "nl2br",
+        "toc",
+        "abbr",
+        "attr_list",
+        "def_list",
+        "footnotes",
+        "md_in_html",
+        "sane_lists",
+        "smarty",
+        "admonition",
+    ]
+
+    extension_configs = {}
+
+    try:
+        import pymdownx
+
+        extensions.extend(
+            [
+                "pymdownx.highlight",
+                "pymdownx.superfences",
+                "pymdownx.tasklist",
+                "pymdownx.magiclink",
+                "pymdownx.betterem",
+                "pymdownx.tilde",
+                "pymdownx.mark",
+                "pymdownx.caret",
+                "pymdownx.keys",
+            ]
+        )
+        extension_configs.update(
+            {
+                "pymdownx.highlight": {
+                    "use_pygments": True,
+                    "guess_lang": True,
+                    "linenums": False,
+                    "css_class": "highlight",
+                },
+                "pymdownx.tasklist": {
+                    "custom_checkbox": True,
+                    "clickable_checkbox": False,
+                },
+            }
+        )
+    except ImportError:
+        pass
+
+    if profil != "puni":
+        extensions = [e for e in extensions if e not in _SMANJENI_BEZ]
+        if "pymdownx.highlight" in extension_configs:
+            extension_configs["pymdownx.highlight"]["guess_lang"] = False
+
+    return extensions, extension_configs
+
+
+# Tracer aktivnog renderovanja (po threadu) — čita ga omotač oko Pygments-a
+_stanje = threading.local()
+
+
+def _instrumentiraj_pygments():
+    """Omota pymdownx Highlight.highlight tako da se vrijeme Pygments-a mjeri zasebno."""
+    try:
+        from pymdownx.highlight import Highlight
+    except ImportError:
+        return
+    original = Highlight.highlight
+    if getattr(original, "_nz_instrumentirano", False):
+        return
+
+    def highlight(self, *args, **kwargs):
+        t = getattr(_stanje, "tracer", None)
+        if t is None:
+            return original(self, *args, **kwargs)
+        with t.span("pygments", sabiraj=True):
+            return original(self, *args, **kwargs)
+
+    highlight._nz_instrumentirano = True
+    Highlight.highlight = highlight
+
+
+_instrumentiraj_pygments()
+
+
+def renderuj_markdown(tekst: str, tracer=None, meta=None, profil: str = "puni",
+                      engine: str = PODRAZUMIJEVANI) -> str:
+    """
+    Renderuje markdown tekst u HTML body (bez <html>/<head>).
+    Ako je proslijeđen `meta` dict, u njega se upisuju toc_tokens (naslovi sa id-jevima).
+    profil je jedan od PROFILI; "tekst" vraća izvor kao običan tekst. engine je
+    ime iz engines.ENGINES (neinstaliran pada na Python-Markdown).
+    """
+    if profil == "tekst":
+        if meta is not None:
+            meta["toc_tokens"] = []
+        return renderuj_tekst(tekst)
+    try:
+        _stanje.tracer = tracer
+        with _span(tracer, "markdown"):
+            html_content, toc_tokens = engine_za(engine).renderuj(tekst, profil, tracer)
+        if meta is not None:
+            meta["toc_tokens"] = toc_tokens
+        return html_content
+    except Exception as e:
+        return f"""
+            <div style="color: #f85149; background: #21262d; padding: 16px; border-radius: 6px;">
+                <h3>Greška pri renderovanju</h3>
+                <pre>{str(e)}</pre>
+            </div>
+            <hr>
+            <pre>{tekst[:1000]}...</pre>
+            """
+    finally:
+        _stanje.tracer = None
+
+
+class RenderCache:
+    """
+    LRU keš renderovanog markdown body-ja (i toc_tokens) po sadržaju teksta.
+    Dijele ga pregled, preview server i prefetch; siguran za pozive iz više
+    threadova. Tekst koji se upravo renderuje u drugom threadu se ne renderuje
+    ponovo — poziv čeka taj rezultat. Sa `watchdog`-om (render_worker) se
+    renderi koji nisu spekulativni izvršavaju pod vremenskim budžetom;
+    GUI thread koristi zatrazi(), koji na render nikad ne čeka.
+    """
+
+    def __init__(self, max_stavki: int = 32, max_bajtova: int = 64 * 1024 * 1024,
+                 max_spekulativnih: int = 16 * 1024 * 1024, watchdog=None):
+        self.watchdog = watchdog
+        # Ime engine-a (engines.py) kojim se renderuje; dio je ključa keša
+        self.engine = PODRAZUMIJEVANI
+        self.max_stavki = max_stavki
+        self.max_bajtova = max_bajtova
+        # Budžet za stavke iz prefetcha koje još niko nije otvorio
+        self.max_spekulativnih = max_spekulativnih
+        self._stavke = OrderedDict()
+        self._bajtova = 0
+        self._spekulativne = {}   # kljuc -> bajtova, po redu dodavanja
+        self._spekulativnih = 0
+        self._u_toku = {}         # kljuc -> threading.Event
+        self.pogodaka_prefetcha = 0
+        self._lock = threading.Lock()
+
+    def _kljuc(self, tekst, engine):
+        return hashlib.sha1(f"{engine}\0{tekst}".encode("utf-8", "surrogatepass")).digest()
+
+    def _pogodak(self, kljuc, spekulativno):
+        """Keširana stavka ili None; poziva se pod lockom."""
+        stavka = self._stavke.get(kljuc)
+        if stavka is not None:
+            self._stavke.move_to_end(kljuc)
+            if not spekulativno and kljuc in self._spekulativne:
+                self._spekulativnih -= self._spekulativne.pop(kljuc)
+                self.pogodaka_prefetcha += 1
+        return stavka
+
+    def renderuj(self, tekst: str, tracer=None, meta=None, spekulativno: bool = False,
+                 nadzor: bool = True) -> str:
+        """
+        spekulativno=True: render iz prefetcha, ograničen budžetom max_spekulativnih.
+        nadzor=False: kratki isječak, renderuje se u pozivajućem threadu bez watchdoga.
+        U `meta` se upisuju toc_tokens i profil kojim je body renderovan.
+        """
+        engine = self.engine
+        kljuc = self._kljuc(tekst, engine)
+        while True:
+            with self._lock:
+                stavka = self._pogodak(kljuc, spekulativno)
+                if stavka is not None:
+                    break
+                gotovo = self._u_toku.get(kljuc)
+                if gotovo is None:
+                    self._u_toku[kljuc] = threading.Event()
+                    break
+            gotovo.wait()
+        if stavka is None:
+            try:
+                m = {}
+                if self.watchdog is not None and nadzor and not spekulativno:
+                    body, profil = self.watchdog.renderuj(tekst, tracer=tracer, meta=m, engine=engine)
+                else:
+                    body, profil = renderuj_markdown(tekst, tracer=tracer, meta=m, engine=engine), "puni"
+                # Smanjeni rezultat ostaje u kešu: isti tekst bi opet prešao budžet
+                stavka = (body, m.get("toc_tokens", []), profil)
+                with self._lock:
+                    self._dodaj(kljuc, stavka, spekulativno)
+            finally:
+                with self._lock:
+                    self._u_toku.pop(kljuc).set()
+        if meta is not None:
+            meta["toc_tokens"] = stavka[1]
+            meta["profil"] = stavka[2]
+        return stavka[0]
+
+    def zatrazi(self, tekst: str, gotovo, tracer=None, kanal=None) -> None:
+        """
+        Neblokirajući renderuj(): keširan rezultat ide odmah u gotovo(body, meta),
+        inače ga watchdog renderuje u pozadini i gotovo se zove iz njegovog
+        threada. `kanal`: novi zahtjev istog kanala izbacuje stari sa reda.
+        """
+        engine = self.engine
+        kljuc = self._kljuc(tekst, engine)
+        with self._lock:
+            stavka = self._pogodak(kljuc, False)
+        if stavka is not None:
+            gotovo(stavka[0], {"toc_tokens": stavka[1], "profil": stavka[2]})
+            return
+        if self.watchdog is None:
+            meta = {}
+            body = self.renderuj(tekst, tracer=tracer, meta=meta)
+            gotovo(body, meta)
+            return
+
+        def stiglo(body, toc_tokens, profil):
+            with self._lock:
+                if kljuc not in self._stavke:
+                    self._dodaj(kljuc, (body, toc_tokens, profil), False)
+            gotovo(body, {"toc_tokens": toc_tokens, "profil": profil})
+
+        self.watchdog.zatrazi(tekst, stiglo, tracer=tracer, engine=engine, kanal=kanal)
+
+    def _dodaj(self, kljuc, stavka, spekulativno):
+        velicina = len(stavka[0])
+        self._stavke[kljuc] = stavka
+        self._bajtova += velicina
+        if spekulativno:
+            self._spekulativne[kljuc] = velicina
+            self._spekulativnih += velicina
+            # Novi prefetch istiskuje najstariji neiskorišteni, a ne ono što je korisnik gledao
+            while self._spekulativnih > self.max_spekulativnih and len(self._spekulativne) > 1:
+                self._izbaci(next(iter(self._spekulativne)))
+        while self._stavke and (
+            len(self._stavke) > self.max_stavki or self._bajtova > self.max_bajtova
+        ):
+            self._izbaci(next(iter(self._stavke)))
+
+    def _izbaci(self, kljuc):
+        body = self._stavke.pop(kljuc)[0]
+        self._bajtova -= len(body)
+        if kljuc in self._spekulativne:
+            self._spekulativnih -= self._spekulativne.pop(kljuc)
+
+
+def je_obican_tekst(putanja) -> bool:
+    return bool(putanja) and putanja.lower().endswith(TEKST_EKSTENZIJE)
+
+
+def stranice_teksta(tekst: str, velicina: int = TEKST_STRANICA) -> list:
+    """Granice (početak, kraj) stranica teksta; stranica se lomi na kraju linije."""
+    granice = []
+    pocetak, n = 0, len(tekst)
+    while pocetak < n:
+        kraj = pocetak + velicina
+        if kraj >= n:
+            kraj = n
+        else:
+            nl = tekst.rfind("\n", pocetak, kraj)
+            if nl >= pocetak:
+                kraj = nl + 1
+        granice.append((pocetak, kraj))
+        pocetak = kraj
+    return granice or [(0, 0)]
+
+
+def renderuj_tekst(tekst: str) -> str:
+    """
+    Običan tekst u HTML body: escapovan i podijeljen u <pre> blokove,
+    bez markdown obrade (nl2br/smarty bi izmijenili logove).
+    """
+    linije = html.escape(tekst, quote=False).split("\n")
+    # "\n" odmah iza <pre> parser odbacuje — tako prazna prva linija bloka ostaje
+    blokovi = [
+        "<pre>\n" + "\n".join(linije[i:i + _TEKST_BLOK]) + "</pre>"
+        for i in range(0, len(linije), _TEKST_BLOK)
+    ]
+    return '<div class="nz-txt">' + "".join(blokovi) + "</div>"
+
+
+def _span(tracer, ime: str, **args):
+    return tracer.span(ime, **args) if tracer else nullcontext()
+
+
+def izdvoji_tabele(tekst: str, folder: str, renderuj, store=None, tracer=None):
+    """
+    Tabele pregleda sa hiljadama redova: u stranici samo zaglavlje, redovi se crtaju
+    po potrebi, a obični redovi izvora ne prolaze kroz markdown. Vraća (tekst za
+    render, VelikeTabele ili None); renderuj(markdown) -> body služi za zaglavlje i
+    posebne redove. Poslije rendera tabele idu u dovrsi_body().
+    """
+    if tekst.count("|") < 2 * MIN_REDOVA:
+        return tekst, None
+    with _span(tracer, "tables", sabiraj=True):
+        tabele = VelikeTabele()
+        if store is not None:
+            store.dodaj(tabele)
+        tekst = tabele.izdvoji_izvor(tekst, lambda t: obradi_slike(renderuj(t), folder, lazy=True, shema=True))
+    return tekst, tabele
+
+
+def dovrsi_body(html_content: str, folder: str, tabele=None, pregled: bool = True,
+                meta=None, store=None, tracer=None) -> str:
+    """
+    Renderovan body za stranicu: slike (lazy loading, width/height iz headera; pregled
+    ih vuče preko nzimg:), a u pregledu još velike tabele i sekcije vrlo dugog
+    dokumenta. VelikeTabele i DugiDokument se registruju u `store` (SectionStore) i
+    upisuju u meta (velike_tabele, dugi_dokument).
+    """
+    with _span(tracer, "images"):
+        html_content = obradi_slike(html_content, folder, lazy=True, shema=pregled)
+    if not pregled:
+        return html_content
+
+    if tabele is not None or html_content.count("<tr>") >= MIN_REDOVA:
+        with _span(tracer, "tables", sabiraj=True):
+            if tabele is None:
+                tabele = VelikeTabele()
+                if store is not None:
+                    store.dodaj(tabele)
+            html_content = tabele.izdvoji(tabele.umetni(html_content))
+        if len(tabele):
+            if meta is not None:
+                meta["velike_tabele"] = tabele
+            html_content += tabele_skripta(_t("vtable_filter"), _t("vtable_rows"))
+
+    # Pregled vrlo dugog dokumenta: u stranici su samo sekcije blizu ekrana
+    if len(html_content) > DUGI_DOKUMENT:
+        with _span(tracer, "sections", bytes=len(html_content)):
+            dugi = DugiDokument(html_content)
+            if store is not None:
+                store.dodaj(dugi)
+            if meta is not None:
+                meta["dugi_dokument"] = dugi
+            html_content = dugi.html()
+    return html_content
+
+
+def sastavi_html(html_content: str, css_stil: str, base_url_tag: str = "") -> str:
+    """Sklapa kompletan HTML dokument oko renderovanog body-ja."""
+    return f"""<!DOCTYPE html>
+<html>
+<head>
+    <meta charset="utf-8">
+    {base_url_tag}
+    {css_stil}
+</head>
+<body>
+    {html_content}
+</body>
+</html>"""
@@ -0,0 +1,286 @@
+"""
+Render watchdog — no Qt imports at module level.
+Markdown is rendered in a separate, pre-started worker process so a render
+that runs away (deeply nested lists or emphasis, huge footnote or
+abbreviation sets) can be stopped: when the result does not arrive within
+the time budget the worker is killed and the text is rendered again with
+the reduced profile, and past a second budget it is shown as plain text.
+A spare worker is always kept warm, so a retry does not pay the process
+start-up. Workers run this file as a script, so they import only the
+Markdown modules.
+All waiting (for a worker to start, for a result) happens in the
+watchdog's own supervisor thread: zatrazi() returns at once and the result
+arrives through a callback, so the GUI thread never blocks on a render.
+"""
+import os
+import sys
+import time
+import threading
+import subprocess
+import collections
+import multiprocessing
+
+from render import PROFILI, renderuj_markdown, renderuj_tekst
+from engines import PODRAZUMIJEVANI
+
+# Sekunde po pokušaju; 0 isključuje budžet (render u nadzornom threadu)
+BUDZET = 3.0
+# Koliko pregled novog dokumenta čeka rezultat prije nego što do tada prikaže običan tekst
+PRIVREMENI_MS = 250
+# Koliko nadzorni thread čeka da radnik učita markdown/pygments (ne troši
+# budžet); radnik koji se ni za ovoliko ne javi se zamjenjuje
+_START_TIMEOUT = 30.0
+
+
+def _radnik(veza):
+    """Petlja radnog procesa: (tekst, profil, engine) -> (body, toc_tokens, {faza: ms})."""
+    from tracing import Tracer
+    # Prvi render plaća lijene importe ekstenzija — obavi ga prije nego što se javi
+    renderuj_markdown("# nz\n\n```python\npass\n```\n")
+    veza.send("spreman")
+    while True:
+        try:
+            zahtjev = veza.recv()
+        except (EOFError, OSError):
+            return
+        if zahtjev is None:
+            return
+        tekst, profil, engine = zahtjev
+        t = Tracer()
+        meta = {}
+        body = renderuj_markdown(tekst, tracer=t, meta=meta, profil=profil, engine=engine)
+        veza.send((body, meta.get("toc_tokens", []), t.zadnja_mjera))
+
+
+class _Proces:
+    """
+    Jedan radni proces i njegova strana cijevi. Pokreće se kao zaseban skript
+    (ovaj fajl), ne kroz multiprocessing spawn — spawn bi u radniku ponovo
+    izvršio glavni skript, a time uvezao PySide6 i QtWebEngine.
+    """
+
+    def __init__(self):
+        self.veza, druga = multiprocessing.Pipe()
+        self.proces = subprocess.Popen(
+            [sys.executable, os.path.abspath(__file__), str(druga.fileno())],
+            pass_fds=(druga.fileno(),),
+            stdin=subprocess.DEVNULL,
+        )
+        druga.close()
+        self.pokrenut = time.monotonic()
+        self.spreman = False
+        self.propao = False
+
+    def provjeri_spreman(self, cekaj: float = 0.0) -> bool:
+        """Da li se radnik javio; čeka najviše `cekaj` sekundi."""
+        if not self.spreman and not self.propao:
+            try:
+                if self.veza.poll(cekaj):
+                    self.spreman = self.veza.recv() == "spreman"
+                    self.propao = not self.spreman
+            except (EOFError, OSError):
+                self.propao = True
+            if not self.spreman and (
+                self.proces.poll() is not None
+                or time.monotonic() - self.pokrenut > _START_TIMEOUT
+            ):
+                self.propao = True
+        return self.spreman
+
+    def ubij(self):
+        self.proces.kill()
+        try:
+            self.proces.wait(1.0)
+        except subprocess.TimeoutExpired:
+            pass
+        self.veza.close()
+
+
+class _Zahtjev:
+    """Jedan render na redu nadzornog threada."""
+
+    __slots__ = ("tekst", "engine", "tracer", "gotovo", "kanal", "otkazan")
+
+    def __init__(self, tekst, engine, tracer, gotovo, kanal):
+        self.tekst = tekst
+        self.engine = engine
+        self.tracer = tracer
+        self.gotovo = gotovo
+        self.kanal = kanal
+        self.otkazan = False
+
+
+class RenderWatchdog:
+    """
+    Renders under a budget of `budzet` seconds per profile in a supervisor
+    thread. zatrazi() queues a render and returns at once; renderuj() is the
+    blocking form for threads that may wait (preview server), never the GUI.
+    """
+
+    def __init__(self, budzet: float = BUDZET):
+        self.budzet = budzet
+        self._aktivni = None
+        self._rezervni = None
+        self._red = collections.deque()
+        self._uslov = threading.Condition()
+        self._nadzornik = None
+        self._kraj = False
+
+    def pokreni(self):
+        """Pokreće radnika, rezervu i nadzorni thread (ne čeka da radnici budu spremni)."""
+        with self._uslov:
+            self._kraj = False
+            self._popuni()
+            if self._nadzornik is None:
+                self._nadzornik = threading.Thread(target=self._nadzor, name="render-watchdog", daemon=True)
+                self._nadzornik.start()
+
+    def zatrazi(self, tekst: str, gotovo, tracer=None, engine: str = PODRAZUMIJEVANI, kanal=None):
+        """
+        Stavlja render na red i odmah se vraća; gotovo(body, toc_tokens, profil)
+        se poziva iz nadzornog threada. Novi zahtjev istog `kanal`-a izbacuje
+        prethodne koji još čekaju (njihov gotovo se ne poziva).
+        """
+        zahtjev = _Zahtjev(tekst, engine, tracer, gotovo, kanal)
+        with self._uslov:
+            if kanal is not None:
+                for stari in self._red:
+                    if stari.kanal == kanal:
+                        stari.otkazan = True
+            self._red.append(zahtjev)
+            self._uslov.notify()
+        if self._nadzornik is None:
+            self.pokreni()
+
+    def renderuj(self, tekst: str, tracer=None, meta=None, engine: str = PODRAZUMIJEVANI):
+        """Blokirajući zatrazi(): (body, profil); u `meta` se upisuju toc_tokens."""
+        stiglo = threading.Event()
+        rezultat = []
+
+        def gotovo(body, toc_tokens, profil):
+            rezultat.extend((body, toc_tokens, profil))
+            stiglo.set()
+
+        self.zatrazi(tekst, gotovo, tracer=tracer, engine=engine)
+        stiglo.wait()
+        body, toc_tokens, profil = rezultat
+        if meta is not None:
+            meta["toc_tokens"] = toc_tokens
+        return body, profil
+
+    def _nadzor(self):
+        """Nadzorni thread: zahtjevi redom, svaki pod budžetom."""
+        while True:
+            with self._uslov:
+                while not self._red and not self._kraj:
+                    self._uslov.wait()
+                if self._kraj:
+                    return
+                zahtjev = self._red.popleft()
+            if zahtjev.otkazan:
+                continue
+            try:
+                body, toc_tokens, profil = self._obradi(zahtjev)
+            except Exception as e:
+                print(f"Render watchdog greška: {e}")
+                body, toc_tokens, profil = renderuj_tekst(zahtjev.tekst), [], PROFILI[-1]
+            if self._kraj:
+                return
+            try:
+                zahtjev.gotovo(body, toc_tokens, profil)
+            except Exception as e:
+                print(f"Render watchdog greška: {e}")
+
+    def _obradi(self, zahtjev):
+        if self.budzet <= 0 or self._spreman_radnik() is None:
+            # Bez budžeta, ili se radnik ne može pokrenuti: render ovdje — i dalje van GUI threada
+            m = {}
+            body = renderuj_markdown(zahtjev.tekst, tracer=zahtjev.tracer, meta=m, engine=zahtjev.engine)
+            return body, m.get("toc_tokens", []), "puni"
+        for profil in PROFILI[:-1]:
+            rezultat = self._pokusaj(zahtjev, profil)
+            if rezultat is not None:
+                return rezultat + (profil,)
+        return renderuj_tekst(zahtjev.tekst), [], PROFILI[-1]
+
+    def _popuni(self):
+        if self._kraj:
+            return
+        if self._aktivni is None:
+            self._aktivni, self._rezervni = self._rezervni, None
+        if self._aktivni is None:
+            self._aktivni = _Proces()
+        if self._rezervni is None:
+            self._rezervni = _Proces()
+
+    def _odbaci(self, radnik):
+        radnik.ubij()
+        if self._aktivni is radnik:
+            self._aktivni = None
+            self._popuni()
+
+    def _spreman_radnik(self):
+        """Aktivni radnik kad može primiti render (čeka u nadzornom threadu), ili None."""
+        self._popuni()
+        for _ in range(2):
+            radnik = self._aktivni
+            if radnik is None:
+                return None
+            if radnik.provjeri_spreman(_START_TIMEOUT):
+                return radnik
+            if not radnik.propao:
+                return None
+            # Umjesto njega rezerva, obično odavno spremna
+            self._odbaci(radnik)
+        return None
+
+    def _pokusaj(self, zahtjev, profil):
+        """(body, toc_tokens), ili None ako radnik nije stigao u budžetu (tada je ubijen)."""
+        radnik = self._spreman_radnik()
+        if radnik is None:
+            return None
+        tracer = zahtjev.tracer
+        pocetak = tracer._sada_us() if tracer else 0.0
+        start = time.perf_counter()
+        try:
+            radnik.veza.send((zahtjev.tekst, profil, zahtjev.engine))
+            if radnik.veza.poll(self.budzet):
+                body, toc_tokens, mjera = radnik.veza.recv()
+            else:
+                print(f"Render prekoračio {self.budzet:.1f} s (profil: {profil})")
+                self._odbaci(radnik)
+                return None
+        except (EOFError, OSError, BrokenPipeError):
+            self._odbaci(radnik)
+            return None
+        if tracer:
+            # Faza "markdown" uključuje i prenos između procesa
+            tracer.zabiljezi("markdown", pocetak, (time.perf_counter() - start) * 1e6, profil=profil)
+            if "pygments" in mjera:
+                tracer.zabiljezi("pygments", pocetak, mjera["pygments"] * 1000.0)
+        return body, toc_tokens
+
+    def zaustavi(self):
+        """Gasi nadzorni thread i radnike; render u toku se ne isporučuje."""
+        with self._uslov:
+            self._kraj = True
+            self._red.clear()
+            procesi = [p for p in (self._aktivni, self._rezervni) if p is not None]
+            self._aktivni = self._rezervni = None
+            self._nadzornik = None
+            self._uslov.notify_all()
+        for proces in procesi:
+            try:
+                proces.veza.send(None)
+            except (OSError, BrokenPipeError):
+                pass
+            try:
+                proces.proces.wait(0.5)
+            except subprocess.TimeoutExpired:
+                proces.proces.kill()
+
+
+if __name__ == "__main__":
+    # Radni proces: argument je deskriptor njegove strane cijevi
+    from multiprocessing.connection import Connection
+    _radnik(Connection(int(sys.argv[1])))
@@ -0,0 +1,255 @@
+"""
+Long-document mode for the preview — no Qt imports at module level.
+A very large rendered body is split into sections at top-level block
+boundaries. The page only contains the first sections and empty
+placeholders with estimated heights; an IntersectionObserver fetches the
+sections near the viewport from the nzsec: scheme and empties the ones that
+scrolled far away, so DOM size and layout time follow the viewport instead
+of the document.
+"""
+import re
+import html
+import json
+import threading
+from collections import OrderedDict
+
+SECTION_SCHEME = "nzsec"
+
+# Body veći od ovoga (HTML bajtova) se prikazuje u sekcijama
+DUGI_DOKUMENT = 1536 * 1024
+# Ciljna veličina sekcije; sekcija se lomi tek na granici bloka najvišeg nivoa
+VELICINA_SEKCIJE = 64 * 1024
+# Koliko sekcija je u stranici od početka (prvi prikaz bez čekanja na fetch)
+_POCETNE = 2
+# Objekti koji se još poslužuju: sekcije i tabele prikazanog dokumenta i onog
+# u rezervnoj stranici, uz jedan stariji
+_ZADRZI = 6
+
+# Blokovi unutar kojih se ne smije lomiti (li je uvijek unutar ul/ol); markdown
+# generiše tagove malim slovima, a literal na početku uzorka drži pretragu brzom
+_KONTEJNER = re.compile(r"<(/?)(?:blockquote|ul|ol|div|details|table|pre|dl|section|figure)\b")
+_ID = re.compile(r' id="([^"]+)"')
+_TAG = re.compile(r"<[^>]*>")
+
+
+def podijeli(body: str, velicina: int = VELICINA_SEKCIJE) -> list:
+    """Granice (početak, kraj) sekcija; lomi se samo na '\\n<' van svih kontejnera."""
+    granice = []
+    pocetak, poz, dubina, n = 0, 0, 0, len(body)
+
+    def dubina_do(kraj):
+        d = dubina
+        for m in _KONTEJNER.finditer(body, poz, kraj):
+            # Nebalansiran HTML iz markdowna ne smije zaključati dubinu ispod nule
+            d = max(0, d - 1) if m.group(1) else d + 1
+        return d
+
+    while pocetak + velicina < n:
+        # Skok na kraj linije iza ciljne veličine — tag generisanog HTML-a ne prelazi liniju
+        cilj = body.find("\n", pocetak + velicina)
+        if cilj < 0:
+            break
+        dubina = dubina_do(cilj)
+        poz = cilj
+        while True:
+            i = body.find("\n<", poz)
+            if i < 0:
+                return granice + [(pocetak, n)]
+            dubina = dubina_do(i + 1)
+            poz = i + 1
+            if dubina == 0 and not body.startswith("</", poz):
+                break
+        granice.append((pocetak, poz))
+        pocetak = poz
+    granice.append((pocetak, n))
+    return granice
+
+
+def procijeni_visinu(fragment: str) -> int:
+    """Gruba visina u CSS pikselima: linije bloka + prelom dugih paragrafa."""
+    return int(24 * (fragment.count("\n") + len(fragment) / 120)) + 16
+
+
+class DugiDokument:
+    """Body podijeljen u sekcije + mapa id -> sekcija (za outline i #linkove)."""
+
+    def __init__(self, body: str, velicina: int = VELICINA_SEKCIJE):
+        self.body = body
+        self.granice = podijeli(body, velicina)
+        self.ids = {}
+        for i, (pocetak, kraj) in enumerate(self.granice):
+            for m in _ID.finditer(body, pocetak, kraj):
+                self.ids.setdefault(html.unescape(m.group(1)), i)
+        self._tekst = None
+        self.id = None
+
+    def __len__(self):
+        return len(self.granice)
+
+    def sekcija(self, i: int) -> str:
+        pocetak, kraj = self.granice[i]
+        return self.body[pocetak:kraj]
+
+    def resurs(self, ime: str):
+        if ime.isdigit() and int(ime) < len(self):
+            return self.sekcija(int(ime)), "text/html; charset=utf-8"
+        return None
+
+    def trazi(self, pojam: str):
+        """(broj pogodaka, indeks prve sekcije sa pogotkom) u tekstu bez tagova."""
+        if self._tekst is None:
+            self._tekst = [
+                html.unescape(_TAG.sub("", self.sekcija(i))) for i in range(len(self))
+            ]
+        regex = re.compile(re.escape(pojam), re.IGNORECASE)
+        ukupno, prva = 0, None
+        for i, tekst in enumerate(self._tekst):
+            n = len(regex.findall(tekst))
+            if n and prva is None:
+                prva = i
+            ukupno += n
+        return ukupno, prva
+
+    def html(self) -> str:
+        """Body za stranicu: početne sekcije, placeholderi i skripta za učitavanje."""
+        dijelovi = []
+        for i in range(len(self)):
+            if i < _POCETNE:
+                dijelovi.append(f'<section class="nz-sec" data-i="{i}" data-stanje="ucitana">'
+                                f"{self.sekcija(i)}</section>")
+            else:
+                visina = procijeni_visinu(self.sekcija(i))
+                dijelovi.append(f'<section class="nz-sec" data-i="{i}" style="height:{visina}px"></section>')
+        skripta = _SKRIPTA.replace("__DOK__", json.dumps(self.id)).replace(
+            "__IDS__", json.dumps(self.ids).replace("</", "<\\/")
+        )
+        return "".join(dijelovi) + skripta
+
+
+class SectionStore:
+    """
+    Podaci koje nzsec: handler poslužuje: sekcije dugih dokumenata i redovi
+    virtuelnih tabela (tables.py) zadnjih nekoliko renderovanja. Objekat ima
+    resurs(ime) -> (tekst, mime) ili None; id je rastući broj.
+    """
+
+    def __init__(self):
+        self._dokumenti = OrderedDict()
+        self._sljedeci = 1
+        self._lock = threading.Lock()
+
+    def dodaj(self, dokument: DugiDokument) -> int:
+        with self._lock:
+            dokument.id = self._sljedeci
+            self._sljedeci += 1
+            self._dokumenti[dokument.id] = dokument
+            while len(self._dokumenti) > _ZADRZI:
+                self._dokumenti.popitem(last=False)
+        return dokument.id
+
+    def resurs(self, dok_id: int, ime: str):
+        """(tekst, mime), ili None ako dokument više nije tu."""
+        with self._lock:
+            dokument = self._dokumenti.get(dok_id)
+        return dokument.resurs(ime) if dokument is not None else None
+
+
+def parsiraj_url(putanja: str):
+    """'/<dok>/<ime>' -> (dok, ime) ili None."""
+    dijelovi = putanja.strip("/").split("/")
+    if len(dijelovi) != 2 or not dijelovi[0].isdigit():
+        return None
+    return int(dijelovi[0]), dijelovi[1]
+
+
+_SKRIPTA = """<script>
+(function () {
+    var DOK = __DOK__, IDS = __IDS__;
+    var sekcije = document.querySelectorAll('section.nz-sec');
+    var oznaka = null;
+
+    function oznaci(root) {
+        var walker = document.createTreeWalker(root, NodeFilter.SHOW_TEXT, null);
+        var nodes = [], node;
+        while ((node = walker.nextNode())) {
+            oznaka.lastIndex = 0;
+            if (oznaka.test(node.nodeValue)) nodes.push(node);
+        }
+        nodes.forEach(function (n) {
+            var span = document.createElement('span');
+            span.innerHTML = n.nodeValue.replace(/[&<>]/g, function (c) {
+                return {'&': '&amp;', '<': '&lt;', '>': '&gt;'}[c];
+            }).replace(oznaka, function (m) {
+                return '<mark style="background:#ffff00;color:#000000">' + m + '</mark>';
+            });
+            n.parentNode.replaceChild(span, n);
+        });
+    }
+
+    function ucitaj(s) {
+        if (s._ucitavanje) return s._ucitavanje;
+        if (s.dataset.stanje === 'ucitana') return Promise.resolve();
+        s._ucitavanje = fetch('__SCHEME__:/' + DOK + '/' + s.dataset.i)
+            .then(function (r) { return r.text(); })
+            .then(function (html) {
+                s.innerHTML = html;
+                s.style.height = '';
+                s.dataset.stanje = 'ucitana';
+                if (oznaka) oznaci(s);
+                if (window.nzTabeleInit) window.nzTabeleInit(s);
+            })
+            .finally(function () { s._ucitavanje = null; });
+        return s._ucitavanje;
+    }
+
+    function isprazni(s) {
+        if (s.dataset.stanje !== 'ucitana' || s._ucitavanje) return;
+        // Izmjerena visina ostaje, pa se ništa ispod ne pomjera
+        s.style.height = s.offsetHeight + 'px';
+        s.textContent = '';
+        delete s.dataset.stanje;
+    }
+
+    var observer = new IntersectionObserver(function (unosi) {
+        unosi.forEach(function (u) {
+            if (u.isIntersecting) ucitaj(u.target); else isprazni(u.target);
+        });
+    }, {rootMargin: '150% 0px'});
+    sekcije.forEach(function (s) { observer.observe(s); });
+
+    window.nzScrollTo = function (id) {
+        var e = document.getElementById(id);
+        if (e) { e.scrollIntoView({block: 'start'}); return; }
+        var s = sekcije[IDS[id]];
+        if (!s) return;
+        s.scrollIntoView({block: 'start'});
+        ucitaj(s).then(function () {
+            var e = document.getElementById(id);
+            if (e) e.scrollIntoView({block: 'start'});
+        });
+    };
+
+    // #linkovi na sekcije koje trenutno nisu učitane
+    document.addEventListener('click', function (ev) {
+        var a = ev.target.closest && ev.target.closest('a[href^="#"]');
+        if (!a) return;
+        var id = decodeURIComponent(a.getAttribute('href').slice(1));
+        if (!document.getElementById(id) && id in IDS) {
+            ev.preventDefault();
+            window.nzScrollTo(id);
+        }
+    });
+
+    // Pretraga: učitane sekcije se označavaju odmah, ostale kad se učitaju
+    window.nzOznaci = function (izvor, prva) {
+        oznaka = new RegExp(izvor, 'gi');
+        sekcije.forEach(function (s) { if (s.dataset.stanje === 'ucitana') oznaci(s); });
+        var s = sekcije[prva];
+        if (!s) return;
+        ucitaj(s).then(function () {
+            var m = s.querySelector('mark');
+            (m || s).scrollIntoView({behavior: 'smooth', block: 'center'});
+        });
+    };
+})();
+</script>""".replace("__SCHEME__", SECTION_SCHEME)
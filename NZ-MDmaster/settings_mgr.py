@@ -16,6 +16,16 @@ _DEFAULTS: dict = {
     "default_zoom": 1.0,
     "default_editor": "xdg-open",
     "recent_files": [],
+    "show_render_timings": False,
+    "preview_server": True,
+    "prefetch": True,
+    "live_preview": False,
+    "remember_position": True,
+    "render_budget": 3.0,
+    "render_engine": "python-markdown",
+    "pdf_concurrency": 2,
+    "outline_visible": False,
+    "backlinks_visible": False,
 }
 
 
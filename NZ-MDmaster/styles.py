@@ -298,5 +298,85 @@ def ucitaj_css() -> str:
         }
         .toc ul { list-style-type: none; padding-left: 1em; }
         .toc > ul { padding-left: 0; }
+
+        /* ── Plain text (.txt) ──────────────────────────────── */
+        .nz-txt {
+            background-color: var(--pre-bg);
+            border: 1px solid var(--border);
+            border-radius: 6px;
+            padding: 16px 0;
+        }
+        .nz-txt pre {
+            margin: 0;
+            padding: 0 16px;
+            border: none;
+            border-radius: 0;
+            background-color: transparent;
+            white-space: pre-wrap;
+            overflow-wrap: anywhere;
+            /* Blokovi izvan ekrana se ne layoutuju dok se ne skrola do njih */
+            content-visibility: auto;
+            contain-intrinsic-size: auto 9000px;
+        }
+        /* ── Virtual tables (thousands of rows) ───────────────── */
+        .nz-vtable { margin-bottom: 16px; }
+        .nz-vtable-bar {
+            display: flex;
+            gap: 12px;
+            align-items: center;
+            margin-bottom: 6px;
+            color: var(--fg-muted);
+            font-size: 13px;
+        }
+        .nz-vtable-bar input {
+            flex: 0 1 280px;
+            padding: 4px 8px;
+            color: var(--fg);
+            background-color: var(--bg);
+            border: 1px solid var(--border);
+            border-radius: 6px;
+        }
+        .nz-vtable-scroll {
+            max-height: 70vh;
+            overflow: auto;
+            border: 1px solid var(--table-border);
+        }
+        .nz-vtable table {
+            display: table;
+            table-layout: fixed;
+            width: max-content;
+            min-width: 100%;
+            margin: 0;
+            overflow: visible;
+        }
+        /* Redovi iste visine: skripta računa poziciju iz scrollTop */
+        .nz-vtable td, .nz-vtable th {
+            height: 33px;
+            box-sizing: border-box;
+            white-space: nowrap;
+            overflow: hidden;
+            text-overflow: ellipsis;
+        }
+        .nz-vtable td img { max-height: 20px; }
+        .nz-vtable thead th {
+            position: sticky;
+            top: 0;
+            z-index: 1;
+            cursor: pointer;
+            user-select: none;
+        }
+        .nz-vtable th[data-sort="asc"]::after { content: " ▲"; }
+        .nz-vtable th[data-sort="desc"]::after { content: " ▼"; }
+        .nz-vtable tr { background-color: var(--bg); }
+        .nz-vtable tr.nz-odd { background-color: var(--bg2); }
+        .nz-vtable tr.nz-vtable-spacer td { padding: 0; border: none; height: auto; }
+        .nz-pages {
+            display: flex;
+            gap: 16px;
+            justify-content: center;
+            margin: 8px 0;
+            color: var(--fg-muted);
+            font-size: 13px;
+        }
     </style>
     """
@@ -13,12 +13,31 @@ from PySide6.QtGui import (
 from PySide6.QtWidgets import QWidget
 from PySide6.QtCore import QSize
 
+# Block state: bit 0 = blok završava unutar fenced code bloka,
+# bitovi 1-3 = nivo naslova (0 = nije naslov)
+STATE_FENCE = 1
+_FENCE_RE = re.compile(r'^\s{0,3}(```|~~~)')
+_HEADING_RE = re.compile(r'^(#{1,6})\s+\S')
+
+
+def heading_level(block) -> int:
+    """Nivo ATX naslova zapisan u stanju bloka (0 ako blok nije naslov)."""
+    state = block.userState()
+    return (state >> 1) & 0x7 if state > 0 else 0
+
 
 class MarkdownHighlighter(QSyntaxHighlighter):
-    """Syntax highlighting for markdown in the editor."""
+    """
+    Syntax highlighting for markdown in the editor.
+    Also records fenced-code and heading state per block, so the outline can
+    be updated from just the blocks Qt re-highlights after an edit.
+    """
 
     def __init__(self, document):
         super().__init__(document)
+        # (broj prvog, udaljenost zadnjeg od kraja) re-highlightovanih blokova
+        # od zadnjeg čitanja; brojevi, ne QTextBlock — blok može biti obrisan
+        self.dirty_range = None
         self.rules = []
 
         # Headers (#, ##, ### etc.) — GitHub blue, visible on both themes
@@ -87,6 +106,29 @@ class MarkdownHighlighter(QSyntaxHighlighter):
         for pattern, fmt in self.rules:
             for match in pattern.finditer(text):
                 self.setFormat(match.start(), match.end() - match.start(), fmt)
+        self._update_block_state(text)
+
+    def _update_block_state(self, text):
+        prev = self.previousBlockState()
+        in_fence = prev > 0 and bool(prev & STATE_FENCE)
+        level = 0
+        if _FENCE_RE.match(text):
+            in_fence = not in_fence
+        elif not in_fence:
+            m = _HEADING_RE.match(text)
+            if m:
+                level = len(m.group(1))
+
+        self.setCurrentBlockState((level << 1) | (STATE_FENCE if in_fence else 0))
+        # Prljav je svaki re-highlightovan blok, ne samo naslovi: spajanje
+        # linija može obrisati naslov a da preživjeli blok nikad nije bio naslov.
+        # Udaljenost od kraja se ne mijenja kad kasnija izmjena pomjeri blok.
+        broj = self.currentBlock().blockNumber()
+        od_kraja = self.document().blockCount() - 1 - broj
+        if self.dirty_range is None:
+            self.dirty_range = (broj, od_kraja)
+        else:
+            self.dirty_range = (min(self.dirty_range[0], broj), min(self.dirty_range[1], od_kraja))
 
 
 class LineNumberArea(QWidget):
@@ -0,0 +1,350 @@
+"""
+Virtual tables for the preview — no Qt imports at module level.
+Tables with thousands of rows are taken out of the document: the page gets
+only the header and an empty scroll box, and the rows are fetched once as
+compact JSON (cell HTML per row) from the nzsec: scheme. A small script
+renders just the rows in view and sorts and filters the row data in the page,
+without another render in Python.
+
+Top-level pipe tables are taken from the Markdown source before rendering.
+Rows whose cells contain nothing Markdown would change are split directly;
+only the other rows go through the pipeline, so a data dump does not pay
+the per-cell inline processing cost. Large tables found in the rendered HTML
+(inside lists, or in documents with reference definitions) are virtualized
+after rendering.
+"""
+import re
+import json
+import hashlib
+
+from sections import SECTION_SCHEME
+
+# Tabele sa više redova od ovoga postaju virtuelne
+MIN_REDOVA = 500
+# Širina kolone (u ch) se procjenjuje iz prvih N redova
+_UZORAK = 200
+_MAX_SIRINA = 40
+
+_TABELA = re.compile(r"<table>\n<thead>\n(.*?)</thead>\n<tbody>\n(.*?)</tbody>\n</table>", re.DOTALL)
+_THEAD = re.compile(r"<thead>\n(.*?)</thead>", re.DOTALL)
+_TBODY = re.compile(r"<tbody>\n(.*?)</tbody>", re.DOTALL)
+_RED = re.compile(r"<tr>\n(.*?)</tr>", re.DOTALL)
+_CELIJA = re.compile(r"<t[hd]([^>]*)>(.*?)</t[hd]>\n", re.DOTALL)
+_PORAVNANJE = re.compile(r'text-align:\s*(\w+)|align="(\w+)"')
+_TAG = re.compile(r"<[^>]*>")
+
+# Izvor: razdjelna linija tabele, fence, definicije referenci/fusnota/skraćenica
+_RAZDJELNIK = re.compile(r"^ {0,3}\|?\s*:?-+:?\s*(?:\|\s*:?-+:?\s*)*\|?\s*$")
+_FENCE = re.compile(r"^ {0,3}(`{3,}|~{3,})")
+_NASLOV = re.compile(r"^#{1,6}")
+_DEFINICIJE = re.compile(r"^ {0,3}(?:\[[^\]\n]+\]:|\*\[)", re.MULTILINE)
+# Red sa ovim znakovima ide kroz markdown (inline sintaksa, smarty, magiclink, HTML)
+_POSEBNO = re.compile(r"""[\\`*_\[\]<>&!~=^+{}'"@]|--|\.\.\.|://|www\.""", re.IGNORECASE)
+
+
+def _celije(red: str):
+    """[(poravnanje, html)] ćelija jednog renderovanog reda."""
+    rezultat = []
+    for atributi, sadrzaj in _CELIJA.findall(red):
+        m = _PORAVNANJE.search(atributi)
+        rezultat.append(((m.group(1) or m.group(2)) if m else "", sadrzaj))
+    return rezultat
+
+
+def _podijeli_red(linija: str, kolone: int) -> list:
+    """Ćelije reda izvora, dopunjene/skraćene na broj kolona (kao tables ekstenzija)."""
+    linija = linija.strip()
+    if linija.startswith("|"):
+        linija = linija[1:]
+    if linija.endswith("|"):
+        linija = linija[:-1]
+    celije = [c.strip() for c in linija.split("|")]
+    return (celije + [""] * kolone)[:kolone]
+
+
+class VelikeTabele:
+    """Podaci virtuelnih tabela jednog renderovanja; resurs("t<N>") je JSON redova."""
+
+    def __init__(self):
+        self._podaci = []
+        self._umetanja = {}   # oznaka paragrafa u izvoru -> HTML komponente
+        self.id = None
+
+    def __len__(self):
+        return len(self._podaci)
+
+    def _komponenta(self, zaglavlje, redovi) -> str:
+        """Pamti redove; vraća HTML placeholdera (zaglavlje: [(poravnanje, html)])."""
+        sirine = [len(_TAG.sub("", html)) for _, html in zaglavlje]
+        for red in redovi[:_UZORAK]:
+            sirine = [max(s, len(_TAG.sub("", html))) for s, html in zip(sirine, red)]
+        indeks = len(self._podaci)
+        self._podaci.append(json.dumps(redovi, ensure_ascii=False, separators=(",", ":")))
+        kolone_html = "".join(f'<col style="width:{min(s, _MAX_SIRINA) + 3}ch">' for s in sirine)
+        th = "".join(
+            f'<th data-k="{k}"' + (f' style="text-align: {a};"' if a else "") + f">{html}</th>"
+            for k, (a, html) in enumerate(zaglavlje)
+        )
+        poravnanja = json.dumps([a for a, _ in zaglavlje])
+        return (
+            f'<div class="nz-vtable" data-src="{self.id}/t{indeks}" data-redova="{len(redovi)}"'
+            f" data-poravnanja='{poravnanja}'>"
+            '<div class="nz-vtable-bar"><input type="search"><span></span></div>'
+            '<div class="nz-vtable-scroll"><table>'
+            f"<colgroup>{kolone_html}</colgroup><thead><tr>{th}</tr></thead>"
+            "<tbody></tbody></table></div></div>"
+        )
+
+    def izdvoji_izvor(self, tekst: str, renderuj, min_redova: int = MIN_REDOVA) -> str:
+        """
+        Velike pipe tabele najvišeg nivoa u izvoru zamjenjuje oznakom (paragraf);
+        renderuj(markdown) -> HTML služi za zaglavlje i redove sa markdown sintaksom.
+        Poslije renderovanja cijelog teksta, umetni() stavlja komponente na oznake.
+        """
+        # Ćelija može koristiti referencu definisanu drugdje — tada samo HTML put
+        if _DEFINICIJE.search(tekst):
+            return tekst
+        # Oznaka zavisi od teksta: isti izvor daje isti izmijenjeni tekst (keš rendera)
+        oznaka_tabele = "NZVTABELA" + hashlib.sha1(tekst.encode("utf-8", "surrogatepass")).hexdigest()[:12]
+        linije = tekst.split("\n")
+        izlaz, fence, i, n = [], None, 0, len(linije)
+        while i < n:
+            linija = linije[i]
+            m = _FENCE.match(linija)
+            if m:
+                oznaka = m.group(1)
+                if fence is None:
+                    fence = oznaka
+                elif oznaka[0] == fence[0] and len(oznaka) >= len(fence):
+                    fence = None
+            elif (
+                fence is None and "|" in linija and i + 1 < n
+                and _RAZDJELNIK.match(linije[i + 1])
+                and (i == 0 or not linije[i - 1].strip() or _NASLOV.match(linije[i - 1]))
+                and not linija.startswith(("    ", "\t", ">"))
+            ):
+                kraj = i + 2
+                while kraj < n and linije[kraj].strip():
+                    kraj += 1
+                tabela = None
+                if kraj - i - 2 >= min_redova and all("|" in l for l in linije[i + 2:kraj]):
+                    tabela = self._iz_izvora(linije[i], linije[i + 1], linije[i + 2:kraj], renderuj)
+                if tabela is not None:
+                    oznaka = f"{oznaka_tabele}x{len(self._umetanja)}"
+                    self._umetanja[oznaka] = tabela
+                    izlaz += ["", oznaka, ""]
+                    i = kraj
+                    continue
+            izlaz.append(linija)
+            i += 1
+        return "\n".join(izlaz)
+
+    def _iz_izvora(self, zaglavlje, razdjelnik, linije, renderuj):
+        kolone = razdjelnik.strip().strip("|").count("|") + 1
+        redovi, posebni = [], []
+        for j, linija in enumerate(linije):
+            if _POSEBNO.search(linija):
+                posebni.append(j)
+                redovi.append(None)
+            else:
+                redovi.append(_podijeli_red(linija, kolone))
+        # Zaglavlje i posebni redovi: ista tables ekstenzija, kao jedna mala tabela
+        html = renderuj("\n".join([zaglavlje, razdjelnik] + [linije[j] for j in posebni]))
+        thead, tbody = _THEAD.search(html), _TBODY.search(html)
+        if not thead:
+            return None
+        th = _celije(thead.group(1))
+        renderovani = [[c for _, c in _celije(red)] for red in _RED.findall(tbody.group(1))] if tbody else []
+        if len(th) != kolone or len(renderovani) != len(posebni):
+            return None
+        for j, red in zip(posebni, renderovani):
+            redovi[j] = red
+        return self._komponenta(th, redovi)
+
+    def umetni(self, body: str) -> str:
+        """Komponente na mjesto oznaka iz izdvoji_izvor()."""
+        for oznaka, html in self._umetanja.items():
+            body = body.replace(f"<p>{oznaka}</p>", html, 1)
+        return body
+
+    def izdvoji(self, body: str, min_redova: int = MIN_REDOVA) -> str:
+        """Velike tabele koje su ostale u renderovanom body-ju zamjenjuje placeholderima."""
+        def zamijeni(m):
+            thead, tbody = m.group(1), m.group(2)
+            # Brzo odbacivanje: broj redova bez parsiranja ćelija
+            if tbody.count("<tr>") < min_redova or "<table" in tbody:
+                return m.group(0)
+            zaglavlje = _celije(thead)
+            redovi = [[html for _, html in _celije(red)] for red in _RED.findall(tbody)]
+            if not zaglavlje or any(len(red) != len(zaglavlje) for red in redovi):
+                return m.group(0)
+            return self._komponenta(zaglavlje, redovi)
+        return _TABELA.sub(zamijeni, body)
+
+    def resurs(self, ime: str):
+        if ime.startswith("t") and ime[1:].isdigit() and int(ime[1:]) < len(self._podaci):
+            return self._podaci[int(ime[1:])], "application/json"
+        return None
+
+
+def skripta(tekst_filter: str, tekst_redova: str) -> str:
+    """Script komponente; tekst_redova ima {shown} i {total}."""
+    return _SKRIPTA.replace("__TEKST__", json.dumps(
+        {"filter": tekst_filter, "redova": tekst_redova}
+    ).replace("</", "<\\/"))
+
+
+
+
+_SKRIPTA = """<script>
+(function () {
+    var TEKST = __TEKST__;
+    var VISINA_REDA = 33, REZERVA = 20;
+    var podaci = {};    // data-src -> Promise redova (dijeli se kad se sekcija ponovo učita)
+    var stanja = {};    // data-src -> {kolona, smjer, filter}
+    var ENTITETI = {'&amp;': '&', '&lt;': '<', '&gt;': '>', '&quot;': '"', '&#39;': "'"};
+
+    function tekst(html) {
+        return html.replace(/<[^>]*>/g, '').replace(/&(amp|lt|gt|quot|#39);/g, function (e) {
+            return ENTITETI[e];
+        });
+    }
+
+    function ucitaj(src) {
+        if (!podaci[src]) {
+            podaci[src] = fetch('__SCHEME__:/' + src).then(function (r) { return r.json(); })
+                .then(function (redovi) {
+                    return redovi.map(function (celije, i) {
+                        return {i: i, celije: celije, kljucevi: null};
+                    });
+                });
+        }
+        return podaci[src];
+    }
+
+    function kljucevi(red) {
+        if (!red.kljucevi) red.kljucevi = red.celije.map(tekst);
+        return red.kljucevi;
+    }
+
+    function inicijalizuj(el) {
+        if (el._nz) return;
+        var src = el.dataset.src;
+        var stanje = stanja[src] || (stanja[src] = {kolona: -1, smjer: 1, filter: ''});
+        var poravnanja = JSON.parse(el.dataset.poravnanja);
+        var input = el.querySelector('input'), brojac = el.querySelector('.nz-vtable-bar span');
+        var scroll = el.querySelector('.nz-vtable-scroll'), tbody = el.querySelector('tbody');
+        var kolone = poravnanja.length, svi = [], prikazani = [], tajmer = null;
+        input.placeholder = TEKST.filter;
+        input.value = stanje.filter;
+        el._nz = {};
+
+        function prazan(visina) {
+            return visina > 0 ? '<tr class="nz-vtable-spacer" style="height:' + visina +
+                'px"><td colspan="' + kolone + '"></td></tr>' : '';
+        }
+
+        function crtaj() {
+            var od = Math.max(0, Math.floor(scroll.scrollTop / VISINA_REDA) - REZERVA);
+            var vidljivih = Math.ceil(scroll.clientHeight / VISINA_REDA) + 2 * REZERVA;
+            var _do = Math.min(prikazani.length, od + vidljivih);
+            var html = [prazan(od * VISINA_REDA)];
+            for (var i = od; i < _do; i++) {
+                var red = prikazani[i];
+                html.push('<tr class="' + (i % 2 ? 'nz-odd' : '') + '">');
+                for (var k = 0; k < kolone; k++) {
+                    html.push(poravnanja[k] ? '<td style="text-align: ' + poravnanja[k] + ';">' : '<td>',
+                              red.celije[k], '</td>');
+                }
+                html.push('</tr>');
+            }
+            html.push(prazan((prikazani.length - _do) * VISINA_REDA));
+            tbody.innerHTML = html.join('');
+        }
+
+        function primijeni() {
+            var filter = stanje.filter.toLowerCase();
+            prikazani = filter ? svi.filter(function (red) {
+                return kljucevi(red).some(function (k) { return k.toLowerCase().indexOf(filter) >= 0; });
+            }) : svi.slice();
+            if (stanje.kolona >= 0) {
+                var k = stanje.kolona, smjer = stanje.smjer;
+                var poredi = new Intl.Collator(undefined, {numeric: true, sensitivity: 'base'}).compare;
+                prikazani.sort(function (a, b) {
+                    var x = kljucevi(a)[k], y = kljucevi(b)[k];
+                    var nx = parseFloat(x), ny = parseFloat(y);
+                    var r = (!isNaN(nx) && !isNaN(ny) && nx !== ny) ? nx - ny : poredi(x, y);
+                    return r * smjer || a.i - b.i;
+                });
+            }
+            el.querySelectorAll('th').forEach(function (th) {
+                th.dataset.sort = +th.dataset.k === stanje.kolona ? (stanje.smjer > 0 ? 'asc' : 'desc') : '';
+            });
+            brojac.textContent = TEKST.redova.replace('{shown}', prikazani.length.toLocaleString())
+                .replace('{total}', svi.length.toLocaleString());
+            crtaj();
+        }
+
+        ucitaj(src).then(function (redovi) {
+            svi = redovi;
+            primijeni();
+        });
+        var zakazano = false;
+        scroll.addEventListener('scroll', function () {
+            if (zakazano) return;
+            zakazano = true;
+            window.requestAnimationFrame(function () { zakazano = false; crtaj(); });
+        });
+        input.addEventListener('input', function () {
+            clearTimeout(tajmer);
+            tajmer = setTimeout(function () {
+                stanje.filter = input.value;
+                scroll.scrollTop = 0;
+                primijeni();
+            }, 150);
+        });
+        el.querySelector('thead').addEventListener('click', function (ev) {
+            var th = ev.target.closest('th');
+            if (!th) return;
+            var k = +th.dataset.k;
+            // Klik: rastuće -> opadajuće -> bez sortiranja
+            if (stanje.kolona !== k) { stanje.kolona = k; stanje.smjer = 1; }
+            else if (stanje.smjer > 0) stanje.smjer = -1;
+            else stanje.kolona = -1;
+            primijeni();
+        });
+        el._nz.filtriraj = function (pojam) {
+            input.value = stanje.filter = pojam;
+            scroll.scrollTop = 0;
+            primijeni();
+            return prikazani.length;
+        };
+    }
+
+    window.nzTabeleInit = function (root) {
+        (root || document).querySelectorAll('.nz-vtable').forEach(inicijalizuj);
+    };
+
+    // Pretraga: tabele u kojima se pojam nalazi se filtriraju na njega;
+    // skrol=true: nijedan pogodak van tabela, pa se skrola do prve takve tabele
+    window.nzTabeleTrazi = function (pojam, skrol) {
+        var mali = pojam.toLowerCase();
+        var tabele = Array.prototype.slice.call(document.querySelectorAll('.nz-vtable'));
+        Promise.all(tabele.map(function (el) { return ucitaj(el.dataset.src); })).then(function (sve) {
+            sve.forEach(function (redovi, i) {
+                var ima = redovi.some(function (red) {
+                    return kljucevi(red).some(function (k) { return k.toLowerCase().indexOf(mali) >= 0; });
+                });
+                if (!ima || !tabele[i]._nz) return;
+                tabele[i]._nz.filtriraj(pojam);
+                if (skrol) {
+                    tabele[i].scrollIntoView({block: 'center'});
+                    skrol = false;
+                }
+            });
+        });
+    };
+
+    window.nzTabeleInit();
+})();
+</script>""".replace("__SCHEME__", SECTION_SCHEME)
@@ -0,0 +1,38 @@
+"""
+Text statistics for the status bar — no Qt imports at module level.
+"""
+
+# Prosječna brzina čitanja (riječi u minuti)
+WORDS_PER_MINUTE = 200
+
+
+def izbroj_rijeci(tekst: str) -> int:
+    """Broj riječi (nizova bez whitespace-a) u tekstu."""
+    # str.split() dijeli po istom (Unicode) whitespace-u kao \S+, ali bez regex mašine
+    return len(tekst.split())
+
+
+def minute_citanja(words: int) -> int:
+    """Procijenjeno vrijeme čitanja u minutama (najmanje 1)."""
+    return max(1, round(words / WORDS_PER_MINUTE))
+
+
+class BrojacRijeci:
+    """Broj riječi po liniji; primijeni() prebrojava samo linije koje su se promijenile."""
+
+    def __init__(self):
+        # Prazan dokument ima jednu (praznu) liniju
+        self._linije = [0]
+        self.ukupno = 0
+
+    def primijeni(self, promjene, linije) -> int:
+        """
+        promjene: opsezi linija (stari_od, stari_do) -> (novi_od, novi_do), redom;
+        linije(promjena) daje trenutni tekst linija novi_od..novi_do.
+        """
+        # Od kraja: ranije promjene ne pomjeraju indekse kasnijih
+        for p in reversed(promjene):
+            nove = [izbroj_rijeci(linija) for linija in linije(p)]
+            self.ukupno += sum(nove) - sum(self._linije[p.stari_od:p.stari_do])
+            self._linije[p.stari_od:p.stari_do] = nove
+        return self.ukupno
@@ -0,0 +1,109 @@
+"""
+Render-pipeline instrumentation — no Qt imports at module level.
+Records named spans (file read, Markdown parse, Pygments, HTML assembly,
+setHtml, loadFinished) and exports them in the Chrome trace-event format
+(chrome://tracing, https://ui.perfetto.dev).
+"""
+import os
+import json
+import time
+import threading
+from contextlib import contextmanager
+
+
+class Tracer:
+    """Collects spans for the last render and, optionally, a full event log."""
+
+    def __init__(self):
+        self._t0 = time.perf_counter_ns()
+        self._lock = threading.Lock()
+        # Puni log događaja se vodi samo kad je uključen --trace
+        self.snimaj = False
+        self.dogadjaji = []
+        # Breakdown zadnjeg renderovanja: ime faze -> ms
+        self.zadnja_mjera = {}
+        self._zadrzi = False
+        # Otvoreni asinhroni spanovi (npr. setHtml -> loadFinished)
+        self._otvoreni = {}
+
+    def _sada_us(self) -> float:
+        return (time.perf_counter_ns() - self._t0) / 1000.0
+
+    def nova_mjera(self) -> None:
+        """Počinje breakdown novog renderovanja (osim ako je zadržan)."""
+        with self._lock:
+            if self._zadrzi:
+                self._zadrzi = False
+                return
+            self.zadnja_mjera = {}
+
+    def zadrzi(self) -> None:
+        """Sljedeći nova_mjera() ne briše već izmjerene faze (npr. čitanje fajla)."""
+        with self._lock:
+            self._zadrzi = True
+
+    def zabiljezi(self, ime: str, pocetak_us: float, trajanje_us: float,
+                  sabiraj: bool = False, **args) -> None:
+        """Upisuje završen span u breakdown i (ako se snima) u trace log."""
+        with self._lock:
+            ms = trajanje_us / 1000.0
+            if sabiraj:
+                self.zadnja_mjera[ime] = self.zadnja_mjera.get(ime, 0.0) + ms
+            else:
+                self.zadnja_mjera[ime] = ms
+            if self.snimaj:
+                dogadjaj = {
+                    "name": ime,
+                    "cat": "render",
+                    "ph": "X",
+                    "ts": round(pocetak_us, 3),
+                    "dur": round(trajanje_us, 3),
+                    "pid": os.getpid(),
+                    "tid": threading.get_ident(),
+                }
+                if args:
+                    dogadjaj["args"] = args
+                self.dogadjaji.append(dogadjaj)
+
+    @contextmanager
+    def span(self, ime: str, sabiraj: bool = False, **args):
+        """Mjeri blok koda: `with tracer.span("markdown"): ...`"""
+        pocetak = self._sada_us()
+        try:
+            yield
+        finally:
+            self.zabiljezi(ime, pocetak, self._sada_us() - pocetak, sabiraj, **args)
+
+    def pocni(self, ime: str) -> None:
+        """Otvara span koji se zatvara iz drugog callback-a (zavrsi)."""
+        self._otvoreni[ime] = self._sada_us()
+
+    def zavrsi(self, ime: str, **args) -> None:
+        pocetak = self._otvoreni.pop(ime, None)
+        if pocetak is not None:
+            self.zabiljezi(ime, pocetak, self._sada_us() - pocetak, **args)
+
+    def sacuvaj(self, putanja: str) -> None:
+        """Zapisuje trace u Chrome trace-event JSON formatu."""
+        with self._lock:
+            dogadjaji = list(self.dogadjaji)
+        meta = {
+            "name": "process_name",
+            "ph": "M",
+            "pid": os.getpid(),
+            "args": {"name": "NZ-MDmaster"},
+        }
+        with open(putanja, "w", encoding="utf-8") as f:
+            json.dump({"traceEvents": [meta] + dogadjaji,
+                       "displayTimeUnit": "ms"}, f)
+
+
+def formatiraj_mjeru(mjera: dict) -> str:
+    """Kratak prikaz breakdown-a za status bar: 'read 2 · markdown 41 · ...'"""
+    redoslijed = ("read", "plaintext", "markdown", "pygments", "images", "tables", "sections", "html", "setHtml", "load")
+    dijelovi = [f"{ime} {mjera[ime]:.0f}" for ime in redoslijed if ime in mjera]
+    return " · ".join(dijelovi) + " ms" if dijelovi else ""
+
+
+# Globalni tracer koji dijele main window i render pipeline
+tracer = Tracer()
@@ -21,12 +21,41 @@ TRANSLATIONS: dict = {
         "clear_recent":      "Clear Recent",
         "no_recent_files":   "(No recent files)",
         "export_pdf":        "Export as PDF",
+        "quick_open":        "Quick Open…",
+        "quick_open_placeholder": "Type a file name…",
+        "export_folder_pdf": "Export Folder as PDF...",
+        "check_links":       "Check Links",
+        "lc_col_file":       "File",
+        "lc_col_line":       "Line",
+        "lc_col_link":       "Link",
+        "lc_col_problem":    "Problem",
+        "lc_progress":       "Checking links… {done}/{total} files",
+        "lc_done":           "{count} broken link(s) in {folder}",
+        "lc_missing_file":   "File not found",
+        "lc_missing_image":  "Image not found",
+        "lc_missing_anchor": "Anchor not found",
+        "lc_no_workspace":   "Open a folder or a file first — links are checked in the workspace folder",
         "exit":              "Exit",
         # View menu
         "zoom_in":           "Zoom In",
         "zoom_out":          "Zoom Out",
         "zoom_reset":        "Reset Zoom",
         "toggle_sidebar":    "Toggle Sidebar",
+        "outline":           "Outline",
+        "backlinks":         "Backlinks",
+        "backlinks_none":    "No files in the workspace link here.",
+        "status_workspace_indexed": "Workspace indexed: {count} files",
+        "facet_all":         "All files",
+        "facet_any":         "Any value",
+        "tip_facets":        "Filter files by a front matter field (tags, status, …)",
+        "status_facet_filter": "{count} file(s) match the filter",
+        "txt_page":          "Page {page} of {pages} · lines {first}–{last}",
+        "txt_first":         "« First",
+        "txt_prev":          "‹ Previous",
+        "txt_next":          "Next ›",
+        "txt_last":          "Last »",
+        "vtable_filter":     "Filter rows…",
+        "vtable_rows":       "{shown} of {total} rows",
         # Settings menu
         "sidebar_menu":      "Sidebar",
         "preferences":       "Preferences",
@@ -70,17 +99,32 @@ TRANSLATIONS: dict = {
         # Status bar
         "status_ready":      "Ready 🚀",
         "status_loaded":     "Loaded: {path}",
+        "status_preview_server": "Live preview on http://127.0.0.1:{port} — reloads when the file changes",
         "status_edit":       "Edit mode: {name}",
         "status_preview":    "Preview: {name}",
         "status_reloaded":   "Reloaded: {name}",
         "status_saved":      "Saved: {name}",
+        "status_no_changes": "No changes to save: {name}",
+        "status_recovered":  "Recovered unsaved changes: {name}",
+        "status_journal_err": "Autosave journal error: {err}",
+        "dlg_recover":       "Recover Unsaved Changes",
+        "msg_recover":       "{name} has unsaved changes from a previous session.\n\nRestore them in the editor?",
         "status_trashed":    "Sent to trash: {name}",
         "status_searching":  "Searching: '{term}'...",
         "status_found":      "Found: '{term}' ({count} places)",
         "status_folder":     "Folder: {path}",
         "status_settings":   "Settings saved! ⚙️",
+        "status_render_smanjeni": "Rendering took over {seconds} s — shown without typography, auto-links, abbreviations and language detection",
+        "status_render_tekst": "Rendering took over {seconds} s — shown as plain text",
+        "status_rendering":    "Rendering… shown as plain text until it finishes",
         "status_pdf_saved":  "PDF saved: {path}",
+        "status_pdf_progress": "PDF {done}/{total}: {name} ({ms} ms)",
+        "status_pdf_failed": "PDF {done}/{total}: {name} failed",
+        "status_pdf_batch_done": "PDF export finished: {ok}/{total} files",
+        "status_pdf_none":   "No markdown files in {path}",
         "word_count":        "Words: {words}  ·  ~{minutes} min read",
+        "render_timings":    "⏱ {timings}",
+        "render_debounce":   " · debounce {ms}/{max} ms",
         # Dialog titles
         "dlg_confirm_delete":"Confirm Delete",
         "dlg_error":         "Error",
@@ -115,6 +159,15 @@ TRANSLATIONS: dict = {
         "settings_preview_group":"👁️ Preview Settings",
         "settings_auto_refresh": "Auto-refresh on file change",
         "settings_default_zoom": "Default zoom:",
+        "settings_render_timings": "Show render timings in status bar",
+        "settings_preview_server": "Open in Browser uses a live-reloading local server",
+        "settings_prefetch": "Pre-render linked and neighbouring documents while idle",
+        "settings_live_preview": "Instant split-view preview (rendered in the page while typing)",
+        "settings_remember_position": "Remember the reading position of each file",
+        "settings_render_engine": "Render engine:",
+        "settings_engine_missing": "{name} (not installed)",
+        "settings_render_budget": "Render time limit (then simplified):",
+        "settings_render_budget_off": "Off",
         "settings_save":         "💾 Save",
         "settings_cancel":       "❌ Cancel",
         # About dialog
@@ -192,12 +245,41 @@ TRANSLATIONS: dict = {
         "clear_recent":      "Očisti listu",
         "no_recent_files":   "(Nema nedavnih fajlova)",
         "export_pdf":        "Izvezi kao PDF",
+        "quick_open":        "Brzo otvaranje…",
+        "quick_open_placeholder": "Upiši ime fajla…",
+        "export_folder_pdf": "Izvezi folder kao PDF...",
+        "check_links":       "Provjeri linkove",
+        "lc_col_file":       "Fajl",
+        "lc_col_line":       "Linija",
+        "lc_col_link":       "Link",
+        "lc_col_problem":    "Problem",
+        "lc_progress":       "Provjera linkova… {done}/{total} fajlova",
+        "lc_done":           "{count} pokvarenih linkova u {folder}",
+        "lc_missing_file":   "Fajl ne postoji",
+        "lc_missing_image":  "Slika ne postoji",
+        "lc_missing_anchor": "Anchor ne postoji",
+        "lc_no_workspace":   "Prvo otvorite folder ili fajl — linkovi se provjeravaju u workspace folderu",
         "exit":              "Izlaz",
         # View menu
         "zoom_in":           "Zoom In",
         "zoom_out":          "Zoom Out",
         "zoom_reset":        "Reset Zoom",
         "toggle_sidebar":    "Sakrij/Prikaži sidebar",
+        "outline":           "Sadržaj",
+        "backlinks":         "Povratni linkovi",
+        "backlinks_none":    "Nijedan fajl u workspace-u ne linkuje ovdje.",
+        "status_workspace_indexed": "Workspace indeksiran: {count} fajlova",
+        "facet_all":         "Svi fajlovi",
+        "facet_any":         "Bilo koja vrijednost",
+        "tip_facets":        "Filtriraj fajlove po polju iz front mattera (tags, status, …)",
+        "status_facet_filter": "Filteru odgovara fajlova: {count}",
+        "txt_page":          "Stranica {page} od {pages} · linije {first}–{last}",
+        "txt_first":         "« Prva",
+        "txt_prev":          "‹ Prethodna",
+        "txt_next":          "Sljedeća ›",
+        "txt_last":          "Zadnja »",
+        "vtable_filter":     "Filtriraj redove…",
+        "vtable_rows":       "{shown} od {total} redova",
         # Settings menu
         "sidebar_menu":      "Sidebar",
         "preferences":       "Postavke",
@@ -241,17 +323,32 @@ TRANSLATIONS: dict = {
         # Status bar
         "status_ready":      "Spreman za rad 🚀",
         "status_loaded":     "Učitano: {path}",
+        "status_preview_server": "Live pregled na http://127.0.0.1:{port} — osvježava se kad se fajl promijeni",
         "status_edit":       "Edit mod: {name}",
         "status_preview":    "Preview: {name}",
         "status_reloaded":   "Reloaded: {name}",
         "status_saved":      "Sačuvano: {name}",
+        "status_no_changes": "Nema izmjena za snimanje: {name}",
+        "status_recovered":  "Vraćene nesačuvane izmjene: {name}",
+        "status_journal_err": "Greška autosave journala: {err}",
+        "dlg_recover":       "Oporavak nesačuvanih izmjena",
+        "msg_recover":       "{name} ima nesačuvane izmjene iz prethodne sesije.\n\nVratiti ih u editor?",
         "status_trashed":    "Poslan u smeće: {name}",
         "status_searching":  "Tražim: '{term}'...",
         "status_found":      "Pronađeno: '{term}' ({count} mjesta)",
         "status_folder":     "Folder: {path}",
         "status_settings":   "Postavke sačuvane! ⚙️",
+        "status_render_smanjeni": "Renderovanje je trajalo duže od {seconds} s — prikazano bez tipografije, auto-linkova, skraćenica i prepoznavanja jezika",
+        "status_render_tekst": "Renderovanje je trajalo duže od {seconds} s — prikazano kao običan tekst",
+        "status_rendering":    "Renderovanje… do kraja prikazano kao običan tekst",
         "status_pdf_saved":  "PDF sačuvan: {path}",
+        "status_pdf_progress": "PDF {done}/{total}: {name} ({ms} ms)",
+        "status_pdf_failed": "PDF {done}/{total}: {name} nije uspio",
+        "status_pdf_batch_done": "PDF export završen: {ok}/{total} fajlova",
+        "status_pdf_none":   "Nema markdown fajlova u {path}",
         "word_count":        "Riječi: {words}  ·  ~{minutes} min čitanja",
+        "render_timings":    "⏱ {timings}",
+        "render_debounce":   " · debounce {ms}/{max} ms",
         # Dialog titles
         "dlg_confirm_delete":"Potvrdi brisanje",
         "dlg_error":         "Greška",
@@ -286,6 +383,15 @@ TRANSLATIONS: dict = {
         "settings_preview_group":"👁️ Preview Postavke",
         "settings_auto_refresh": "Auto-refresh pri promjeni fajla",
         "settings_default_zoom": "Default zoom:",
+        "settings_render_timings": "Prikaži trajanje renderovanja u status baru",
+        "settings_preview_server": "Otvaranje u browseru koristi lokalni server sa automatskim osvježavanjem",
+        "settings_prefetch": "Unaprijed renderuj povezane i susjedne dokumente dok aplikacija miruje",
+        "settings_live_preview": "Trenutni pregled u split modu (renderuje se u stranici dok kucate)",
+        "settings_remember_position": "Zapamti poziciju čitanja za svaki fajl",
+        "settings_render_engine": "Engine za renderovanje:",
+        "settings_engine_missing": "{name} (nije instaliran)",
+        "settings_render_budget": "Vremensko ograničenje rendera (zatim pojednostavljeno):",
+        "settings_render_budget_off": "Isključeno",
         "settings_save":         "💾 Sačuvaj",
         "settings_cancel":       "❌ Odustani",
         # About dialog
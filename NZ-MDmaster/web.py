@@ -1,29 +1,81 @@
 """
-Custom WebEngine page and slide-animation content container.
+Custom WebEngine page, double-buffered preview, nzimg: image and nzsec:
+long-document section scheme handlers, and slide-animation content container.
 """
-from PySide6.QtWebEngineCore import QWebEnginePage
-from PySide6.QtGui import QDesktopServices
+import os
+import mimetypes
+import threading
+
+from PySide6.QtWebEngineCore import (
+    QWebEnginePage,
+    QWebEngineUrlScheme,
+    QWebEngineUrlSchemeHandler,
+    QWebEngineUrlRequestJob,
+)
+from PySide6.QtGui import QDesktopServices, QImageReader
 from PySide6.QtWidgets import QWidget
 from PySide6.QtCore import (
     Qt,
     QUrl,
+    QObject,
     Signal,
     QPropertyAnimation,
     QEasingCurve,
     QParallelAnimationGroup,
     QRect,
+    QSize,
+    QBuffer,
+    QRunnable,
+    QThreadPool,
+)
+
+from images import (
+    IMAGE_SCHEME, THUMB_DIR, SKALABILNI, dimenzije_slike, thumbnail_putanja, sirina_bucket,
+    ocisti_thumbnailove,
 )
+from sections import SECTION_SCHEME, parsiraj_url
+
+
+def registruj_sheme():
+    """Registruje custom URL scheme-ove; mora se pozvati PRIJE kreiranja QApplication."""
+    shema = QWebEngineUrlScheme(IMAGE_SCHEME.encode())
+    shema.setSyntax(QWebEngineUrlScheme.Syntax.Path)
+    shema.setFlags(
+        QWebEngineUrlScheme.Flag.SecureScheme
+        | QWebEngineUrlScheme.Flag.LocalScheme
+        | QWebEngineUrlScheme.Flag.LocalAccessAllowed
+    )
+    QWebEngineUrlScheme.registerScheme(shema)
+
+    # Sekcije dugih dokumenata stižu preko fetch() iz stranice
+    shema = QWebEngineUrlScheme(SECTION_SCHEME.encode())
+    shema.setSyntax(QWebEngineUrlScheme.Syntax.Path)
+    shema.setFlags(
+        QWebEngineUrlScheme.Flag.SecureScheme
+        | QWebEngineUrlScheme.Flag.LocalScheme
+        | QWebEngineUrlScheme.Flag.LocalAccessAllowed
+        | QWebEngineUrlScheme.Flag.CorsEnabled
+        | QWebEngineUrlScheme.Flag.FetchApiAllowed
+    )
+    QWebEngineUrlScheme.registerScheme(shema)
 
 
 class BalkanMDPage(QWebEnginePage):
     """Custom page for intercepting .md links."""
 
     md_link_clicked = Signal(str)
+    # nzpage:N linkovi iz navigacije stranica običnog teksta
+    page_requested = Signal(int)
 
     def acceptNavigationRequest(self, url, type_, isMainFrame):
         if type_ != QWebEnginePage.NavigationType.NavigationTypeLinkClicked:
             return True
 
+        if url.scheme() == "nzpage":
+            if url.path().isdigit():
+                self.page_requested.emit(int(url.path()))
+            return False
+
         # Anchor links within page
         if url.hasFragment():
             local_path = url.toLocalFile()
@@ -45,6 +97,245 @@ class BalkanMDPage(QWebEnginePage):
         return True
 
 
+class PreviewBuffer(QObject):
+    """
+    Double-buffered preview: the next document loads into a standby page
+    offscreen, and the view switches to it only once it has finished
+    loading, so navigation never shows a blank page. The page it replaces
+    is frozen and becomes the standby page for the next load.
+    """
+
+    md_link_clicked = Signal(str)
+    page_requested = Signal(int)
+    # loadFinished dokumenta koji je upravo prikazan (poslije zamjene stranica)
+    pregled_spreman = Signal(bool)
+    # Korisnik (ili skripta) je skrolovao prikazanu stranicu
+    skrolovano = Signal()
+
+    def __init__(self, view, parent=None):
+        super().__init__(parent)
+        self.view = view
+        self._stranice = []
+        for _ in range(2):
+            page = BalkanMDPage(view)
+            page.md_link_clicked.connect(self.md_link_clicked)
+            page.page_requested.connect(self.page_requested)
+            page.loadFinished.connect(lambda ok, page=page: self._on_load_finished(page, ok))
+            page.scrollPositionChanged.connect(
+                lambda _, page=page: self.skrolovano.emit() if page is self.view.page() else None
+            )
+            self._stranice.append(page)
+        # Standby stranica koja učitava sljedeći dokument (None = ništa ne čeka)
+        self._ceka = None
+        self._zadrzi_scroll = False
+        view.setPage(self._stranice[0])
+
+    def _standby(self):
+        prva, druga = self._stranice
+        return druga if self.view.page() is prva else prva
+
+    @property
+    def ucitava(self) -> bool:
+        """Sljedeći dokument se još učitava — prikazana stranica je prethodni."""
+        return self._ceka is not None
+
+    def postavi_kanal(self, kanal):
+        """QWebChannel na obje stranice — dokument može završiti na bilo kojoj."""
+        for page in self._stranice:
+            page.setWebChannel(kanal)
+
+    def postavi_html(self, html, base_url, zadrzi_scroll=False):
+        """Učitava dokument u standby stranicu; zadrzi_scroll: isti dokument, ista pozicija."""
+        page = self._standby()
+        if page.lifecycleState() != QWebEnginePage.LifecycleState.Active:
+            page.setLifecycleState(QWebEnginePage.LifecycleState.Active)
+        page.setZoomFactor(self.view.zoomFactor())
+        self._ceka = page
+        self._zadrzi_scroll = zadrzi_scroll
+        page.setHtml(html, base_url)
+
+    def _on_load_finished(self, page, ok):
+        if page is not self._ceka:
+            # Navigacija unutar prikazane stranice (npr. link na lokalni ne-markdown fajl)
+            if page is self.view.page():
+                self.pregled_spreman.emit(ok)
+            return
+        if page.isLoading():
+            # Prekinut učitavanjem novijeg dokumenta — njegov loadFinished tek dolazi
+            return
+        self._ceka = None
+        trenutna = self.view.page()
+        if not self._zadrzi_scroll:
+            self._zamijeni(page, ok, None)
+            return
+        if trenutna.lifecycleState() != QWebEnginePage.LifecycleState.Active:
+            trenutna.setLifecycleState(QWebEnginePage.LifecycleState.Active)
+        trenutna.runJavaScript("window.scrollY", lambda y: self._zamijeni(page, ok, y))
+
+    def _zamijeni(self, page, ok, scroll_y):
+        # Dok se čitao scroll, standby je možda počeo učitavati noviji dokument
+        if self._ceka is not None or page is self.view.page():
+            return
+        skrol = f"window.scrollTo(0, {float(scroll_y)})" if scroll_y else None
+        if skrol:
+            page.runJavaScript(skrol)
+        stara = self.view.page()
+        self.view.setPage(page)
+        # Van pogleda stranica nema stvarnu širinu — ponovi kad je layout konačan
+        if skrol:
+            page.runJavaScript(skrol)
+        stara.setLifecycleState(QWebEnginePage.LifecycleState.Frozen)
+        self.pregled_spreman.emit(ok)
+
+
+class _Posao(QRunnable):
+    """Posao thread poola: fn() van GUI threada, rezultat nazad preko gotovo(rezultat)."""
+
+    def __init__(self, fn, gotovo):
+        super().__init__()
+        self.fn = fn
+        self.gotovo = gotovo
+
+    def run(self):
+        try:
+            rezultat = self.fn()
+        except Exception:
+            rezultat = None
+        self.gotovo(rezultat)
+
+
+class ImageSchemeHandler(QWebEngineUrlSchemeHandler):
+    """
+    Serves nzimg: URLs — local images downscaled to the width the preview
+    actually shows (viewport x zoom x device pixel ratio). Downscaled copies
+    are cached on disk, so a document re-opens without decoding originals.
+    Decoding and writing copies run on a small thread pool; the cache is
+    trimmed by age and total size at startup and after every batch of new
+    copies.
+    """
+
+    # id posla, (podaci, mime) ili None — emituje se iz poola, obrađuje u GUI threadu
+    _gotovo = Signal(int, object)
+
+    # Poslije ovoliko novih kopija keš se ponovo čisti
+    CISCENJE_SVAKIH = 64
+
+    def __init__(self, ciljna_sirina, parent=None):
+        super().__init__(parent)
+        # Callable koji vraća trenutnu širinu pregleda u fizičkim pikselima
+        self.ciljna_sirina = ciljna_sirina
+        self._pool = QThreadPool(self)
+        self._pool.setMaxThreadCount(2)
+        # id -> job koji čeka odgovor (WebEngine ga briše ako se zahtjev prekine)
+        self._poslovi = {}
+        self._sljedeci_id = 0
+        self._novih = 0
+        self._gotovo.connect(self._odgovori)
+        self._pool.start(_Posao(ocisti_thumbnailove, lambda _: None))
+
+    def requestStarted(self, job):
+        putanja = job.requestUrl().path()
+        # Samo slike: nzimg: ne smije postati put do bilo kojeg lokalnog fajla
+        if not putanja.lower().endswith(SKALABILNI):
+            job.fail(QWebEngineUrlRequestJob.Error.RequestDenied)
+            return
+        if not os.path.isfile(putanja):
+            job.fail(QWebEngineUrlRequestJob.Error.UrlNotFound)
+            return
+        self._sljedeci_id += 1
+        posao_id = self._sljedeci_id
+        self._poslovi[posao_id] = job
+        job.destroyed.connect(lambda _=None, posao_id=posao_id: self._poslovi.pop(posao_id, None))
+        # Širina se čita ovdje — widget se ne dira iz poola
+        sirina = sirina_bucket(self.ciljna_sirina())
+        self._pool.start(_Posao(
+            lambda: self._ucitaj(putanja, sirina),
+            lambda rezultat, posao_id=posao_id: self._gotovo.emit(posao_id, rezultat),
+        ))
+
+    def _odgovori(self, posao_id, rezultat):
+        job = self._poslovi.pop(posao_id, None)
+        if job is None:
+            return
+        if rezultat is None:
+            job.fail(QWebEngineUrlRequestJob.Error.RequestFailed)
+            return
+        podaci, mime, nova = rezultat
+        buf = QBuffer(job)
+        buf.setData(podaci)
+        job.reply(mime.encode(), buf)
+        if nova:
+            self._novih += 1
+            if self._novih >= self.CISCENJE_SVAKIH:
+                self._novih = 0
+                self._pool.start(_Posao(ocisti_thumbnailove, lambda _: None))
+
+    def zaustavi(self):
+        self._pool.clear()
+        self._pool.waitForDone()
+
+    @staticmethod
+    def _ucitaj(putanja, sirina):
+        """(podaci, mime, nova kopija?) — radi u thread poolu."""
+        mime = mimetypes.guess_type(putanja)[0] or "application/octet-stream"
+        dim = dimenzije_slike(putanja)
+        if not dim or dim[0] <= sirina:
+            with open(putanja, "rb") as f:
+                return f.read(), mime, False
+
+        thumb = thumbnail_putanja(putanja, sirina)
+        thumb_mime = "image/jpeg" if thumb.endswith(".jpg") else "image/png"
+        if os.path.isfile(thumb):
+            with open(thumb, "rb") as f:
+                podaci = f.read()
+            # mtime = zadnje korištenje, po njemu čišćenje bira šta ostaje
+            try:
+                os.utime(thumb)
+            except OSError:
+                pass
+            return podaci, thumb_mime, False
+
+        # QImageReader dekodira direktno u manju veličinu (JPEG ne dekodira pun raster)
+        reader = QImageReader(putanja)
+        reader.setScaledSize(QSize(sirina, max(1, round(dim[1] * sirina / dim[0]))))
+        slika = reader.read()
+        if slika.isNull():
+            with open(putanja, "rb") as f:
+                return f.read(), mime, False
+
+        os.makedirs(THUMB_DIR, exist_ok=True)
+        # Dva threada mogu praviti istu kopiju — svaki piše u svoj tmp
+        tmp = f"{thumb}.{threading.get_ident()}.tmp"
+        slika.save(tmp, "JPG" if thumb_mime == "image/jpeg" else "PNG", 85)
+        os.replace(tmp, thumb)
+        with open(thumb, "rb") as f:
+            return f.read(), thumb_mime, True
+
+
+class SectionSchemeHandler(QWebEngineUrlSchemeHandler):
+    """
+    Serves nzsec:/<id>/<name> from a SectionStore — a section of a long
+    document (sections.py) or the rows of a virtual table (tables.py).
+    """
+
+    def __init__(self, store, parent=None):
+        super().__init__(parent)
+        self.store = store
+
+    def requestStarted(self, job):
+        adresa = parsiraj_url(job.requestUrl().path())
+        resurs = self.store.resurs(*adresa) if adresa else None
+        if resurs is None:
+            job.fail(QWebEngineUrlRequestJob.Error.UrlNotFound)
+            return
+        tekst, mime = resurs
+        # Stranica je učitana sa file: baze — fetch je cross-origin
+        job.setAdditionalResponseHeaders({b"Access-Control-Allow-Origin": b"*"})
+        buf = QBuffer(job)
+        buf.setData(tekst.encode("utf-8"))
+        job.reply(mime.encode(), buf)
+
+
 class ContentContainer(QWidget):
     """Container with slide animation between preview and editor widgets."""
 
@@ -0,0 +1,249 @@
+"""
+Background workspace indexer.
+A worker thread walks the workspace folder once, then only re-reads files
+whose (mtime, size) changed. Folders are watched with QFileSystemWatcher;
+results are handed to the GUI thread in batches through a queued signal.
+"""
+import os
+import queue
+
+from PySide6.QtCore import QObject, QThread, QTimer, QFileSystemWatcher, Signal
+
+from render import MARKDOWN_EKSTENZIJE, preskoci_folder
+
+# inotify ima sistemski limit na broj watchova; preko ovoga se folderi ne prate
+MAX_PRACENIH_FOLDERA = 2000
+
+_BATCH = 200
+
+
+class _Radnik(QThread):
+    """Obrađuje poslove ("root" | "dir" | "file" | "analizator", argument) iz reda."""
+
+    # {putanja: {ime analizatora: vrijednost}}, lista uklonjenih putanja
+    rezultat = Signal(dict, list)
+    # novi folderi za praćenje
+    folderi = Signal(list)
+    # početni obilazak završen (broj fajlova)
+    skenirano = Signal(int)
+
+    def __init__(self, analizatori, parent=None):
+        super().__init__(parent)
+        # Mijenja se samo u ovom threadu (posao "analizator")
+        self.analizatori = dict(analizatori)
+        self._red = queue.Queue()
+        # putanja -> (mtime_ns, size); koristi se samo u ovom threadu
+        self._stat = {}
+        self._poznati_folderi = set()
+        self._promjene = {}
+        self._uklonjeni = []
+
+    def posalji(self, vrsta, putanja):
+        self._red.put((vrsta, putanja))
+
+    def zaustavi(self):
+        """Prekida i obilazak u toku: petlje provjeravaju isInterruptionRequested()."""
+        self.requestInterruption()
+        self._red.put(None)
+
+    def run(self):
+        while True:
+            posao = self._red.get()
+            poslovi = [posao]
+            # Spoji sve što se nakupilo (isti folder javljen više puta = jedan posao)
+            while True:
+                try:
+                    poslovi.append(self._red.get_nowait())
+                except queue.Empty:
+                    break
+            if None in poslovi:
+                return
+            vidjeni = set()
+            for posao in poslovi:
+                if self.isInterruptionRequested():
+                    return
+                if posao in vidjeni:
+                    continue
+                vidjeni.add(posao)
+                vrsta, putanja = posao
+                if vrsta == "root":
+                    self._uklonjeni.extend(self._stat)
+                    self._stat.clear()
+                    self._poznati_folderi.clear()
+                    self._obidji(putanja)
+                    if self.isInterruptionRequested():
+                        return
+                    self._isprazni()
+                    self.skenirano.emit(len(self._stat))
+                elif vrsta == "analizator":
+                    self._dodaj_analizator(*putanja)
+                elif vrsta == "dir":
+                    self._folder(putanja)
+                else:
+                    self._fajl(putanja)
+            self._isprazni()
+
+    def _isprazni(self):
+        if self._promjene or self._uklonjeni:
+            self.rezultat.emit(self._promjene, self._uklonjeni)
+            self._promjene, self._uklonjeni = {}, []
+
+    def _dodaj_analizator(self, ime, funkcija):
+        """Novi analizator se odmah primjenjuje na sve već poznate fajlove."""
+        self.analizatori[ime] = funkcija
+        for putanja in list(self._stat):
+            if self.isInterruptionRequested():
+                return
+            try:
+                self._promjene.setdefault(putanja, {})[ime] = funkcija(putanja)
+            except Exception as e:
+                print(f"Workspace indeks greška ({putanja}): {e}")
+            if len(self._promjene) >= _BATCH:
+                self._isprazni()
+
+    def _analiziraj(self, putanja, st):
+        kljuc = (st.st_mtime_ns, st.st_size)
+        if self._stat.get(putanja) == kljuc:
+            return
+        self._stat[putanja] = kljuc
+        vrijednosti = {}
+        for ime, funkcija in self.analizatori.items():
+            try:
+                vrijednosti[ime] = funkcija(putanja)
+            except Exception as e:
+                print(f"Workspace indeks greška ({putanja}): {e}")
+        self._promjene[putanja] = vrijednosti
+        if len(self._promjene) >= _BATCH:
+            self._isprazni()
+
+    def _obidji(self, root):
+        novi_folderi = []
+        for folder, dirs, files in os.walk(root):
+            if self.isInterruptionRequested():
+                return
+            dirs[:] = [d for d in dirs if not preskoci_folder(d)]
+            novi_folderi.append(folder)
+            self._poznati_folderi.add(folder)
+            for ime in files:
+                if self.isInterruptionRequested():
+                    return
+                if ime.lower().endswith(MARKDOWN_EKSTENZIJE):
+                    putanja = os.path.join(folder, ime)
+                    try:
+                        self._analiziraj(putanja, os.stat(putanja))
+                    except OSError:
+                        pass
+        self.folderi.emit(novi_folderi)
+
+    def _folder(self, folder):
+        """Folder javljen iz watchera: novi/promijenjeni/obrisani fajlovi i podfolderi."""
+        if not os.path.isdir(folder):
+            prefiks = folder.rstrip(os.sep) + os.sep
+            self._poznati_folderi = {
+                f for f in self._poznati_folderi if f != folder and not f.startswith(prefiks)
+            }
+            for putanja in [p for p in self._stat if p.startswith(prefiks)]:
+                del self._stat[putanja]
+                self._uklonjeni.append(putanja)
+            return
+        prisutni = set()
+        try:
+            with os.scandir(folder) as it:
+                for e in it:
+                    if self.isInterruptionRequested():
+                        return
+                    if e.is_dir(follow_symlinks=False):
+                        if not preskoci_folder(e.name) and e.path not in self._poznati_folderi:
+                            self._obidji(e.path)
+                    elif e.name.lower().endswith(MARKDOWN_EKSTENZIJE):
+                        prisutni.add(e.path)
+                        try:
+                            self._analiziraj(e.path, e.stat())
+                        except OSError:
+                            pass
+        except OSError:
+            return
+        for putanja in [p for p in self._stat if os.path.dirname(p) == folder]:
+            if putanja not in prisutni:
+                del self._stat[putanja]
+                self._uklonjeni.append(putanja)
+
+    def _fajl(self, putanja):
+        try:
+            self._analiziraj(putanja, os.stat(putanja))
+        except OSError:
+            if self._stat.pop(putanja, None) is not None:
+                self._uklonjeni.append(putanja)
+
+
+class WorkspaceIndexer(QObject):
+    """
+    Indeks markdown fajlova u workspace folderu. `analizatori` je dict
+    {ime: funkcija(putanja)}; rezultati stižu kroz `azurirano` u GUI thread.
+    Bez analizatora se prate samo putanje (npr. za quick open).
+    """
+
+    azurirano = Signal(dict, list)
+    skenirano = Signal(int)
+
+    def __init__(self, analizatori=None, parent=None):
+        super().__init__(parent)
+        self.root = None
+        self._analizatori = set(analizatori or {})
+        self._radnik = _Radnik(analizatori or {}, self)
+        self._radnik.rezultat.connect(self.azurirano)
+        self._radnik.skenirano.connect(self.skenirano)
+        self._radnik.folderi.connect(self._prati_foldere)
+        self._radnik.start(QThread.LowPriority)
+
+        self._watcher = QFileSystemWatcher(self)
+        self._watcher.directoryChanged.connect(self._on_folder_changed)
+        self._promijenjeni_folderi = set()
+        self._folder_timer = QTimer(self)
+        self._folder_timer.setSingleShot(True)
+        self._folder_timer.timeout.connect(self._posalji_foldere)
+
+    def postavi_root(self, root):
+        """Novi workspace folder: briše stari indeks i pokreće obilazak u pozadini."""
+        root = os.path.normpath(os.path.abspath(root))
+        if root == self.root:
+            return
+        self.root = root
+        pracene = self._watcher.directories()
+        if pracene:
+            self._watcher.removePaths(pracene)
+        self._radnik.posalji("root", root)
+
+    def dodaj_analizator(self, ime, funkcija):
+        """Uključuje analizator; već indeksirani fajlovi se analiziraju u pozadini."""
+        if ime in self._analizatori:
+            return
+        self._analizatori.add(ime)
+        self._radnik.posalji("analizator", (ime, funkcija))
+
+    def osvjezi_fajl(self, putanja):
+        """Ponovo analiziraj fajl ako mu se promijenio mtime/size (npr. nakon snimanja)."""
+        putanja = os.path.normpath(os.path.abspath(putanja))
+        if self.root and putanja.startswith(self.root.rstrip(os.sep) + os.sep):
+            self._radnik.posalji("file", putanja)
+
+    def zaustavi(self):
+        # Radnik provjerava prekid po fajlu, pa čekanje bez limita traje najviše jednu analizu
+        self._radnik.zaustavi()
+        self._radnik.wait()
+
+    def _prati_foldere(self, folderi):
+        slobodno = MAX_PRACENIH_FOLDERA - len(self._watcher.directories())
+        if slobodno > 0:
+            self._watcher.addPaths(folderi[:slobodno])
+
+    def _on_folder_changed(self, folder):
+        self._promijenjeni_folderi.add(folder)
+        self._folder_timer.start(200)
+
+    def _posalji_foldere(self):
+        for folder in self._promijenjeni_folderi:
+            # Zakašnjeli događaji iz prethodnog root-a se ignorišu
+            if self.root and (folder + os.sep).startswith(self.root.rstrip(os.sep) + os.sep):
+                self._radnik.posalji("dir", folder)
+        self._promijenjeni_folderi.clear()
@@ -0,0 +1,223 @@
+"""
+Golden-file compatibility check for the render engines.
+
+Every compat/<case>.md exercises one extension of our set; compat/<case>.html
+is the reference output of Python-Markdown. Each engine's HTML is normalized
+(attribute order, entities, insignificant whitespace) and diffed against it:
+
+    python3 benchmarks/compat.py                  # summary for every installed engine
+    python3 benchmarks/compat.py --diff mistune   # plus the diffs of one engine
+    python3 benchmarks/compat.py --update         # regenerate the golden files
+
+The instant split-view preview (NZ-MDmaster/live.js on the vendored marked)
+is checked the same way as the "live" column when node is installed; its code
+blocks are compared without the Pygments colour spans.
+
+Exit status is 1 if the reference engine or the live preview no longer
+matches the golden files (or, with --strict, if any engine differs).
+"""
+import os
+import sys
+import glob
+import json
+import shutil
+import difflib
+import argparse
+import subprocess
+from html.parser import HTMLParser
+
+OVDJE = os.path.dirname(os.path.abspath(__file__))
+APLIKACIJA = os.path.join(os.path.dirname(OVDJE), "NZ-MDmaster")
+sys.path.insert(0, APLIKACIJA)
+SLUCAJEVI = os.path.join(OVDJE, "compat")
+LIVE = "live"
+
+from engines import ENGINES, PODRAZUMIJEVANI, dostupni  # noqa: E402
+from render import renderuj_markdown  # noqa: E402
+
+
+class _Normalizator(HTMLParser):
+    """HTML -> jedan token po liniji; atributi sortirani, entiteti razriješeni."""
+
+    def __init__(self, bez_boja=False):
+        super().__init__(convert_charrefs=True)
+        self.linije = []
+        self._pre = 0
+        # Pygments <span>-ovi u <pre> se preskaču, a tekst između njih spaja
+        self._bez_boja = bez_boja
+        self._spoji = False
+        self._zadnji = ""
+
+    def _tag(self, tag, attrs):
+        # style="text-align: right;" == style="text-align:right"
+        attrs = [
+            (k, ";".join(d.replace(" ", "") for d in v.split(";") if d.strip()) if k == "style" and v else v)
+            for k, v in attrs
+        ]
+        atributi = "".join(f' {k}="{v}"' if v is not None else f" {k}" for k, v in sorted(attrs))
+        self.linije.append(f"<{tag}{atributi}>")
+
+    def _boja(self, tag):
+        return self._bez_boja and self._pre and tag == "span"
+
+    def handle_starttag(self, tag, attrs):
+        if self._boja(tag):
+            return
+        self._tag(tag, attrs)
+        self._spoji = False
+        if tag == "pre":
+            self._pre += 1
+
+    def handle_startendtag(self, tag, attrs):
+        self._tag(tag, attrs)
+        self._spoji = False
+
+    def handle_endtag(self, tag):
+        if self._boja(tag):
+            return
+        if tag == "pre":
+            self._pre = max(0, self._pre - 1)
+        self.linije.append(f"</{tag}>")
+        self._spoji = False
+
+    def handle_data(self, data):
+        # U <pre> je razmak sadržaj; drugdje ga browser ionako sažima
+        tekst = data if self._pre else " ".join(data.split())
+        if not tekst:
+            return
+        if self._pre and self._spoji:
+            self._zadnji += tekst
+            self.linije[-1] = repr(self._zadnji)
+        else:
+            self._zadnji = tekst
+            self.linije.append(repr(tekst) if self._pre else tekst)
+        self._spoji = self._bez_boja and bool(self._pre)
+
+
+def normalizuj(html: str, bez_boja: bool = False) -> list:
+    n = _Normalizator(bez_boja)
+    n.feed(html)
+    n.close()
+    return n.linije
+
+
+def slucajevi() -> list:
+    return sorted(os.path.splitext(os.path.basename(p))[0] for p in glob.glob(os.path.join(SLUCAJEVI, "*.md")))
+
+
+def _procitaj(ime: str, ekstenzija: str) -> str:
+    with open(os.path.join(SLUCAJEVI, ime + ekstenzija), "r", encoding="utf-8") as f:
+        return f.read()
+
+
+def azuriraj():
+    for ime in slucajevi():
+        html = renderuj_markdown(_procitaj(ime, ".md"), engine=PODRAZUMIJEVANI)
+        with open(os.path.join(SLUCAJEVI, ime + ".html"), "w", encoding="utf-8") as f:
+            f.write(html + "\n")
+        print(f"  {ime}.html")
+
+
+def _razlika(kolona: str, ime: str, html: str, prikazi_diff: bool, bez_boja: bool = False) -> int:
+    ocekivano = normalizuj(_procitaj(ime, ".html"), bez_boja)
+    dobijeno = normalizuj(html, bez_boja)
+    diff = list(difflib.unified_diff(
+        ocekivano, dobijeno, f"golden/{ime}", f"{kolona}/{ime}", lineterm="", n=1,
+    ))
+    if prikazi_diff and diff:
+        print("\n".join(diff) + "\n")
+    return sum(1 for d in diff[2:] if d[:1] in "+-")
+
+
+def uporedi(engine: str, prikazi_diff: bool = False) -> dict:
+    """{slučaj: broj različitih linija} za jedan engine (0 = isto kao referenca)."""
+    return {
+        ime: _razlika(engine, ime, renderuj_markdown(_procitaj(ime, ".md"), engine=engine), prikazi_diff)
+        for ime in slucajevi()
+    }
+
+
+# live.js očekuje globalni marked i window; u node-u je window sam global
+_LIVE_NODE = """
+global.window = global;
+global.marked = require(process.argv[1]);
+require(process.argv[2]);
+const ulaz = JSON.parse(require('fs').readFileSync(0, 'utf8'));
+const izlaz = {};
+for (const ime in ulaz) izlaz[ime] = window.nzLiveRender.dokument(ulaz[ime]);
+process.stdout.write(JSON.stringify(izlaz));
+"""
+
+
+def uporedi_live(prikazi_diff: bool = False):
+    """Kao uporedi() za live preview (live.js u node-u); None ako node nije instaliran."""
+    node = shutil.which("node")
+    if not node:
+        return None
+    ulaz = {ime: _procitaj(ime, ".md") for ime in slucajevi()}
+    proces = subprocess.run(
+        [node, "-e", _LIVE_NODE,
+         os.path.join(APLIKACIJA, "vendor", "marked", "marked.js"), os.path.join(APLIKACIJA, "live.js")],
+        input=json.dumps(ulaz), capture_output=True, text=True, encoding="utf-8", check=True,
+    )
+    html = json.loads(proces.stdout)
+    return {ime: _razlika(LIVE, ime, html[ime], prikazi_diff, bez_boja=True) for ime in slucajevi()}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="NZ-MDmaster render engine compatibility check")
+    parser.add_argument("--update", action="store_true",
+                        help="regenerate the golden files with the reference engine")
+    parser.add_argument("--engines", nargs="*", choices=sorted(ENGINES),
+                        help="engines to check (default: all installed)")
+    parser.add_argument("--diff", nargs="*", metavar="ENGINE", default=None,
+                        help="print the normalized diffs (of the given engines, or all)")
+    parser.add_argument("--strict", action="store_true",
+                        help="exit 1 if any engine differs from the golden output")
+    args = parser.parse_args()
+
+    if args.update:
+        azuriraj()
+        return
+
+    imena = args.engines or [e.ime for e in dostupni()]
+    neinstalirani = [ime for ime in imena if not ENGINES[ime].dostupan()]
+    for ime in neinstalirani:
+        print(f"{ime}: not installed (pip install {ENGINES[ime].modul.replace('_', '-')})")
+    imena = [ime for ime in imena if ime not in neinstalirani]
+
+    tabela = {}
+    for ime in imena:
+        diff = args.diff is not None and (not args.diff or ime in args.diff)
+        tabela[ime] = uporedi(ime, diff)
+    live = uporedi_live(args.diff is not None and (not args.diff or LIVE in args.diff))
+    if live is None:
+        print(f"{LIVE}: not checked (node not installed)")
+    else:
+        tabela[LIVE] = live
+        imena.append(LIVE)
+
+    print(f"{'case':16}" + "".join(f"{ime:>18}" for ime in imena))
+    for slucaj in slucajevi():
+        print(f"{slucaj:16}" + "".join(
+            f"{'ok' if tabela[ime][slucaj] == 0 else str(tabela[ime][slucaj]) + ' lines':>18}"
+            for ime in imena
+        ))
+    print(f"{'identical':16}" + "".join(
+        f"{sum(1 for v in tabela[ime].values() if v == 0)}/{len(tabela[ime])}".rjust(18)
+        for ime in imena
+    ))
+
+    referenca = tabela.get(PODRAZUMIJEVANI, {})
+    if any(referenca.values()):
+        print(f"\n{PODRAZUMIJEVANI} differs from its golden files — run with --update if intended")
+        sys.exit(1)
+    if any(tabela.get(LIVE, {}).values()):
+        print(f"\nthe live preview differs from the golden files — see --diff {LIVE}")
+        sys.exit(1)
+    if args.strict and any(v for r in tabela.values() for v in r.values()):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,139 @@
+"""
+Synthetic Markdown corpus generator for the benchmark suite.
+
+Every document is generated from a seeded RNG, so the same seed and scale
+always produce byte-identical input and results stay comparable between runs.
+
+    python3 benchmarks/corpus.py --out /tmp/nzmd-corpus --scale 1.0
+"""
+import os
+import random
+import argparse
+
+_RIJECI = (
+    "markdown preview editor render table heading list code block link image "
+    "footnote paragraph document section viewer split file folder theme zoom "
+    "search export reload cache index anchor budget latency throughput sample"
+).split()
+
+_JEZICI = ("python", "javascript", "bash", "json", "c", "rust", "")
+
+
+def _recenica(rng: random.Random, min_r: int = 6, max_r: int = 18) -> str:
+    rijeci = [rng.choice(_RIJECI) for _ in range(rng.randint(min_r, max_r))]
+    rijeci[0] = rijeci[0].capitalize()
+    # Malo inline formatiranja da parser ima posla
+    if len(rijeci) > 4 and rng.random() < 0.3:
+        rijeci[2] = f"**{rijeci[2]}**"
+    if len(rijeci) > 6 and rng.random() < 0.3:
+        rijeci[5] = f"`{rijeci[5]}`"
+    return " ".join(rijeci) + "."
+
+
+def velike_tabele(rng: random.Random, tabela: int = 5, redova: int = 400, kolona: int = 6) -> str:
+    """Nekoliko velikih tabela."""
+    dijelovi = []
+    for t in range(tabela):
+        dijelovi.append(f"## Table {t + 1}\n")
+        dijelovi.append("| " + " | ".join(f"Col {c}" for c in range(kolona)) + " |")
+        dijelovi.append("|" + "---|" * kolona)
+        for r in range(redova):
+            celije = [str(rng.randint(0, 10 ** 6)) if c % 2 else rng.choice(_RIJECI)
+                      for c in range(kolona)]
+            dijelovi.append("| " + " | ".join(celije) + " |")
+        dijelovi.append("")
+    return "\n".join(dijelovi)
+
+
+def code_blokovi(rng: random.Random, blokova: int = 300) -> str:
+    """Mnogo fenced code blokova, dio bez jezika (guess_lang)."""
+    dijelovi = []
+    for b in range(blokova):
+        jezik = rng.choice(_JEZICI)
+        dijelovi.append(_recenica(rng))
+        dijelovi.append("")
+        dijelovi.append(f"```{jezik}")
+        for i in range(rng.randint(4, 20)):
+            dijelovi.append(f"value_{b}_{i} = compute({i}, '{rng.choice(_RIJECI)}')  # step {i}")
+        dijelovi.append("```")
+        dijelovi.append("")
+    return "\n".join(dijelovi)
+
+
+def duboke_liste(rng: random.Random, lista: int = 60, dubina: int = 8) -> str:
+    """Duboko ugniježđene liste (bullet i numerisane)."""
+    dijelovi = []
+    for _ in range(lista):
+        for nivo in range(dubina):
+            uvlaka = "    " * nivo
+            oznaka = "-" if nivo % 2 == 0 else "1."
+            for _ in range(rng.randint(1, 3)):
+                dijelovi.append(f"{uvlaka}{oznaka} {_recenica(rng, 3, 8)}")
+        dijelovi.append("")
+    return "\n".join(dijelovi)
+
+
+def dugi_paragrafi(rng: random.Random, paragrafa: int = 400) -> str:
+    """Dugi paragrafi teksta sa inline formatiranjem."""
+    return "\n\n".join(
+        " ".join(_recenica(rng) for _ in range(rng.randint(8, 20)))
+        for _ in range(paragrafa)
+    ) + "\n"
+
+
+def fusnote(rng: random.Random, fusnota: int = 1000) -> str:
+    """Tekst sa mnogo fusnota."""
+    tekst = [f"{_recenica(rng)}[^{i}]" for i in range(fusnota)]
+    definicije = [f"[^{i}]: {_recenica(rng, 3, 8)}" for i in range(fusnota)]
+    return "\n\n".join(tekst) + "\n\n" + "\n".join(definicije) + "\n"
+
+
+def naslovi(rng: random.Random, naslova: int = 10000) -> str:
+    """10k+ naslova sa kratkim tekstom ispod (toc ekstenzija, anchori)."""
+    dijelovi = []
+    for i in range(naslova):
+        nivo = 1 + (i % 4)
+        dijelovi.append(f"{'#' * nivo} {rng.choice(_RIJECI).capitalize()} {i}")
+        dijelovi.append("")
+        dijelovi.append(_recenica(rng, 4, 10))
+        dijelovi.append("")
+    return "\n".join(dijelovi)
+
+
+# ime -> (generator, ime glavnog parametra, default vrijednost)
+GENERATORI = {
+    "tables": (velike_tabele, "redova", 400),
+    "code_blocks": (code_blokovi, "blokova", 300),
+    "deep_lists": (duboke_liste, "lista", 60),
+    "paragraphs": (dugi_paragrafi, "paragrafa", 400),
+    "footnotes": (fusnote, "fusnota", 1000),
+    "headings": (naslovi, "naslova", 10000),
+}
+
+
+def generisi_korpus(seed: int = 1234, scale: float = 1.0) -> dict:
+    """Vraća {ime: markdown tekst}. `scale` množi veličinu svakog dokumenta."""
+    korpus = {}
+    for ime, (generator, parametar, default) in GENERATORI.items():
+        rng = random.Random(f"{seed}:{ime}")
+        korpus[ime] = generator(rng, **{parametar: max(1, int(default * scale))})
+    return korpus
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--out", required=True, help="output directory")
+    parser.add_argument("--seed", type=int, default=1234)
+    parser.add_argument("--scale", type=float, default=1.0)
+    args = parser.parse_args()
+
+    os.makedirs(args.out, exist_ok=True)
+    for ime, tekst in generisi_korpus(args.seed, args.scale).items():
+        putanja = os.path.join(args.out, f"{ime}.md")
+        with open(putanja, "w", encoding="utf-8") as f:
+            f.write(tekst)
+        print(f"{putanja}  ({len(tekst.encode('utf-8')) / 1024:.0f} KiB)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,247 @@
+"""
+Benchmark suite for the render pipeline and the editor.
+
+Measures, for every document of the synthetic corpus (see corpus.py):
+  - render/<doc>     preview render throughput (MB/s): the path of
+                     MarkdownViewer._renderuj_html without the watchdog and cache —
+                     izdvoji_tabele, renderuj_markdown, dovrsi_body (images, big
+                     tables, sections) and sastavi_html
+  - engine/<e>/<doc> renderuj_markdown throughput per installed engine (MB/s)
+  - highlight/<doc>  MarkdownHighlighter.rehighlight() on a QTextDocument
+  - words/<doc>      izbroj_rijeci() used by the status bar
+  - words-edit/<doc> BrojacRijeci update after a one-line edit (typing in the editor)
+  - load/<doc>       setHtml -> loadFinished in QWebEnginePage (if available)
+
+Qt benchmarks run under QT_QPA_PLATFORM=offscreen. Results are written as
+JSON and can be compared against an earlier run:
+
+    python3 benchmarks/run_benchmarks.py --out results.json
+    python3 benchmarks/run_benchmarks.py --baseline results.json --out new.json
+"""
+import os
+import sys
+import json
+import time
+import platform
+import argparse
+import statistics
+import subprocess
+
+OVDJE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, OVDJE)
+sys.path.insert(0, os.path.join(os.path.dirname(OVDJE), "NZ-MDmaster"))
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from corpus import generisi_korpus  # noqa: E402
+from render import renderuj_markdown, sastavi_html, izdvoji_tabele, dovrsi_body  # noqa: E402
+from engines import dostupni  # noqa: E402
+from styles import ucitaj_css  # noqa: E402
+from textstats import BrojacRijeci, izbroj_rijeci  # noqa: E402
+
+
+def _mjeri(funkcija, ponavljanja: int) -> dict:
+    """Pokreće funkciju `ponavljanja` puta i vraća statistiku u ms."""
+    vremena = []
+    for _ in range(ponavljanja):
+        t0 = time.perf_counter()
+        funkcija()
+        vremena.append((time.perf_counter() - t0) * 1000.0)
+    return {
+        "min_ms": round(min(vremena), 3),
+        "median_ms": round(statistics.median(vremena), 3),
+        "mean_ms": round(statistics.fmean(vremena), 3),
+        "runs": ponavljanja,
+    }
+
+
+def _pregled(tekst: str, css: str) -> str:
+    """Pregled dokumenta kao u MarkdownViewer._renderuj_html, sinhrono."""
+    tekst, tabele = izdvoji_tabele(tekst, OVDJE, renderuj_markdown)
+    return sastavi_html(dovrsi_body(renderuj_markdown(tekst), OVDJE, tabele), css)
+
+
+def bench_render(korpus: dict, ponavljanja: int) -> dict:
+    css = ucitaj_css()
+    rezultati = {}
+    for ime, tekst in korpus.items():
+        r = _mjeri(lambda: _pregled(tekst, css), ponavljanja)
+        mb = len(tekst.encode("utf-8")) / 1e6
+        r["mb_per_s"] = round(mb / (r["median_ms"] / 1000.0), 3)
+        rezultati[f"render/{ime}"] = r
+    return rezultati
+
+
+def bench_engines(korpus: dict, ponavljanja: int) -> dict:
+    """Isti korpus kroz svaki instalirani engine; ukupni MB/s po engine-u na kraju."""
+    rezultati = {}
+    ukupno_mb = sum(len(tekst.encode("utf-8")) for tekst in korpus.values()) / 1e6
+    for engine in dostupni():
+        ukupno_s = 0.0
+        for ime, tekst in korpus.items():
+            r = _mjeri(lambda: renderuj_markdown(tekst, engine=engine.ime), ponavljanja)
+            mb = len(tekst.encode("utf-8")) / 1e6
+            r["mb_per_s"] = round(mb / (r["median_ms"] / 1000.0), 3)
+            rezultati[f"engine/{engine.ime}/{ime}"] = r
+            ukupno_s += r["median_ms"] / 1000.0
+        print(f"  {engine.naziv} {engine.verzija()}: {ukupno_mb / ukupno_s:.2f} MB/s on the whole corpus")
+    return rezultati
+
+
+def bench_words(korpus: dict, ponavljanja: int) -> dict:
+    from changes import Promjena
+    rezultati = {}
+    for ime, tekst in korpus.items():
+        rezultati[f"words/{ime}"] = _mjeri(lambda: izbroj_rijeci(tekst), ponavljanja)
+        # Editor: brojač je već napunjen, kucanje mijenja jednu liniju u sredini
+        linije = tekst.split("\n")
+        brojac = BrojacRijeci()
+        brojac.primijeni([Promjena(0, 0, len(tekst), 0, 1, 0, len(linije))], lambda p: linije)
+        k = len(linije) // 2
+        promjena = [Promjena(0, 1, 1, k, k + 1, k, k + 1)]
+        rezultati[f"words-edit/{ime}"] = _mjeri(
+            lambda: brojac.primijeni(promjena, lambda p: linije[p.novi_od:p.novi_do]), ponavljanja
+        )
+    return rezultati
+
+
+def _qt_app():
+    from PySide6.QtWidgets import QApplication
+    return QApplication.instance() or QApplication([sys.argv[0]])
+
+
+def bench_highlight(korpus: dict, ponavljanja: int) -> dict:
+    try:
+        app = _qt_app()
+        from PySide6.QtGui import QTextDocument
+        from syntax import MarkdownHighlighter
+    except ImportError as e:
+        print(f"  highlight: preskočeno ({e})")
+        return {}
+    rezultati = {}
+    for ime, tekst in korpus.items():
+        doc = QTextDocument()
+        doc.setPlainText(tekst)
+        highlighter = MarkdownHighlighter(doc)
+        rezultati[f"highlight/{ime}"] = _mjeri(highlighter.rehighlight, ponavljanja)
+        # Eksplicitno odvoji highlighter od dokumenta prije gašenja interpretera
+        highlighter.setDocument(None)
+        del highlighter, doc
+        app.processEvents()
+    return rezultati
+
+
+def bench_load(korpus: dict, ponavljanja: int, timeout_s: float = 60.0) -> dict:
+    try:
+        app = _qt_app()
+        from PySide6.QtCore import QEventLoop, QTimer, QUrl
+        from PySide6.QtWebEngineCore import QWebEnginePage
+    except ImportError as e:
+        print(f"  load: preskočeno ({e})")
+        return {}
+    css = ucitaj_css()
+    page = QWebEnginePage()
+    rezultati = {}
+    for ime, tekst in korpus.items():
+        html = _pregled(tekst, css)
+
+        def jedno_ucitavanje():
+            petlja = QEventLoop()
+            page.loadFinished.connect(petlja.quit)
+            QTimer.singleShot(int(timeout_s * 1000), petlja.quit)
+            page.setHtml(html, QUrl.fromLocalFile(OVDJE + "/"))
+            petlja.exec()
+            page.loadFinished.disconnect(petlja.quit)
+
+        r = _mjeri(jedno_ucitavanje, ponavljanja)
+        r["html_bytes"] = len(html.encode("utf-8"))
+        rezultati[f"load/{ime}"] = r
+        app.processEvents()
+    return rezultati
+
+
+def _meta(args) -> dict:
+    import markdown
+    try:
+        rev = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=OVDJE,
+            capture_output=True, text=True, timeout=5,
+        ).stdout.strip()
+    except Exception:
+        rev = ""
+    return {
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "git_rev": rev,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "markdown": markdown.__version__,
+        "seed": args.seed,
+        "scale": args.scale,
+    }
+
+
+def uporedi(rezultati: dict, baseline: dict, prag: float) -> list:
+    """Vraća listu (ključ, baseline_ms, novo_ms, omjer) za regresije iznad praga."""
+    regresije = []
+    print(f"\n{'benchmark':32} {'baseline':>10} {'current':>10} {'ratio':>7}")
+    for kljuc, novo in sorted(rezultati.items()):
+        staro = baseline.get(kljuc)
+        if not staro:
+            continue
+        omjer = novo["median_ms"] / staro["median_ms"] if staro["median_ms"] else 1.0
+        oznaka = "  REGRESSION" if omjer > 1.0 + prag else ""
+        print(f"{kljuc:32} {staro['median_ms']:>10.2f} {novo['median_ms']:>10.2f} "
+              f"{omjer:>7.2f}{oznaka}")
+        if oznaka:
+            regresije.append((kljuc, staro["median_ms"], novo["median_ms"], omjer))
+    return regresije
+
+
+def main():
+    parser = argparse.ArgumentParser(description="NZ-MDmaster benchmark suite")
+    parser.add_argument("--out", help="write results JSON here")
+    parser.add_argument("--baseline", help="compare against this results JSON")
+    parser.add_argument("--threshold", type=float, default=0.10,
+                        help="allowed slowdown vs baseline (default 0.10 = 10%%)")
+    parser.add_argument("--seed", type=int, default=1234)
+    parser.add_argument("--scale", type=float, default=1.0)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--only", nargs="*",
+                        choices=("render", "engines", "highlight", "words", "load"),
+                        help="run only these groups")
+    args = parser.parse_args()
+
+    korpus = generisi_korpus(args.seed, args.scale)
+    grupe = {
+        "render": bench_render,
+        "engines": bench_engines,
+        "highlight": bench_highlight,
+        "words": bench_words,
+        "load": bench_load,
+    }
+    rezultati = {}
+    for ime, funkcija in grupe.items():
+        if args.only and ime not in args.only:
+            continue
+        print(f"[{ime}]")
+        dio = funkcija(korpus, args.repeat)
+        for kljuc, r in dio.items():
+            dodatak = f"  {r['mb_per_s']:.2f} MB/s" if "mb_per_s" in r else ""
+            print(f"  {kljuc:30} {r['median_ms']:>10.2f} ms{dodatak}")
+        rezultati.update(dio)
+
+    izlaz = {"meta": _meta(args), "results": rezultati}
+    if args.out:
+        os.makedirs(os.path.dirname(os.path.abspath(args.out)), exist_ok=True)
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(izlaz, f, indent=2)
+        print(f"\nResults: {args.out}")
+
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            baseline = json.load(f).get("results", {})
+        if uporedi(rezultati, baseline, args.threshold):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
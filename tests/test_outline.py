@@ -0,0 +1,114 @@
+"""
+HeadingIndex against a full scan of the editor document after edits that
+delete, merge and split heading lines.
+"""
+import os
+import sys
+import ctypes
+import random
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "NZ-MDmaster"))
+
+import pytest  # noqa: E402
+from PySide6.QtWidgets import QApplication  # noqa: E402
+from PySide6.QtGui import QTextCursor  # noqa: E402
+
+from editor import MarkdownEditor  # noqa: E402
+from outline import HeadingIndex, _HEADING_MARKS  # noqa: E402
+from syntax import heading_level  # noqa: E402
+
+# PySide6 6.12 pri svakom QSyntaxHighlighter.setFormat oduzme jednu referencu
+# na None; prije Pythona 3.12 None nije besmrtan pa bi test srušio interpreter.
+# Rezerva referenci se namjerno nikad ne oslobađa (ni pri gašenju).
+if sys.version_info < (3, 12):
+    ctypes.pythonapi.Py_IncRef(ctypes.py_object([None] * 1_000_000))
+
+
+@pytest.fixture(scope="module")
+def app():
+    return QApplication.instance() or QApplication([])
+
+
+@pytest.fixture
+def editor(app):
+    editor = MarkdownEditor()
+    indeksi[editor] = HeadingIndex(editor.document())
+    yield editor
+    del indeksi[editor]
+    editor.deleteLater()
+
+
+indeksi = {}
+
+
+def osvjezi(editor):
+    dirty = editor.highlighter.dirty_range
+    if dirty is not None:
+        editor.highlighter.dirty_range = None
+        indeksi[editor].update(dirty)
+    return indeksi[editor].entries()
+
+
+def svi_naslovi(editor):
+    rezultat = []
+    block = editor.document().begin()
+    while block.isValid():
+        if heading_level(block):
+            tekst = _HEADING_MARKS.sub("", block.text()).strip()
+            rezultat.append((heading_level(block), tekst, block.blockNumber()))
+        block = block.next()
+    return rezultat
+
+
+def zamijeni(editor, pocetak, kraj, tekst):
+    cursor = QTextCursor(editor.document())
+    cursor.setPosition(pocetak)
+    cursor.setPosition(kraj, QTextCursor.KeepAnchor)
+    cursor.insertText(tekst)
+
+
+def test_brisanje_linije_naslova(editor):
+    editor.setPlainText("# a\ntekst\n## b\nx\n### c\n")
+    assert osvjezi(editor) == [(1, "a", 0), (2, "b", 2), (3, "c", 4)]
+    tekst = editor.toPlainText()
+    pocetak = tekst.index("## b")
+    zamijeni(editor, pocetak, pocetak + len("## b\n"), "")
+    assert osvjezi(editor) == [(1, "a", 0), (3, "c", 3)]
+
+
+def test_spajanje_naslova_sa_prethodnom_linijom(editor):
+    editor.setPlainText("# a\ntekst\n## b\n### c\n")
+    osvjezi(editor)
+    # "tekst" + "## b" postaje jedna linija koja nikad nije bila naslov
+    pocetak = editor.toPlainText().index("\n## b")
+    zamijeni(editor, pocetak, pocetak + 1, "")
+    assert osvjezi(editor) == [(1, "a", 0), (3, "c", 2)]
+
+
+def test_spajanje_dva_naslova(editor):
+    editor.setPlainText("# a\n## b\nx\n")
+    osvjezi(editor)
+    zamijeni(editor, 3, 4, "")
+    assert osvjezi(editor) == [(1, "a## b", 0)]
+    # Razdvajanje vraća oba naslova
+    zamijeni(editor, 3, 3, "\n")
+    assert osvjezi(editor) == [(1, "a", 0), (2, "b", 1)]
+
+
+@pytest.mark.parametrize("seed", range(30))
+def test_nasumicne_izmjene(editor, seed):
+    rnd = random.Random(seed)
+    linije = ["# a", "## b", "### c", "tekst", "", "```", "# u kodu", "x y"]
+    editor.setPlainText("\n".join(rnd.choice(linije) for _ in range(40)))
+    for _ in range(60):
+        duzina = len(editor.toPlainText())
+        pocetak = rnd.randint(0, duzina)
+        kraj = min(duzina, pocetak + rnd.choice([0, 1, 2, 5, 20, 80]))
+        umetnuto = "\n".join(rnd.choice(linije) for _ in range(rnd.randint(0, 3)))
+        if rnd.random() < 0.3:
+            umetnuto = rnd.choice(["\n", "#", "# ", "\n## n\n", ""])
+        zamijeni(editor, pocetak, kraj, umetnuto)
+        if rnd.random() < 0.4:
+            assert osvjezi(editor) == svi_naslovi(editor)
+    assert osvjezi(editor) == svi_naslovi(editor)